@@ -0,0 +1,179 @@
+"""
+World -> Panel Local Frame.
+
+`create_union_projections` and `compute_panel_metrics` work on panel-aligned
+coordinates: x along the width, y through the thickness, z up. Imported meshes
+are in world coordinates; the frame of every panel of a batch is found at once:
+
+- y (thickness) : dominant face normal, i.e. the main eigenvector of the
+                  area-weighted normal tensor sum(a n n^T) ("normals"), or the
+                  smallest principal axis of the vertices ("pca").
+                  Oriented away from `reference` (default: centre of the batch),
+                  so that y > 0 is the exterior side as in the core stacks.
+- z (height)    : world up projected on the panel plane (largest in-plane
+                  principal axis for horizontal panels).
+- x (width)     : y x z, right-handed.
+
+The origin is the lower corner of the panel in its frame, so local coordinates
+start at 0. Each PanelFrame keeps the inverse transform to place generated
+elements back in world space.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .mesh import MeshRecord
+
+WORLD_UP = np.array([0.0, 0.0, 1.0])
+HORIZONTAL_TOL = 1e-6     # |y . up| above 1 - tol: horizontal panel
+
+
+@dataclass
+class PanelFrame:
+    panel_id: str
+    origin: np.ndarray      # (3,) world position of the local origin
+    axes: np.ndarray        # (3, 3) rows: local x, y, z in world coordinates
+
+    def to_local(self, points) -> np.ndarray:
+        return (np.asarray(points, dtype=float) - self.origin) @ self.axes.T
+
+    def to_world(self, points) -> np.ndarray:
+        return np.asarray(points, dtype=float) @ self.axes + self.origin
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """4x4 homogeneous world -> local transform."""
+        m = np.eye(4)
+        m[:3, :3] = self.axes
+        m[:3, 3] = -self.axes @ self.origin
+        return m
+
+    @property
+    def inverse(self) -> np.ndarray:
+        """4x4 homogeneous local -> world transform."""
+        m = np.eye(4)
+        m[:3, :3] = self.axes.T
+        m[:3, 3] = self.origin
+        return m
+
+    def as_dict(self) -> Dict:
+        return {
+            "panel_id": self.panel_id,
+            "origin": self.origin.tolist(),
+            "x_axis": self.axes[0].tolist(),
+            "y_axis": self.axes[1].tolist(),
+            "z_axis": self.axes[2].tolist(),
+        }
+
+
+def _flatten(records: Sequence[MeshRecord]):
+    """Concatenated vertices / faces (global indices) and the vertex / face count per panel."""
+    n_v = np.array([len(r.vertices) for r in records])
+    n_f = np.array([len(r.faces) for r in records])
+    v_offset = np.cumsum(n_v) - n_v
+    vertices = np.concatenate([np.asarray(r.vertices, dtype=float) for r in records])
+    faces = np.concatenate([np.asarray(r.faces, dtype=np.int64).reshape(-1, 3) for r in records])
+    faces = faces + np.repeat(v_offset, n_f)[:, None]
+    return vertices, faces, n_v, n_f
+
+
+def _segment_sum(values: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Sum of consecutive segments of `values` (segment lengths `counts`, zeros allowed)."""
+    out = np.zeros((len(counts),) + values.shape[1:])
+    nonempty = counts > 0
+    if nonempty.any():
+        starts = (np.cumsum(counts) - counts)[nonempty]
+        out[nonempty] = np.add.reduceat(values, starts, axis=0)
+    return out
+
+
+def _main_axis(tensor: np.ndarray, largest: bool) -> np.ndarray:
+    """Eigenvector of the largest / smallest eigenvalue of symmetric (n, 3, 3) tensors."""
+    _, vectors = np.linalg.eigh(tensor)           # ascending eigenvalues
+    return vectors[:, :, -1 if largest else 0]
+
+
+def _frame_axes(vertices, faces, n_v, n_f, method: str, reference) -> Tuple[np.ndarray, np.ndarray]:
+    """(n, 3, 3) axes of every panel and the (n, 3) vertex centroids."""
+    centroid = _segment_sum(vertices, n_v) / np.maximum(n_v, 1)[:, None]
+    centred = vertices - np.repeat(centroid, n_v, axis=0)
+    covariance = _segment_sum(centred[:, :, None] * centred[:, None, :], n_v)
+
+    if method == "normals":
+        tri = vertices[faces]
+        cross = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])     # 2 * area * n
+        length = np.linalg.norm(cross, axis=1)
+        weighted = cross / np.where(length > 0, length, 1.0)[:, None] ** 0.5  # sqrt(a) n
+        y_axis = _main_axis(_segment_sum(weighted[:, :, None] * weighted[:, None, :], n_f), largest=True)
+    elif method == "pca":
+        y_axis = _main_axis(covariance, largest=False)
+    else:
+        raise ValueError(f"Unknown frame method '{method}', expected 'normals' or 'pca'.")
+
+    reference = np.mean(centroid, axis=0) if reference is None else np.asarray(reference, dtype=float)
+    outward = np.einsum("ij,ij->i", y_axis, centroid - reference)
+    y_axis = np.where((outward < 0)[:, None], -y_axis, y_axis)
+
+    z_axis = WORLD_UP - np.einsum("ij,j->i", y_axis, WORLD_UP)[:, None] * y_axis
+    # horizontal panels: world up is the normal, use the longest in-plane direction
+    horizontal = np.linalg.norm(z_axis, axis=1) < HORIZONTAL_TOL
+    if horizontal.any():
+        in_plane = covariance[horizontal]
+        projector = np.eye(3) - y_axis[horizontal, :, None] * y_axis[horizontal, None, :]
+        z_axis[horizontal] = _main_axis(projector @ in_plane @ projector, largest=True)
+    z_axis /= np.linalg.norm(z_axis, axis=1)[:, None]
+    x_axis = np.cross(y_axis, z_axis)
+    return np.stack([x_axis, y_axis, z_axis], axis=1), centroid
+
+
+def panel_frames(records: Sequence[MeshRecord], method: str = "normals", reference=None) -> List[PanelFrame]:
+    """Local frame of every panel of a batch (see module docstring)."""
+    return localize(records, method, reference)[1]
+
+
+def localize(
+    records: Sequence[MeshRecord], method: str = "normals", reference=None
+) -> Tuple[List[MeshRecord], List[PanelFrame]]:
+    """
+    Records with panel-local vertices (origin at the lower corner) and their frames.
+    All panels are transformed together: one batched matrix product over the
+    concatenated vertices.
+    """
+    records = [r for r in records if len(r.vertices)]
+    if not records:
+        return [], []
+    vertices, faces, n_v, n_f = _flatten(records)
+    axes, _ = _frame_axes(vertices, faces, n_v, n_f, method, reference)
+
+    panel_of_vertex = np.repeat(np.arange(len(records)), n_v)
+    rotated = np.einsum("nij,nj->ni", axes[panel_of_vertex], vertices)
+    starts = np.cumsum(n_v) - n_v
+    lower = np.minimum.reduceat(rotated, starts, axis=0)          # local origin, rotated frame
+    local = rotated - lower[panel_of_vertex]
+    origin = np.einsum("nji,nj->ni", axes, lower)                 # back to world
+
+    local_records, frames = [], []
+    for k, (record, verts) in enumerate(zip(records, np.split(local, starts[1:]))):
+        local_records.append(MeshRecord(record.panel_id, verts, np.asarray(record.faces)))
+        frames.append(PanelFrame(record.panel_id, origin[k], axes[k]))
+    return local_records, frames
+
+
+def element_corners(elements, frame: PanelFrame) -> np.ndarray:
+    """World coordinates (n, 8, 3) of the box corners of LatticeElement / LayerElement objects."""
+    bounds = np.array([[e.x_min, e.x_max, e.y_min, e.y_max, e.z_min, e.z_max] for e in elements], dtype=float)
+    if len(bounds) == 0:
+        return np.empty((0, 8, 3))
+    bits = (np.arange(8)[:, None] >> np.arange(3)) & 1                # (8, 3) corner selectors
+    corners = bounds[:, None, [0, 2, 4]] + bits * (bounds[:, None, [1, 3, 5]] - bounds[:, None, [0, 2, 4]])
+    return frame.to_world(corners)
+
+
+__all__ = [
+    "PanelFrame",
+    "element_corners",
+    "localize",
+    "panel_frames",
+]
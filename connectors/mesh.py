@@ -0,0 +1,519 @@
+"""
+Streaming Mesh Connector (OBJ / PLY / Speckle-style JSON).
+
+Whole-building exports are read panel by panel: a first pass over the file only
+records byte offsets (object starts, vertex counts), then byte ranges holding a
+few panels each are parsed with NumPy (no Python object per line or per number),
+optionally in worker processes. Each panel comes out as a `MeshRecord`
+(panel_id, vertices, faces) ready for `create_union_projections`.
+
+Formats
+- .obj   : one panel per `o` object (or `g` group without `o` lines). Faces must reference the vertices of
+           their own group (as written by Rhino / Blender per-object exports).
+- .ply   : one panel per file (ascii or binary), many files in parallel.
+- .jsonl : one Speckle-style object per line.
+- .json  : array of Speckle-style objects.
+  Objects hold `vertices` [x, y, z, ...] and `faces` [n, i0, ..., n, ...] (Speckle
+  legacy n = 0 / 1 for triangles / quads), possibly nested in `displayValue`. Both must be
+  flat arrays of numbers: nested arrays and detached chunks raise a ValueError.
+"""
+from __future__ import annotations
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.src.openings import (
+    compute_panel_metrics, create_union_projections, extract_openings_from_zx, scan_openings,
+)
+
+CHUNK_BYTES = 1 << 24       # read size of the offset scan
+RANGE_BYTES = 1 << 22       # target size of the byte ranges handed to workers
+
+_NL, _SP, _TAB, _CR = 10, 32, 9, 13
+_SLASH, _QUOTE, _BACKSLASH = 47, 34, 92
+
+
+class MeshRecord(NamedTuple):
+    panel_id: str
+    vertices: np.ndarray    # (n, 3) float
+    faces: np.ndarray       # (m, 3) int, indices into vertices
+
+
+# ----------------------------------------------------------------------------
+# NumPy text helpers
+# ----------------------------------------------------------------------------
+
+def _line_bounds(arr: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Start and end (index of the newline, or len) of every line of a byte array."""
+    ends = np.flatnonzero(arr == _NL)
+    if len(arr) and arr[-1] != _NL:
+        ends = np.append(ends, len(arr))
+    starts = np.concatenate([[0], ends[:-1] + 1]).astype(np.int64)
+    return starts, ends
+
+
+def _keyword_lines(arr: np.ndarray, starts: np.ndarray, ends: np.ndarray, keyword: bytes) -> np.ndarray:
+    """Mask of the lines starting with `keyword` followed by a blank."""
+    n = len(keyword)
+    ok = ends - starts > n
+    for k, char in enumerate(keyword):
+        ok &= arr[np.minimum(starts + k, len(arr) - 1)] == char
+    nxt = arr[np.minimum(starts + n, len(arr) - 1)]
+    return ok & ((nxt == _SP) | (nxt == _TAB))
+
+
+def _numbers(arr: np.ndarray, starts, ends, skip: int, strip_slash: bool = False):
+    """
+    Numbers on the selected lines (their first `skip` bytes removed).
+    Returns the flat values and the count per line.
+    """
+    if len(starts) == 0:
+        return np.empty(0), np.zeros(0, dtype=np.int64)
+    marks = np.zeros(len(arr) + 1, dtype=np.int64)
+    np.add.at(marks, starts + skip, 1)
+    np.add.at(marks, np.minimum(ends + 1, len(arr)), -1)
+    text = arr[np.cumsum(marks[:-1]) > 0].copy()
+    if ends[-1] >= len(arr):       # last line without newline
+        text = np.append(text, np.uint8(_NL))
+
+    blank = (text == _SP) | (text == _TAB) | (text == _CR) | (text == _NL)
+    if strip_slash:
+        # '12/5/7' -> '12' : blank everything after a slash up to the next blank
+        idx = np.arange(len(text))
+        last_slash = np.maximum.accumulate(np.where(text == _SLASH, idx, -1))
+        last_blank = np.maximum.accumulate(np.where(blank, idx, -1))
+        tail = last_slash > last_blank
+        text[tail] = _SP
+        blank |= tail
+
+    token = ~blank & np.concatenate([[True], blank[:-1]])
+    line_of = np.cumsum(np.concatenate([[0], (text == _NL)[:-1]]))
+    counts = np.bincount(line_of[token], minlength=len(starts))
+    values = np.fromstring(text.tobytes(), dtype=float, sep=" ")
+    if len(values) != counts.sum():
+        raise ValueError("Malformed numeric line in mesh file.")
+    return values, counts
+
+
+def _fan_triangles(values: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Polygons (flat indices + vertex count per polygon) -> fan triangles (m, 3)."""
+    counts = np.asarray(counts, dtype=np.int64)
+    offsets = np.cumsum(counts) - counts
+    n_tri = np.maximum(counts - 2, 0)
+    if n_tri.sum() == 0:
+        return np.empty((0, 3), dtype=np.int64)
+    poly = np.repeat(np.arange(len(counts)), n_tri)
+    j = np.arange(n_tri.sum()) - np.repeat(np.cumsum(n_tri) - n_tri, n_tri)
+    first = offsets[poly]
+    return np.stack([values[first], values[first + j + 1], values[first + j + 2]], axis=1).astype(np.int64)
+
+
+def _read(path: str, start: int, end: int) -> np.ndarray:
+    with open(path, "rb") as f:
+        f.seek(start)
+        return np.frombuffer(f.read(end - start), dtype=np.uint8)
+
+
+def _iter_chunks(path: str, size: int = CHUNK_BYTES) -> Iterator[Tuple[int, np.ndarray]]:
+    """(offset, bytes) chunks of a file cut after a newline."""
+    offset = 0
+    rest = b""
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(size)
+            if not block:
+                if rest:
+                    yield offset, np.frombuffer(rest, dtype=np.uint8)
+                return
+            block = rest + block
+            cut = block.rfind(b"\n") + 1
+            if cut == 0:
+                rest = block
+                continue
+            yield offset, np.frombuffer(block[:cut], dtype=np.uint8)
+            offset += cut
+            rest = block[cut:]
+
+
+def _group_ranges(starts: Sequence[int], size: int, target: int = RANGE_BYTES) -> List[Tuple[int, int, int, int]]:
+    """
+    Consecutive items [starts[i], starts[i+1]) grouped into ~target byte ranges:
+    (first item, end item (excluded), start offset, end offset).
+    """
+    bounds = list(starts) + [size]
+    ranges = []
+    i = 0
+    while i < len(starts):
+        j = i + 1
+        while j < len(starts) and bounds[j + 1] - bounds[i] <= target:
+            j += 1
+        ranges.append((i, j, bounds[i], bounds[j]))
+        i = j
+    return ranges
+
+
+# ----------------------------------------------------------------------------
+# OBJ
+# ----------------------------------------------------------------------------
+
+def _scan_obj(path: str):
+    """
+    Byte offset, vertex count before and name of every object. Objects are the `o`
+    lines when the file has any (`g` then only tags material groups), else the `g` lines.
+    """
+    found = {b"o": ([], [], []), b"g": ([], [], [])}
+    n_vertices = 0
+    for offset, arr in _iter_chunks(path):
+        starts, ends = _line_bounds(arr)
+        is_v = _keyword_lines(arr, starts, ends, b"v")
+        v_before = n_vertices + np.cumsum(is_v) - is_v
+        for keyword, (objects, vertices_before, names) in found.items():
+            for line in np.flatnonzero(_keyword_lines(arr, starts, ends, keyword)):
+                objects.append(offset + int(starts[line]))
+                vertices_before.append(int(v_before[line]))
+                names.append(arr[starts[line] + 2:ends[line]].tobytes().decode("utf-8", "replace").strip())
+        n_vertices += int(is_v.sum())
+    keyword = b"o" if found[b"o"][0] else b"g"
+    objects, vertices_before, names = found[keyword]
+    if not objects or objects[0] != 0:
+        # content before the first object line: leading unnamed group
+        objects.insert(0, 0)
+        vertices_before.insert(0, 0)
+        names.insert(0, None)
+    return keyword, objects, vertices_before, names
+
+
+def _parse_obj(
+    path: str, start: int, end: int, keyword: bytes, v_offset: int, names: Sequence, first_index: int
+) -> List[MeshRecord]:
+    """Objects of one byte range; names[k] is the name of the k-th object of the range (None: unnamed)."""
+    arr = _read(path, start, end)
+    starts, ends = _line_bounds(arr)
+    is_v = _keyword_lines(arr, starts, ends, b"v")
+    is_f = _keyword_lines(arr, starts, ends, b"f")
+    is_obj = _keyword_lines(arr, starts, ends, keyword)
+    if len(names) and names[0] is None:
+        is_obj[0] = True       # leading unnamed group (object 0 of the file)
+    v_before = v_offset + np.cumsum(is_v) - is_v                 # global vertex count before each line
+    obj_of_line = np.cumsum(is_obj) - 1
+
+    coords, v_counts = _numbers(arr, starts[is_v], ends[is_v], skip=1)
+    if len(v_counts) and np.any(v_counts < 3):
+        raise ValueError(f"Vertex with less than 3 coordinates in {path}.")
+    v_first = np.cumsum(v_counts) - v_counts
+    xyz = coords[v_first[:, None] + np.arange(3)]
+
+    idx, f_counts = _numbers(arr, starts[is_f], ends[is_f], skip=1, strip_slash=True)
+    # resolve negative (relative) indices against the vertex count at the face line
+    f_lines = np.flatnonzero(is_f)
+    line_of_value = np.repeat(f_lines, f_counts)
+    idx = np.where(idx < 0, v_before[line_of_value] + idx, idx - 1)
+    triangles = _fan_triangles(idx, f_counts)
+    tri_obj = np.repeat(obj_of_line[f_lines], np.maximum(f_counts - 2, 0))
+
+    # triangles and vertices are in object order: split them with the per-object counts
+    n_obj = int(is_obj.sum())
+    tri_split = np.cumsum(np.bincount(tri_obj, minlength=n_obj))[:-1]
+    v_split = np.cumsum(np.bincount(obj_of_line[is_v], minlength=n_obj))[:-1]
+    bases = v_before[np.flatnonzero(is_obj)]
+    stem = os.path.splitext(os.path.basename(path))[0]
+    records: List[MeshRecord] = []
+    for k, (tris, verts) in enumerate(zip(np.split(triangles, tri_split), np.split(xyz, v_split))):
+        if len(tris) == 0:
+            continue
+        local = tris - bases[k]
+        if local.min() < 0 or local.max() >= len(verts):
+            raise ValueError(f"Faces of object {k + first_index} in {path} reference another object's vertices.")
+        name = names[k] if k < len(names) and names[k] else f"{stem}-{k + first_index}"
+        records.append(MeshRecord(name, verts, local))
+    return records
+
+
+# ----------------------------------------------------------------------------
+# PLY
+# ----------------------------------------------------------------------------
+
+_PLY_TYPES = {
+    "char": "i1", "int8": "i1", "uchar": "u1", "uint8": "u1",
+    "short": "i2", "int16": "i2", "ushort": "u2", "uint16": "u2",
+    "int": "i4", "int32": "i4", "uint": "u4", "uint32": "u4",
+    "float": "f4", "float32": "f4", "double": "f8", "float64": "f8",
+}
+
+
+def _parse_ply(path: str) -> List[MeshRecord]:
+    with open(path, "rb") as f:
+        header = []
+        while True:
+            line = f.readline()
+            if not line:
+                raise ValueError(f"{path}: PLY header not terminated.")
+            line = line.decode("ascii", "replace").strip()
+            header.append(line)
+            if line == "end_header":
+                break
+        body_start = f.tell()
+
+    fmt, elements = None, []
+    for line in header:
+        parts = line.split()
+        if not parts:
+            continue
+        if parts[0] == "format":
+            fmt = parts[1]
+        elif parts[0] == "element":
+            elements.append([parts[1], int(parts[2]), []])
+        elif parts[0] == "property":
+            elements[-1][2].append(parts[1:])
+
+    counts = {name: n for name, n, _ in elements}
+    props = {name: p for name, _, p in elements}
+    vertex_props = [p[-1] for p in props.get("vertex", [])]
+    xyz_cols = [vertex_props.index(axis) for axis in "xyz"]
+    panel_id = os.path.splitext(os.path.basename(path))[0]
+
+    if fmt == "ascii":
+        arr = np.fromfile(path, dtype=np.uint8)[body_start:]
+        starts, ends = _line_bounds(arr)
+        n_v, n_f = counts.get("vertex", 0), counts.get("face", 0)
+        values, per_line = _numbers(arr, starts[:n_v], ends[:n_v], skip=0)
+        first = np.cumsum(per_line) - per_line
+        vertices = values[first[:, None] + np.array(xyz_cols)]
+        values, per_line = _numbers(arr, starts[n_v:n_v + n_f], ends[n_v:n_v + n_f], skip=0)
+        keep = np.ones(len(values), dtype=bool)
+        keep[np.cumsum(per_line) - per_line] = False          # drop the leading vertex count
+        faces = _fan_triangles(values[keep], per_line - 1)
+        return [MeshRecord(panel_id, vertices, faces)]
+
+    endian = "<" if fmt == "binary_little_endian" else ">"
+    with open(path, "rb") as f:
+        f.seek(body_start)
+        data = f.read()
+    pos = 0
+    vertices = faces = None
+    for name, n, plist in elements:
+        if all(p[0] != "list" for p in plist):
+            dtype = np.dtype([(p[1], endian + _PLY_TYPES[p[0]]) for p in plist])
+            block = np.frombuffer(data, dtype=dtype, count=n, offset=pos)
+            pos += n * dtype.itemsize
+            if name == "vertex":
+                vertices = np.stack([block[a].astype(float) for a in "xyz"], axis=1)
+            continue
+        if name != "face" or len(plist) != 1:
+            raise ValueError(f"{path}: unsupported list element '{name}'.")
+        count_t, index_t = _PLY_TYPES[plist[0][1]], _PLY_TYPES[plist[0][2]]
+        # fast path: every face has the same vertex count
+        k = int(np.frombuffer(data, dtype=endian + count_t, count=1, offset=pos)[0]) if n else 3
+        dtype = np.dtype([("n", endian + count_t), ("i", endian + index_t, (k,))])
+        block = np.frombuffer(data, dtype=dtype, count=n, offset=pos) if n * dtype.itemsize <= len(data) - pos else None
+        if block is not None and np.all(block["n"] == k):
+            pos += n * dtype.itemsize
+            faces = _fan_triangles(block["i"].astype(np.int64).ravel(), np.full(n, k))
+        else:
+            raise ValueError(f"{path}: mixed polygon sizes are only supported in ascii PLY.")
+    if vertices is None or faces is None:
+        raise ValueError(f"{path}: vertex or face element missing.")
+    return [MeshRecord(panel_id, vertices, faces)]
+
+
+# ----------------------------------------------------------------------------
+# Speckle-style JSON
+# ----------------------------------------------------------------------------
+
+_NAME_RE = [re.compile(rb'"%s"\s*:\s*("(?:[^"\\]|\\.)*")' % key) for key in (b"name", b"applicationId", b"id")]
+_ARRAY_RE = {key: re.compile(rb'"%s"\s*:\s*\[' % key.encode()) for key in ("vertices", "faces")}
+_NUMBERS_RE = re.compile(rb"\s*(?:[-+0-9.eE]+\s*(?:,\s*[-+0-9.eE]+\s*)*)?")
+
+
+def _json_arrays(text: bytes, key: str) -> List[np.ndarray]:
+    """Every `key` array of an object; only flat arrays of numbers are supported."""
+    out = []
+    for match in _ARRAY_RE[key].finditer(text):
+        close = text.find(b"]", match.end())
+        body = text[match.end():close] if close >= 0 else b"["
+        if not _NUMBERS_RE.fullmatch(body):
+            # nested arrays, objects (detached chunks) or strings
+            raise ValueError(f"'{key}' is not a flat array of numbers.")
+        out.append(np.fromstring(body.decode("ascii"), dtype=float, sep=","))
+    return out
+
+
+def _speckle_faces(faces: np.ndarray) -> np.ndarray:
+    """[n, i0, ..., n, ...] -> fan triangles; n = 0 / 1 mean 3 / 4 (legacy encoding)."""
+    faces = faces.astype(np.int64)
+    heads, pos = [], 0
+    # walk the headers only (one step per polygon, in C for the common all-triangle case)
+    if len(faces) % 4 == 0 and np.all(np.isin(faces[::4], (0, 3))):
+        return faces.reshape(-1, 4)[:, 1:]
+    while pos < len(faces):
+        heads.append(pos)
+        n = faces[pos]
+        pos += 1 + (3 if n == 0 else 4 if n == 1 else n)
+    heads = np.asarray(heads)
+    counts = faces[heads]
+    counts = np.where(counts == 0, 3, np.where(counts == 1, 4, counts))
+    keep = np.ones(len(faces), dtype=bool)
+    keep[heads] = False
+    return _fan_triangles(faces[keep], counts)
+
+
+def _parse_speckle_object(text: bytes, index: int, stem: str) -> Optional[MeshRecord]:
+    """MeshRecord of one object, None if it holds no mesh."""
+    vert_arrays = _json_arrays(text, "vertices")
+    face_arrays = _json_arrays(text, "faces")
+    if not vert_arrays or len(vert_arrays) != len(face_arrays):
+        return None
+    verts, tris, base = [], [], 0
+    for v, fc in zip(vert_arrays, face_arrays):
+        v = v.reshape(-1, 3)
+        verts.append(v)
+        tris.append(_speckle_faces(fc) + base)
+        base += len(v)
+    name = None
+    for regex in _NAME_RE:
+        match = regex.search(text)
+        if match:
+            name = json.loads(match.group(1).decode("utf-8", "replace"))
+            break
+    return MeshRecord(name or f"{stem}-{index}", np.concatenate(verts), np.concatenate(tris))
+
+
+def _scan_json_objects(path: str) -> List[int]:
+    """Start offsets of the top-level objects of a JSON array (strings and escapes respected)."""
+    starts: List[int] = []
+    depth, in_string, escaped = 0, False, False
+    for offset, arr in _iter_chunks(path):
+        special = np.flatnonzero((arr == _QUOTE) | (arr == _BACKSLASH) | (arr == 123) | (arr == 125))
+        # few special bytes per panel (numbers carry none): walk them
+        for p in special.tolist():
+            c = arr[p]
+            if escaped:
+                escaped = False
+            elif in_string:
+                if c == _BACKSLASH:
+                    escaped = True
+                elif c == _QUOTE:
+                    in_string = False
+            elif c == _QUOTE:
+                in_string = True
+            elif c == 123:
+                if depth == 0:
+                    starts.append(offset + p)
+                depth += 1
+            elif c == 125:
+                depth -= 1
+    return starts
+
+
+def _parse_json_range(path: str, start: int, end: int, first_index: int, item_starts: Sequence[int]) -> List[MeshRecord]:
+    """Objects of one byte range, item_starts are their offsets relative to start."""
+    data = _read(path, start, end).tobytes()
+    stem = os.path.splitext(os.path.basename(path))[0]
+    bounds = list(item_starts) + [len(data)]
+    items = [data[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+    records = []
+    for k, item in enumerate(items):
+        try:
+            rec = _parse_speckle_object(item, first_index + k, stem)
+        except ValueError as exc:
+            raise ValueError(f"{path}: object {first_index + k}: {exc}") from None
+        if rec is not None:
+            records.append(rec)
+    return records
+
+
+# ----------------------------------------------------------------------------
+# Public API
+# ----------------------------------------------------------------------------
+
+def _tasks(path: str, range_bytes: int):
+    """(function, args) per byte range of a file."""
+    ext = os.path.splitext(path)[1].lower()
+    size = os.path.getsize(path)
+    if ext == ".obj":
+        keyword, objects, v_before, names = _scan_obj(path)
+        for first, last, start, end in _group_ranges(objects, size, range_bytes):
+            yield _parse_obj, (path, start, end, keyword, v_before[first], names[first:last], first)
+    elif ext == ".ply":
+        yield _parse_ply, (path,)
+    elif ext in (".json", ".jsonl"):
+        if ext == ".jsonl":
+            starts = []
+            for offset, arr in _iter_chunks(path):
+                line_starts, line_ends = _line_bounds(arr)
+                starts.extend((offset + line_starts[line_ends > line_starts]).tolist())
+        else:
+            starts = _scan_json_objects(path)
+        for first, last, start, end in _group_ranges(starts, size, range_bytes):
+            yield _parse_json_range, (path, start, end, first, [s - start for s in starts[first:last]])
+    else:
+        raise ValueError(f"Unsupported mesh file '{path}' (expected .obj, .ply, .json or .jsonl).")
+
+
+def _run(func, args, process):
+    records = func(*args)
+    return records if process is None else [process(rec) for rec in records]
+
+
+def iter_mesh_panels(
+    paths,
+    workers: int = None,
+    process: Callable[[MeshRecord], object] = None,
+    range_bytes: int = RANGE_BYTES,
+) -> Iterator:
+    """
+    Stream the panels of one or many mesh files, in file order.
+    workers > 1 parses byte ranges in a process pool (at most 2 * workers ranges in flight);
+    `process` (a picklable function) is applied to every record inside the worker,
+    e.g. `panel_openings`.
+    """
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+    tasks = (task for path in paths for task in _tasks(os.fspath(path), range_bytes))
+
+    if workers is None or workers <= 1:
+        for func, args in tasks:
+            yield from _run(func, args, process)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        for func, args in tasks:
+            pending.append(pool.submit(_run, func, args, process))
+            if len(pending) >= 2 * workers:
+                yield from pending.pop(0).result()
+        for future in pending:
+            yield from future.result()
+
+
+def read_mesh_panels(paths, workers: int = None) -> List[MeshRecord]:
+    return list(iter_mesh_panels(paths, workers=workers))
+
+
+def panel_openings(record: MeshRecord, min_width: float = 10.0, min_height: float = 10.0):
+    """
+    Opening extraction of one panel given in its local frame (x width, y thickness, z height).
+    Openings are measured from the lower left corner of the panel bounding box.
+    Rectilinear panels go through the scanline extractor, others through the ZX union.
+    """
+    vertices = record.vertices - record.vertices.min(axis=0)
+    width, height = float(vertices[:, 0].max()), float(vertices[:, 2].max())
+    scanned = scan_openings(vertices, record.faces, width, height, min_width=min_width, min_height=min_height)
+    if scanned is not None:
+        openings, gross_area = scanned
+        return record.panel_id, openings, compute_panel_metrics(vertices, None, openings, gross_area=gross_area)
+    union_zx = create_union_projections(vertices, record.faces)["ZX"]
+    openings = extract_openings_from_zx(union_zx, width, height, min_width=min_width, min_height=min_height)
+    return record.panel_id, openings, compute_panel_metrics(vertices, union_zx, openings)
+
+
+__all__ = [
+    "MeshRecord",
+    "iter_mesh_panels",
+    "panel_openings",
+    "read_mesh_panels",
+]
@@ -0,0 +1,327 @@
+"""
+Building model: many placed WallBuildUp panels, indexed and queried in bulk.
+
+Panels are kept as columns (one row per panel): storey, orientation and panel
+type codes, world placement (origin and axes, as PanelFrame), solver results
+attached with `set_metrics`, and the quantity takeoff (panels x materials).
+Element queries use a flat table of every element with its world bounding box,
+built once on first use. Queries are NumPy masks and matrix products over these
+columns, not loops over the buildups:
+
+    building = Building("Block A")
+    building.add(buildup, storey=2, placement=frame)   # frame: connectors.frames.PanelFrame
+    building.set_metrics(run_pipeline(building.buildups))
+    building.panels(building.metric("u_value") > 0.2)
+    building.material_totals(by="storey").as_records()
+    building.elements_in_box((0, 0, 3000), (10000, 10000, 6000))
+
+Orientation is the compass sector of the exterior side (local +y) of the panel:
+N (world +Y), E (+X), S, W; "up" / "down" for horizontal panels.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .materials import LATTICE_MATERIALS
+from .quantities import analytic_takeoff
+from .takeoff import Takeoff, quantity_takeoff
+
+COMPASS = ("N", "E", "S", "W")
+HORIZONTAL_COS = 0.9      # |y . up| above: horizontal panel (floor, roof)
+GROUP_KEYS = ("panel", "storey", "orientation", "panel_type")
+
+
+def panel_orientation(axes: np.ndarray) -> np.ndarray:
+    """Orientation label of panels with axes (n, 3, 3) (rows: local x, y, z in world coordinates)."""
+    normal = np.asarray(axes, dtype=float).reshape(-1, 3, 3)[:, 1]
+    azimuth = np.degrees(np.arctan2(normal[:, 0], normal[:, 1])) % 360.0
+    labels = np.array(COMPASS, dtype=object)[np.rint(azimuth / 90.0).astype(np.int64) % 4]
+    labels[normal[:, 2] > HORIZONTAL_COS] = "up"
+    labels[normal[:, 2] < -HORIZONTAL_COS] = "down"
+    return labels
+
+
+@dataclass
+class MaterialTotals:
+    by: str
+    keys: List                 # group values (storey, orientation, ...)
+    materials: List[str]
+    values: np.ndarray         # (keys, materials) [m3] or [m2]
+    quantity: str = "volume"
+
+    def as_records(self) -> List[Dict]:
+        """One row per group and material (for pandas), zero totals omitted."""
+        return [
+            {self.by: key, "material": name, self.quantity: float(self.values[k, m])}
+            for k, key in enumerate(self.keys)
+            for m, name in enumerate(self.materials)
+            if self.values[k, m] > 0
+        ]
+
+
+@dataclass
+class BuildingElements:
+    """Every element of a building as flat columns, with its world bounding box."""
+    panel: np.ndarray          # (n,) index in Building.panel_ids
+    material: np.ndarray       # (n,) index in materials
+    element_ids: List[str]
+    materials: List[str]
+    local: np.ndarray          # (n, 6) x_min, x_max, y_min, y_max, z_min, z_max in the panel frame [mm]
+    world_min: np.ndarray      # (n, 3)
+    world_max: np.ndarray      # (n, 3)
+
+    def __len__(self) -> int:
+        return len(self.panel)
+
+    @property
+    def volume(self) -> np.ndarray:
+        """[m3]"""
+        d = self.local[:, 1::2] - self.local[:, 0::2]
+        return d[:, 0] * d[:, 1] * d[:, 2] / 1e9
+
+
+class Building:
+    """
+    Panels of a building or project. analytic=True takes the takeoff from
+    core.src.quantities (lazy buildups stay unmaterialized until an element query).
+    """
+
+    def __init__(self, name: str = "", lattice_materials: Dict[str, str] = None, analytic: bool = False):
+        self.name = name
+        self.analytic = analytic
+        self.lattice_materials = LATTICE_MATERIALS if lattice_materials is None else lattice_materials
+        self.buildups: List = []
+        self.panel_ids: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._storey: List[int] = []
+        self._origin: List[np.ndarray] = []
+        self._axes: List[np.ndarray] = []
+        self._orientation: List[str] = []
+        self.metrics: Dict[str, np.ndarray] = {}
+        self._takeoff: Optional[Takeoff] = None
+        self._elements: Optional[BuildingElements] = None
+
+    def __len__(self) -> int:
+        return len(self.buildups)
+
+    # --- panels -----------------------------------------------------------
+    def add(self, buildup, storey: int = 0, placement=None, orientation: str = None) -> int:
+        """
+        Add a panel. placement: object with `origin` (3,) and `axes` (3, 3) such as a
+        PanelFrame, or a 4x4 local -> world matrix; None keeps the panel frame as world
+        frame. orientation overrides the label derived from the placement.
+        """
+        if buildup.panel_id in self._index:
+            raise ValueError(f"Panel '{buildup.panel_id}' is already in building '{self.name}'.")
+        if placement is None:
+            origin, axes = np.zeros(3), np.eye(3)
+        elif hasattr(placement, "axes"):
+            origin, axes = np.asarray(placement.origin, dtype=float), np.asarray(placement.axes, dtype=float)
+        else:
+            matrix = np.asarray(placement, dtype=float)
+            if matrix.shape != (4, 4):
+                raise ValueError("placement must have origin/axes or be a 4x4 matrix.")
+            origin, axes = matrix[:3, 3].copy(), matrix[:3, :3].T.copy()
+        self._index[buildup.panel_id] = len(self.buildups)
+        self.buildups.append(buildup)
+        self.panel_ids.append(buildup.panel_id)
+        self._storey.append(int(storey))
+        self._origin.append(origin)
+        self._axes.append(axes)
+        self._orientation.append(orientation or panel_orientation(axes)[0])
+        for name, column in self.metrics.items():
+            self.metrics[name] = np.append(column, np.nan)
+        self._takeoff = None
+        self._elements = None
+        return len(self.buildups) - 1
+
+    def extend(self, buildups: Sequence, storeys: Sequence[int] = None, placements: Sequence = None) -> None:
+        buildups = list(buildups)
+        storeys = [0] * len(buildups) if storeys is None else list(storeys)
+        placements = [None] * len(buildups) if placements is None else list(placements)
+        if not len(buildups) == len(storeys) == len(placements):
+            raise ValueError("buildups, storeys and placements must have the same length.")
+        for buildup, storey, placement in zip(buildups, storeys, placements):
+            self.add(buildup, storey, placement)
+
+    def index(self, panel_id: str) -> int:
+        if panel_id not in self._index:
+            raise ValueError(f"Unknown panel '{panel_id}'.")
+        return self._index[panel_id]
+
+    def __getitem__(self, panel_id: str):
+        return self.buildups[self.index(panel_id)]
+
+    # --- columns ----------------------------------------------------------
+    @property
+    def storey(self) -> np.ndarray:
+        return np.array(self._storey, dtype=np.int64)
+
+    @property
+    def orientation(self) -> np.ndarray:
+        return np.array(self._orientation, dtype=object)
+
+    @property
+    def panel_type(self) -> np.ndarray:
+        return np.array([b.lattice.panel_type if b.lattice is not None else "" for b in self.buildups], dtype=object)
+
+    @property
+    def origins(self) -> np.ndarray:
+        return np.array(self._origin, dtype=float).reshape(-1, 3)
+
+    @property
+    def axes(self) -> np.ndarray:
+        return np.array(self._axes, dtype=float).reshape(-1, 3, 3)
+
+    @property
+    def takeoff(self) -> Takeoff:
+        """Quantity takeoff of all panels (panels x materials), computed once."""
+        if self._takeoff is None:
+            takeoff = analytic_takeoff if self.analytic else quantity_takeoff
+            self._takeoff = takeoff(self.buildups, self.lattice_materials)
+        return self._takeoff
+
+    def set_metrics(self, table) -> None:
+        """
+        Attach per-panel results, e.g. the run_pipeline DataFrame: every numeric column of a
+        table with a panel_id column (DataFrame or dict of columns). Unknown panel ids are ignored.
+        """
+        if hasattr(table, "columns"):
+            columns = {name: table[name].to_numpy() for name in table.columns}
+        else:
+            columns = dict(table)
+        if "panel_id" not in columns:
+            raise ValueError("The metrics table needs a panel_id column.")
+        rows = np.array([self._index.get(pid, -1) for pid in columns.pop("panel_id")], dtype=np.int64)
+        found = rows >= 0
+        for name, values in columns.items():
+            values = np.asarray(values)
+            if values.dtype.kind not in "biuf":
+                continue
+            column = self.metrics.get(name, np.full(len(self), np.nan))
+            column[rows[found]] = values[found]
+            self.metrics[name] = column
+
+    def metric(self, name: str) -> np.ndarray:
+        if name not in self.metrics:
+            raise ValueError(f"Unknown metric '{name}', available: {sorted(self.metrics)}.")
+        return self.metrics[name]
+
+    # --- queries ----------------------------------------------------------
+    def mask(
+        self,
+        storey=None,
+        orientation=None,
+        panel_type=None,
+        material=None,
+    ) -> np.ndarray:
+        """Panels matching every given criterion (a value or a list of values each)."""
+        keep = np.ones(len(self), dtype=bool)
+        for column, wanted in ((self.storey, storey), (self.orientation, orientation), (self.panel_type, panel_type)):
+            if wanted is not None:
+                keep &= np.isin(column, np.atleast_1d(np.asarray(wanted, dtype=column.dtype)))
+        if material is not None:
+            takeoff = self.takeoff
+            columns = [m for m, name in enumerate(takeoff.materials) if name in set(np.atleast_1d(material))]
+            keep &= np.any(takeoff.volume[:, columns] > 0, axis=1) if columns else False
+        return keep
+
+    def panels(self, mask: np.ndarray) -> List[str]:
+        """Panel ids of a boolean mask over the panels."""
+        return [self.panel_ids[p] for p in np.flatnonzero(mask)]
+
+    def material_totals(self, by: str = "storey", quantity: str = "volume", mask: np.ndarray = None) -> MaterialTotals:
+        """Takeoff totals (volume [m3], area [m2], lattice_volume, lattice_area) per group and material."""
+        if by not in GROUP_KEYS:
+            raise ValueError(f"Unknown grouping '{by}', expected one of {list(GROUP_KEYS)}.")
+        takeoff = self.takeoff
+        if quantity not in ("volume", "area", "lattice_volume", "lattice_area"):
+            raise ValueError(f"Unknown quantity '{quantity}'.")
+        values = getattr(takeoff, quantity)
+        group = np.array(self.panel_ids, dtype=object) if by == "panel" else getattr(self, by)
+        keep = np.ones(len(self), dtype=bool) if mask is None else np.asarray(mask, dtype=bool)
+        keys, inverse = np.unique(group[keep], return_inverse=True)
+        totals = np.zeros((len(keys), values.shape[1]))
+        np.add.at(totals, inverse.ravel(), values[keep])
+        return MaterialTotals(by, keys.tolist(), list(takeoff.materials), totals, quantity)
+
+    # --- elements ---------------------------------------------------------
+    @property
+    def elements(self) -> BuildingElements:
+        """Flat element table in world coordinates (materializes lazy buildups), computed once."""
+        if self._elements is None:
+            self._elements = self._element_table()
+        return self._elements
+
+    def _element_table(self) -> BuildingElements:
+        codes: Dict[str, int] = {}
+        panel, material, ids, boxes = [], [], [], []
+        for p, buildup in enumerate(self.buildups):
+            groups = []
+            if buildup.lattice is not None:
+                groups.append((buildup.lattice.elements, self.lattice_materials))
+            for layer in buildup.layers:
+                groups.append((layer.elements, layer.materials or {}))
+            for elements, mapping in groups:
+                for elem in elements:
+                    name = mapping.get(elem.element_type, elem.element_type)
+                    material.append(codes.setdefault(name, len(codes)))
+                    ids.append(elem.element_id)
+                    boxes.append((elem.x_min, elem.x_max, elem.y_min, elem.y_max, elem.z_min, elem.z_max))
+                panel.extend([p] * len(elements))
+        panel = np.array(panel, dtype=np.int64)
+        local = np.array(boxes, dtype=float).reshape(-1, 6)
+
+        # world box: centre mapped by the panel placement, half extents through |axes|
+        centre = (local[:, 0::2] + local[:, 1::2]) / 2
+        half = (local[:, 1::2] - local[:, 0::2]) / 2
+        axes, origins = self.axes[panel], self.origins[panel]
+        centre_w = np.einsum("ni,nij->nj", centre, axes) + origins
+        half_w = np.einsum("ni,nij->nj", half, np.abs(axes))
+        return BuildingElements(
+            panel=panel,
+            material=np.array(material, dtype=np.int64),
+            element_ids=ids,
+            materials=list(codes),
+            local=local,
+            world_min=centre_w - half_w,
+            world_max=centre_w + half_w,
+        )
+
+    def elements_in_box(self, lo, hi, inside: bool = False, mask: np.ndarray = None) -> np.ndarray:
+        """
+        Indices in `elements` of the elements whose world box intersects the box lo..hi
+        (inside=True: lies within it), optionally restricted to a panel mask.
+        """
+        table = self.elements
+        lo, hi = np.asarray(lo, dtype=float), np.asarray(hi, dtype=float)
+        if inside:
+            hit = np.all((table.world_min >= lo) & (table.world_max <= hi), axis=1)
+        else:
+            hit = np.all((table.world_min < hi) & (table.world_max > lo), axis=1)
+        if mask is not None:
+            hit &= np.asarray(mask, dtype=bool)[table.panel]
+        return np.flatnonzero(hit)
+
+    def element_records(self, indices) -> List[Dict]:
+        table = self.elements
+        return [
+            {
+                "panel_id": self.panel_ids[table.panel[i]],
+                "element_id": table.element_ids[i],
+                "material": table.materials[table.material[i]],
+                "world_min": table.world_min[i].tolist(),
+                "world_max": table.world_max[i].tolist(),
+            }
+            for i in np.asarray(indices, dtype=np.int64).tolist()
+        ]
+
+
+__all__ = [
+    "Building",
+    "BuildingElements",
+    "MaterialTotals",
+    "panel_orientation",
+]
@@ -0,0 +1,191 @@
+"""
+Command-line batch entry point.
+
+    python -m core.src.cli generate specs.jsonl --out out/ [--formats buildup,dxf,csv,json,html] [--lazy] [--exact]
+    python -m core.src.cli evaluate specs.jsonl --out results.csv [--stages acoustics,carbon] [--analytic] [--exact]
+
+specs.jsonl holds one panel per line, the keyword arguments of generate_wall_buildup:
+{"panel_id": "a", "panel_width": 6000, "panel_height": 3500,
+ "openings": [[1500, 1750, 1500, 2000]],            # center_x, center_z, width, height
+ "lattice_config": {...}, "layer_configs": [...]}
+Blank lines and lines starting with # are skipped. A spec may set "exact": true;
+--exact turns the integer micrometre geometry on for every panel.
+
+Only argparse and json are imported at startup. The geometry modules (shapely) are
+imported by the commands, plotly by the html format, the solvers (pandas, scipy)
+by evaluate and the fabrication formats, so a short batch job pays for what it uses.
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from typing import Dict, Iterator, List, Optional, Sequence
+
+PROG = "python -m core.src.cli"                # no packaging: run from the repository root
+BUILDUP_FORMATS = ("buildup", "html")          # core outputs
+FABRICATION_FORMATS = ("dxf", "csv", "json")   # solvers.production.fabrication.export
+
+
+def iter_specs(path: str) -> Iterator[Dict]:
+    """Panel specs of a JSON-lines file ("-": stdin), panel_id defaults to the line number."""
+    stream = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        for number, line in enumerate(stream, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                spec = json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"{path}:{number}: invalid JSON ({exc.msg}).") from None
+            spec.setdefault("panel_id", str(number))
+            yield spec
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def build(spec: Dict, lazy: bool = False, exact: bool = False):
+    """
+    WallBuildUp of one spec (openings given as Opening fields or [center_x, center_z, width, height]).
+    exact=True forces the exact mode of generate_wall_buildup, else the spec "exact" key decides.
+    """
+    from .openings import Opening
+    from .wall import generate_wall_buildup
+
+    missing = [key for key in ("panel_width", "panel_height", "lattice_config", "layer_configs") if key not in spec]
+    if missing:
+        raise ValueError(f"Panel {spec.get('panel_id')}: missing key(s) {missing}.")
+    openings = [
+        Opening(**op) if isinstance(op, dict) else Opening(*op)
+        for op in spec.get("openings", ())
+    ]
+    return generate_wall_buildup(
+        panel_id=str(spec["panel_id"]),
+        panel_width=spec["panel_width"],
+        panel_height=spec["panel_height"],
+        openings=openings,
+        lattice_config=spec["lattice_config"],
+        layer_configs=spec["layer_configs"],
+        lazy=lazy,
+        exact=exact or bool(spec.get("exact", False)),
+    )
+
+
+def _stem(panel_id) -> str:
+    return re.sub(r"[^A-Za-z0-9_.\-]+", "_", str(panel_id))
+
+
+def _formats(value: str, allowed: Sequence[str]) -> List[str]:
+    formats = [fmt.strip() for fmt in value.split(",") if fmt.strip()]
+    unknown = [fmt for fmt in formats if fmt not in allowed]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown format(s) {unknown}, expected some of {list(allowed)}")
+    return formats
+
+
+def cmd_generate(args) -> int:
+    os.makedirs(args.out, exist_ok=True)
+    fabrication = [fmt for fmt in args.formats if fmt in FABRICATION_FORMATS]
+    if fabrication:
+        from solvers.production.fabrication.export import export_panel
+    if "html" in args.formats:
+        from .viz import fig_3D_buildup
+
+    count = 0
+    for spec in iter_specs(args.specs):
+        buildup = build(spec, lazy=args.lazy, exact=args.exact)
+        stem = os.path.join(args.out, _stem(buildup.panel_id))
+        paths = []
+        if "buildup" in args.formats:
+            with open(f"{stem}.buildup.json", "w", encoding="utf-8") as f:
+                json.dump(buildup.as_dict(), f)
+            paths.append(f"{stem}.buildup.json")
+        if "html" in args.formats:
+            fig_3D_buildup(buildup).write_html(f"{stem}.html", include_plotlyjs="cdn")
+            paths.append(f"{stem}.html")
+        if fabrication:
+            paths.extend(export_panel(buildup, args.out, fabrication))
+        count += 1
+        if args.verbose:
+            print(buildup.panel_id, *paths, sep="\t")
+    print(f"{count} panel(s) written to {args.out}", file=sys.stderr)
+    return 0
+
+
+def cmd_evaluate(args) -> int:
+    from solvers.pipeline import STAGES, run_pipeline
+
+    stages = args.stages.split(",") if args.stages else None
+    if stages is not None:
+        unknown = [name for name in stages if name not in STAGES]
+        if unknown:
+            raise ValueError(f"Unknown stage(s) {unknown}, expected some of {list(STAGES)}.")
+    # analytic evaluation never needs the elements: keep the buildups lazy
+    buildups = [build(spec, lazy=args.analytic, exact=args.exact) for spec in iter_specs(args.specs)]
+    table = run_pipeline(buildups, stages, workers=args.workers, analytic=args.analytic)
+    if args.out is None or args.out == "-":
+        table.to_csv(sys.stdout, index=False)
+    elif args.out.endswith(".json"):
+        table.to_json(args.out, orient="records", indent=1)
+    else:
+        table.to_csv(args.out, index=False)
+    print(f"{len(table)} panel(s) evaluated", file=sys.stderr)
+    return 0
+
+
+def make_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog=PROG, description="Batch generation and evaluation of wall panels.")
+    parser.add_argument("--timing", action="store_true", help="print the elapsed time to stderr")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate = commands.add_parser("generate", help="generate buildups and write their files")
+    generate.add_argument("specs", help="JSON-lines panel specs ('-': stdin)")
+    generate.add_argument("--out", required=True, help="output directory")
+    generate.add_argument(
+        "--formats", default="buildup",
+        type=lambda value: _formats(value, BUILDUP_FORMATS + FABRICATION_FORMATS),
+        help=f"comma separated, some of {','.join(BUILDUP_FORMATS + FABRICATION_FORMATS)} (default: buildup)",
+    )
+    generate.add_argument("--lazy", action="store_true", help="generate the elements on first access only")
+    generate.add_argument("--exact", action="store_true", help="integer micrometre geometry for every panel")
+    generate.add_argument("-v", "--verbose", action="store_true", help="print the files of every panel")
+    generate.set_defaults(func=cmd_generate)
+
+    evaluate = commands.add_parser("evaluate", help="run the solver pipeline, one row per panel")
+    evaluate.add_argument("specs", help="JSON-lines panel specs ('-': stdin)")
+    evaluate.add_argument("--out", help="results .csv or .json (default: csv on stdout)")
+    evaluate.add_argument("--stages", help="comma separated pipeline stages (default: all)")
+    evaluate.add_argument("--analytic", action="store_true", help="closed-form quantities, no element generation")
+    evaluate.add_argument("--exact", action="store_true", help="integer micrometre geometry for every panel")
+    evaluate.add_argument("--workers", type=int, default=None)
+    evaluate.set_defaults(func=cmd_evaluate)
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = make_parser().parse_args(argv)
+    start = time.perf_counter()
+    try:
+        status = args.func(args)
+    except (ValueError, OSError) as exc:
+        print(f"{PROG} {args.command}: error: {exc}", file=sys.stderr)
+        return 1
+    if args.timing:
+        print(f"{time.perf_counter() - start:.3f} s", file=sys.stderr)
+    return status
+
+
+__all__ = [
+    "build",
+    "iter_specs",
+    "main",
+    "make_parser",
+]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
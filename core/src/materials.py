@@ -0,0 +1,61 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict
+
+
+@dataclass(frozen=True)
+class Material:
+    name: str
+    conductivity: float       # lambda [W/mK]
+    density: float            # rho [kg/m3]
+    heat_capacity: float      # c [J/kgK]
+    vapour_resistance: float  # mu [-]
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "name": self.name,
+            "conductivity": self.conductivity,
+            "density": self.density,
+            "heat_capacity": self.heat_capacity,
+            "vapour_resistance": self.vapour_resistance,
+        }
+
+
+# Physical Material Database (ISO 10456 design values unless stated otherwise).
+# Keys match the names used in Layer.materials.
+MATERIALS: Dict[str, Material] = {
+    "Douglas": Material("Douglas", 0.13, 530.0, 1600.0, 50.0),
+    "Spruce": Material("Spruce", 0.13, 550.0, 1600.0, 50.0),
+    "CLT": Material("CLT", 0.13, 470.0, 1600.0, 50.0),
+    "OSB": Material("OSB", 0.13, 650.0, 1700.0, 30.0),
+    "BA13": Material("BA13", 0.25, 850.0, 1000.0, 10.0),
+    "Mineral Wool": Material("Mineral Wool", 0.035, 50.0, 1030.0, 1.0),
+    "Wood Fibre": Material("Wood Fibre", 0.038, 50.0, 2100.0, 3.0),      # Gutex (lattice core)
+    "Laine de bois": Material("Laine de bois", 0.038, 50.0, 2100.0, 3.0),
+    "fibro ciment": Material("fibro ciment", 0.35, 1600.0, 1000.0, 50.0),
+    "Concrete": Material("Concrete", 2.30, 2400.0, 1000.0, 130.0),
+    "EPS": Material("EPS", 0.038, 15.0, 1450.0, 60.0),
+    "Air": Material("Air", 0.025, 1.2, 1000.0, 1.0),                    # still air (unfilled cavity)
+}
+
+# The lattice carries no material names on its elements: slats are spruce,
+# the infill is the low density wood fibre used in the thermal notebooks.
+LATTICE_MATERIALS: Dict[str, str] = {
+    "slat": "Spruce",
+    "insulation": "Wood Fibre",
+}
+
+
+def get_material(name: str, materials: Dict[str, Material] = None) -> Material:
+    materials = MATERIALS if materials is None else materials
+    if name not in materials:
+        raise ValueError(f"Unknown material '{name}'.")
+    return materials[name]
+
+
+__all__ = [
+    "Material",
+    "MATERIALS",
+    "LATTICE_MATERIALS",
+    "get_material",
+]
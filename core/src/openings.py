@@ -7,6 +7,8 @@ import numpy as np
 from shapely.geometry import Polygon, box
 from shapely.ops import unary_union
 
+from .profiling import profiled
+
 
 AXIS_MAP = {"x": 0, "y": 1, "z": 2}
 
@@ -67,6 +69,7 @@ def _polygons_from_projection(
     return polys
 
 
+@profiled("create_union_projections")
 def create_union_projections(
     vertices_local: Sequence[Sequence[float]],
     faces: Sequence[Sequence[int]],
@@ -163,18 +166,190 @@ def extract_openings_from_zx(
     return openings
 
 
+# Scanline extraction (rectilinear panels)
+
+SCAN_SNAP = 1e-3   # grid the projected coordinates are snapped to (model units)
+
+
+def _boundary_edges(tri: np.ndarray):
+    """
+    Net boundary of the union of CCW triangles (m, 3, 2) on an integer grid.
+    Edges are grouped by supporting line; on each line the directed edges are
+    cancelled as signed 1D intervals (shared diagonals, T-junctions, stacked faces).
+    Returns (direction (k, 2), offset (k,), t0 (k,), t1 (k,), multiplicity (k,)).
+    """
+    start = tri.reshape(-1, 2)
+    end = np.roll(tri, -1, axis=1).reshape(-1, 2)
+    d = end - start
+    g = np.gcd(d[:, 0], d[:, 1])
+    g[g == 0] = 1
+    u = d // g[:, None]
+    sign = np.where((u[:, 0] > 0) | ((u[:, 0] == 0) & (u[:, 1] > 0)), 1, -1)
+    u = u * sign[:, None]
+    offset = u[:, 0] * start[:, 1] - u[:, 1] * start[:, 0]
+    t_start, t_end = np.sum(start * u, axis=1), np.sum(end * u, axis=1)
+
+    # events: +sign where an edge starts along its line, -sign where it ends
+    keys = np.concatenate([np.column_stack([u, offset])] * 2)
+    t = np.concatenate([np.minimum(t_start, t_end), np.maximum(t_start, t_end)])
+    delta = np.concatenate([sign, -sign])
+    order = np.lexsort((t, keys[:, 2], keys[:, 1], keys[:, 0]))
+    keys, t, delta = keys[order], t[order], delta[order]
+    multiplicity = np.cumsum(delta)
+    same = np.all(keys[1:] == keys[:-1], axis=1)
+    seg = np.flatnonzero(same & (t[1:] > t[:-1]) & (multiplicity[:-1] != 0))
+    return keys[seg, :2], keys[seg, 2], t[seg], t[seg + 1], multiplicity[seg]
+
+
+def scan_openings(
+    vertices_local: Sequence[Sequence[float]],
+    faces: Sequence[Sequence[int]],
+    panel_width: float,
+    panel_height: float,
+    min_width: float = 10.0,
+    min_height: float = 10.0,
+    min_area: float = 1e-4,
+    snap: float = SCAN_SNAP,
+    area_tol: float = 1e-8,
+) -> Optional[Tuple[List[Opening], float]]:
+    """
+    Openings of a rectilinear panel from its projected triangle edges, without polygon
+    booleans: (openings, covered area of the ZX projection), or None when the outline
+    has non-orthogonal edges. Same voids as extract_openings_from_zx (closed holes and
+    edge-open notches of the 0..panel_width x 0..panel_height envelope, one AABB each).
+
+    Sweep over the z slabs between the outline corners: in each slab the signed vertical
+    boundary edges give the coverage along x, uncovered intervals are voids, and voids
+    of adjacent slabs that overlap in x are one opening.
+    """
+    verts = np.asarray(vertices_local, dtype=float)
+    face_array = np.asarray(faces, dtype=int)
+    if face_array.shape[0] == 0:
+        raise ValueError("At least one face is required to build projections.")
+    tri = verts[face_array][:, :, [0, 2]]
+    area2 = ((tri[:, 1, 0] - tri[:, 0, 0]) * (tri[:, 2, 1] - tri[:, 0, 1])
+             - (tri[:, 2, 0] - tri[:, 0, 0]) * (tri[:, 1, 1] - tri[:, 0, 1]))
+    keep = np.abs(area2) / 2.0 > area_tol
+    tri, area2 = tri[keep], area2[keep]
+    tri[area2 < 0] = tri[area2 < 0][:, [0, 2, 1]]
+    q = np.rint(tri / snap).astype(np.int64)
+
+    direction, offset, t0, t1, mult = _boundary_edges(q)
+    if np.any((direction[:, 0] != 0) & (direction[:, 1] != 0)):
+        return None
+    vertical = direction[:, 0] == 0            # direction (0, 1): x = -offset, t = z
+    vx, vz0, vz1, vw = -offset[vertical], t0[vertical], t1[vertical], mult[vertical]
+
+    width_q, height_q = int(round(panel_width / snap)), int(round(panel_height / snap))
+    zs = np.unique(np.clip(np.concatenate([vz0, vz1, [0, height_q]]), 0, height_q))
+    order = np.argsort(vx, kind="stable")
+    vx, vz0, vz1, vw = vx[order], vz0[order], vz1[order], vw[order]
+
+    # coverage of the intervals between the sorted vertical edges, per slab
+    mid = (zs[:-1] + zs[1:]) / 2.0
+    active = (vz0[None, :] < mid[:, None]) & (vz1[None, :] > mid[:, None])
+    contribution = np.where(active, vw[None, :], 0)
+    right = np.cumsum(contribution[:, ::-1], axis=1)[:, ::-1]      # edges at or right of k
+    coverage = np.column_stack([right, np.zeros(len(mid), dtype=np.int64)])
+    edges = np.concatenate([[0], np.clip(vx, 0, width_q), [width_q]])
+    lengths = np.diff(edges)
+    slab_heights = np.diff(zs)
+    covered_area = float(np.sum(np.where(coverage > 0, lengths[None, :], 0) * slab_heights[:, None])) * snap * snap
+
+    # void runs per slab (zero-length intervals between coincident edges skipped),
+    # then connected across slabs
+    nonempty = np.flatnonzero(lengths > 0)
+    x_lo, x_hi = edges[nonempty], edges[nonempty + 1]
+    runs: List[Tuple[int, int, int]] = []    # (slab, x0, x1)
+    for s_idx in range(len(mid)):
+        void = coverage[s_idx, nonempty] <= 0
+        if not void.any():
+            continue
+        flags = np.concatenate([[False], void, [False]])
+        starts = np.flatnonzero(flags[1:] & ~flags[:-1])
+        stops = np.flatnonzero(~flags[1:] & flags[:-1])
+        runs.extend((s_idx, int(x_lo[a]), int(x_hi[b - 1])) for a, b in zip(starts, stops))
+
+    parent = list(range(len(runs)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    by_slab: Dict[int, List[int]] = {}
+    for i, (s_idx, _, _) in enumerate(runs):
+        by_slab.setdefault(s_idx, []).append(i)
+    for s_idx, members in by_slab.items():
+        for i in members:
+            for j in by_slab.get(s_idx + 1, ()):
+                if runs[i][1] < runs[j][2] and runs[j][1] < runs[i][2]:
+                    parent[find(i)] = find(j)
+
+    voids: Dict[int, List[float]] = {}
+    for i, (s_idx, x0, x1) in enumerate(runs):
+        box_ = voids.setdefault(find(i), [x0, int(zs[s_idx]), x1, int(zs[s_idx + 1]), 0.0])
+        box_[0], box_[1] = min(box_[0], x0), min(box_[1], int(zs[s_idx]))
+        box_[2], box_[3] = max(box_[2], x1), max(box_[3], int(zs[s_idx + 1]))
+        box_[4] += float(x1 - x0) * float(slab_heights[s_idx])
+
+    openings: List[Opening] = []
+    for x0, z0, x1, z1, area in sorted(voids.values()):
+        x_min, z_min, x_max, z_max = x0 * snap, z0 * snap, x1 * snap, z1 * snap
+        width, height = x_max - x_min, z_max - z_min
+        if area * snap * snap < min_area or width < min_width or height < min_height:
+            continue
+        openings.append(
+            Opening(
+                center_x=(x_min + x_max) / 2.0,
+                center_z=(z_min + z_max) / 2.0,
+                width=width,
+                height=height,
+            )
+        )
+    return openings, covered_area
+
+
+@profiled("extract_openings_scanline")
+def extract_openings_scanline(
+    vertices_local: Sequence[Sequence[float]],
+    faces: Sequence[Sequence[int]],
+    panel_width: float,
+    panel_height: float,
+    min_width: float = 10.0,
+    min_height: float = 10.0,
+    min_area: float = 1e-4,
+    snap: float = SCAN_SNAP,
+) -> List[Opening]:
+    """
+    scan_openings for rectilinear panels, create_union_projections + extract_openings_from_zx
+    when the projected outline has non-orthogonal edges.
+    """
+    scanned = scan_openings(vertices_local, faces, panel_width, panel_height, min_width, min_height, min_area, snap)
+    if scanned is not None:
+        return scanned[0]
+    union_zx = create_union_projections(vertices_local, faces)["ZX"]
+    return extract_openings_from_zx(union_zx, panel_width, panel_height, min_width, min_height, min_area)
+
+
 def compute_panel_metrics(
     vertices_local: Sequence[Sequence[float]],
-    union_zx: Polygon,
+    union_zx: Optional[Polygon],
     openings: Iterable[Opening],
+    gross_area: Optional[float] = None,
 ) -> PanelMetrics:
-    """Summarize panel dimensions and area/volume metrics."""
+    """
+    Summarize panel dimensions and area/volume metrics.
+    gross_area (e.g. from scan_openings) replaces the area of union_zx.
+    """
     verts = np.asarray(vertices_local, dtype=float)
     width = float(verts[:, 0].max() - verts[:, 0].min())
     thickness = float(verts[:, 1].max() - verts[:, 1].min())
     height = float(verts[:, 2].max() - verts[:, 2].min())
 
-    gross_area = float(union_zx.area)
+    if gross_area is None:
+        gross_area = float(union_zx.area)
     openings_list = list(openings)
     openings_area = float(sum(op.width * op.height for op in openings_list))
     net_area = gross_area - openings_area
@@ -201,4 +376,6 @@ __all__ = [
     "extract_openings_from_zx",
     "compute_opening_voids",
     "compute_panel_metrics",
+    "extract_openings_scanline",
+    "scan_openings",
 ]
@@ -0,0 +1,230 @@
+"""
+Opt-in instrumentation of the geometry generation hot path.
+
+Functions decorated with `profiled` (generators of wall.py, the projections of
+openings.py, the viz builders) only check a module global while no profiler is
+active. Inside `with profile() as prof:` every call records its duration, its
+label (e.g. the layer index and name of `generate_layer`), the number of
+elements it produced, the shapely operations it ran (difference, intersection,
+buffer, unary_union; counted by patching shapely for the duration of the block)
+and optionally the peak of traced allocations (memory=True, tracemalloc).
+
+    with profile() as prof:
+        generate_wall_buildup(...)
+    prof.as_records()      # flat table, one row per stage and label
+    prof.to_json("profile.json")
+"""
+from __future__ import annotations
+import functools
+import inspect
+import json
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence
+
+from shapely.geometry.base import BaseGeometry
+import shapely.ops
+
+SHAPELY_METHODS = ("difference", "intersection", "union", "buffer")
+SHAPELY_FUNCTIONS = ("unary_union",)
+
+_ACTIVE: Optional["Profiler"] = None
+
+
+@dataclass
+class CallRecord:
+    stage: str
+    label: str
+    parent: int            # index of the enclosing call, -1 at top level
+    duration: float = 0.0  # [s]
+    elements: int = 0
+    shapely_ops: Dict[str, int] = field(default_factory=dict)
+    memory_peak: int = 0   # [bytes], 0 without memory=True
+
+    def as_dict(self) -> Dict:
+        return {
+            "stage": self.stage,
+            "label": self.label,
+            "parent": self.parent,
+            "duration": self.duration,
+            "elements": self.elements,
+            "shapely_ops": dict(self.shapely_ops),
+            "memory_peak": self.memory_peak,
+        }
+
+
+def _count_elements(result) -> int:
+    """Elements produced by a generator (LatticeLayout, Layer, WallBuildUp)."""
+    if hasattr(result, "layers") and hasattr(result, "lattice"):
+        lattice = len(result.lattice.elements) if result.lattice is not None else 0
+        return lattice + sum(len(layer.elements) for layer in result.layers)
+    elements = getattr(result, "elements", None)
+    return len(elements) if isinstance(elements, list) else 0
+
+
+class Profiler:
+    def __init__(self, memory: bool = False):
+        self.memory = memory
+        self.calls: List[CallRecord] = []
+        self.ops: Dict[str, int] = {name: 0 for name in SHAPELY_METHODS + SHAPELY_FUNCTIONS}
+        self.wall_time = 0.0
+        self._stack: List[int] = []
+        self._peaks: List[int] = []
+        self._patched: List[tuple] = []
+        self._started_tracing = False
+        self._t0 = 0.0
+
+    # --- shapely counters -------------------------------------------------
+    def _patch(self) -> None:
+        ops = self.ops
+
+        def counted(name, func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                ops[name] += 1
+                return func(*args, **kwargs)
+            return wrapper
+
+        for name in SHAPELY_METHODS:
+            original = getattr(BaseGeometry, name)
+            self._patched.append((BaseGeometry, name, original))
+            setattr(BaseGeometry, name, counted(name, original))
+        # modules bind unary_union at import: patch every loaded reference
+        for name in SHAPELY_FUNCTIONS:
+            original = getattr(shapely.ops, name)
+            wrapper = counted(name, original)
+            for module in list(sys.modules.values()):
+                if module is not None and getattr(module, name, None) is original:
+                    self._patched.append((module, name, original))
+                    setattr(module, name, wrapper)
+
+    def _unpatch(self) -> None:
+        for owner, name, original in reversed(self._patched):
+            setattr(owner, name, original)
+        self._patched.clear()
+
+    # --- context ----------------------------------------------------------
+    def __enter__(self) -> "Profiler":
+        global _ACTIVE
+        if _ACTIVE is not None:
+            raise ValueError("A profiler is already active.")
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._patch()
+        _ACTIVE = self
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        global _ACTIVE
+        self.wall_time = time.perf_counter() - self._t0
+        _ACTIVE = None
+        self._unpatch()
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    # --- recording --------------------------------------------------------
+    def _enter(self, stage: str, label: str) -> int:
+        index = len(self.calls)
+        self.calls.append(CallRecord(stage, label, self._stack[-1] if self._stack else -1,
+                                     shapely_ops=dict(self.ops)))
+        self._stack.append(index)
+        if self.memory:
+            # keep the peak reached so far by the enclosing call before resetting
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            self._peaks.append(tracemalloc.get_traced_memory()[0])
+        return index
+
+    def _exit(self, index: int, duration: float, result) -> None:
+        record = self.calls[index]
+        record.duration = duration
+        record.elements = _count_elements(result)
+        record.shapely_ops = {name: self.ops[name] - before for name, before in record.shapely_ops.items()
+                              if self.ops[name] > before}
+        self._stack.pop()
+        if self.memory:
+            peak = max(self._peaks.pop(), tracemalloc.get_traced_memory()[1])
+            record.memory_peak = peak
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], peak)
+
+    # --- reports ----------------------------------------------------------
+    def as_records(self) -> List[Dict]:
+        """Flat table, one row per (stage, label): calls, total / mean / max time, elements, shapely ops."""
+        rows: Dict[tuple, Dict] = {}
+        for record in self.calls:
+            row = rows.setdefault((record.stage, record.label), {
+                "stage": record.stage, "label": record.label, "calls": 0, "total": 0.0,
+                "max": 0.0, "elements": 0, "memory_peak": 0,
+                **{f"ops_{name}": 0 for name in self.ops},
+            })
+            row["calls"] += 1
+            row["total"] += record.duration
+            row["max"] = max(row["max"], record.duration)
+            row["elements"] += record.elements
+            row["memory_peak"] = max(row["memory_peak"], record.memory_peak)
+            for name, count in record.shapely_ops.items():
+                row[f"ops_{name}"] += count
+        for row in rows.values():
+            row["mean"] = row["total"] / row["calls"]
+        return sorted(rows.values(), key=lambda row: -row["total"])
+
+    def report(self) -> Dict:
+        return {
+            "wall_time": self.wall_time,
+            "shapely_ops": dict(self.ops),
+            "stages": self.as_records(),
+            "calls": [record.as_dict() for record in self.calls],
+        }
+
+    def to_json(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=1)
+
+
+def profile(memory: bool = False) -> Profiler:
+    """Context manager enabling the instrumentation (see module docstring)."""
+    return Profiler(memory=memory)
+
+
+def profiled(stage: str, label_args: Sequence[str] = ()) -> Callable:
+    """
+    Decorator recording the calls of a hot-path function while a profiler is active.
+    label_args: argument names joined into the label of the call (e.g. layer_index, name).
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = _ACTIVE
+            if profiler is None:
+                return func(*args, **kwargs)
+            label = ""
+            if label_args:
+                bound = signature.bind_partial(*args, **kwargs).arguments
+                label = " ".join(str(bound[name]) for name in label_args if name in bound)
+            index = profiler._enter(stage, label)
+            start = time.perf_counter()
+            result = None
+            try:
+                result = func(*args, **kwargs)
+                return result
+            finally:
+                profiler._exit(index, time.perf_counter() - start, result)
+        return wrapper
+    return decorator
+
+
+__all__ = [
+    "CallRecord",
+    "Profiler",
+    "profile",
+    "profiled",
+]
@@ -0,0 +1,262 @@
+"""
+Spatial QA of generated buildups (clashes, clearance, coverage, layer order).
+
+All elements of a batch are flattened into (n, 6) AABB arrays once, then:
+
+- overlap       : two elements of the same panel and the same y slab intersect with
+                  a positive volume. Broad phase: sweep and prune on x_min, sorted by
+                  (panel, slab, x_min), candidate pairs generated with searchsorted;
+                  narrow phase: exact box intersection on z and y, then the intersection
+                  of the element faces when one of them has an `outline`.
+- clearance     : an element cuts into an opening grown by `clearance` (exact distance
+                  from the void polygon to the element face: its `outline` when it was
+                  cut around an opening, else its box). Framing members (slats, battens)
+                  flush against an opening edge, outside the opening, are placed there
+                  by the generator and not reported for that opening.
+- coverage_gap  : a filled layer (insulation, boards) leaves more than `min_gap_area`
+                  of the panel uncovered: envelope - openings (with clearance)
+                  - element face areas + overlaps.
+- layer_overlap : two wall layers (or a layer and the lattice) overlap in y.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+
+import numpy as np
+from shapely.geometry import box
+from shapely.ops import unary_union
+
+from .wall import OPENING_CLEARANCE
+
+QA_TOLERANCE = 0.1        # [mm] below: arc and AABB round-off of the generator
+MIN_GAP_AREA = 100.0      # [mm2]
+PAIR_CHUNK = 1 << 22      # candidate pairs checked at once
+FRAMING_TYPES = ("slat", "batten")
+
+
+@dataclass
+class QAIssue:
+    panel_id: str
+    kind: str          # overlap / clearance / coverage_gap / layer_overlap
+    item_a: str        # element id or layer name
+    item_b: str        # element id, opening index or layer name ("" if none)
+    value: float       # overlap volume [mm3], distance [mm], gap area [mm2], overlap [mm]
+
+    def as_dict(self) -> Dict:
+        return {
+            "panel_id": self.panel_id,
+            "kind": self.kind,
+            "item_a": self.item_a,
+            "item_b": self.item_b,
+            "value": self.value,
+        }
+
+
+@dataclass
+class QAReport:
+    panel_ids: List[str]
+    issues: List[QAIssue]
+
+    @property
+    def ok(self) -> bool:
+        return not self.issues
+
+    def counts(self) -> Dict[str, Dict[str, int]]:
+        """panel_id -> kind -> number of issues (panels without issue omitted)."""
+        out: Dict[str, Dict[str, int]] = {}
+        for issue in self.issues:
+            kinds = out.setdefault(issue.panel_id, {})
+            kinds[issue.kind] = kinds.get(issue.kind, 0) + 1
+        return out
+
+    def as_records(self) -> List[Dict]:
+        return [issue.as_dict() for issue in self.issues]
+
+
+def _flatten(buildups):
+    """
+    Element boxes (n, 6) x0 x1 y0 y1 z0 z1, panel index, slab (panel, y range) index, ids,
+    slab keys, filled slabs, element outlines (None: the face is the box) and framing flags.
+    """
+    boxes, panel, slab, ids, filled, outlines, framing = [], [], [], [], [], [], []
+    slab_codes: Dict[tuple, int] = {}
+    for p, buildup in enumerate(buildups):
+        groups = []
+        if buildup.lattice is not None:
+            groups.append((buildup.lattice.elements, False))
+        for layer in buildup.layers:
+            groups.append((layer.elements, layer.layer_type == "continuous"))
+        for elements, board in groups:
+            for elem in elements:
+                key = (p, elem.y_min, elem.y_max)
+                code = slab_codes.setdefault(key, len(slab_codes))
+                if code == len(filled):
+                    filled.append(False)
+                filled[code] = filled[code] or board or elem.orientation == "surface"
+                boxes.append((elem.x_min, elem.x_max, elem.y_min, elem.y_max, elem.z_min, elem.z_max))
+                panel.append(p)
+                slab.append(code)
+                ids.append(elem.element_id)
+                outlines.append(getattr(elem, "outline", None))
+                framing.append(elem.element_type in FRAMING_TYPES)
+    return (
+        np.array(boxes, dtype=float).reshape(-1, 6),
+        np.array(panel, dtype=np.int64),
+        np.array(slab, dtype=np.int64),
+        ids,
+        list(slab_codes),
+        np.array(filled, dtype=bool),
+        outlines,
+        np.array(framing, dtype=bool),
+    )
+
+
+def _candidate_pairs(boxes: np.ndarray, slab: np.ndarray, tol: float):
+    """Sweep and prune on x inside every slab; yields chunks of (i, j) with x overlap."""
+    order = np.lexsort((boxes[:, 0], slab))
+    x0, x1, s = boxes[order, 0], boxes[order, 1], slab[order]
+    # composite key (slab, x) for one searchsorted over the whole batch
+    stride = float(np.ptp(boxes[:, :2]) + 10.0) if len(boxes) else 1.0
+    key = s * stride + (x0 - x0.min() if len(x0) else x0)
+    end = np.searchsorted(key, s * stride + (x1 - x0.min() if len(x0) else x1) - tol, side="left")
+    counts = np.maximum(end - np.arange(len(order)) - 1, 0)
+
+    start = 0
+    cum = np.cumsum(counts)
+    while start < len(order):
+        stop = int(np.searchsorted(cum, (cum[start - 1] if start else 0) + PAIR_CHUNK, side="right"))
+        stop = max(stop, start + 1)
+        idx = np.arange(start, stop)
+        c = counts[start:stop]
+        i = np.repeat(idx, c)
+        j = i + 1 + (np.arange(c.sum()) - np.repeat(np.cumsum(c) - c, c))
+        yield order[i], order[j]
+        start = stop
+
+
+def _overlaps(boxes, slab, outlines, tol):
+    """(i, j, volume) of the intersecting element pairs."""
+    found_i, found_j, found_v = [], [], []
+    for i, j in _candidate_pairs(boxes, slab, tol):
+        a, b = boxes[i], boxes[j]
+        dx = np.minimum(a[:, 1], b[:, 1]) - np.maximum(a[:, 0], b[:, 0])
+        dy = np.minimum(a[:, 3], b[:, 3]) - np.maximum(a[:, 2], b[:, 2])
+        dz = np.minimum(a[:, 5], b[:, 5]) - np.maximum(a[:, 4], b[:, 4])
+        hit = (dx > tol) & (dy > tol) & (dz > tol)
+        volume = dx * dy * dz
+        # pieces cut around an opening: intersect their real faces, not their boxes
+        for k in np.flatnonzero(hit).tolist():
+            oa, ob = outlines[i[k]], outlines[j[k]]
+            if oa is None and ob is None:
+                continue
+            area = _face(a[k], oa).intersection(_face(b[k], ob)).area
+            volume[k] = area * dy[k]
+            hit[k] = area > tol * tol
+        found_i.append(i[hit])
+        found_j.append(j[hit])
+        found_v.append(volume[hit])
+    if not found_i:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+    return np.concatenate(found_i), np.concatenate(found_j), np.concatenate(found_v)
+
+
+def _face(b: np.ndarray, outline):
+    """(x, z) face of an element from its box row and outline."""
+    return outline if outline is not None else box(b[0], b[4], b[1], b[5])
+
+
+def _flush_framing(b: np.ndarray, bounds, tol: float) -> bool:
+    """Box outside the opening rectangle with one side on an opening edge."""
+    vx0, vz0, vx1, vz1 = bounds
+    outside = (
+        min(b[1], vx1) - max(b[0], vx0) <= tol
+        or min(b[5], vz1) - max(b[4], vz0) <= tol
+    )
+    flush = min(abs(b[1] - vx0), abs(b[0] - vx1), abs(b[5] - vz0), abs(b[4] - vz1)) <= tol
+    return outside and flush
+
+
+def _opening_polygons(buildup) -> List:
+    if buildup.opening_voids:
+        return list(buildup.opening_voids)
+    return [opening.to_polygon() for opening in buildup.openings]
+
+
+def check_buildups(
+    buildups: Sequence,
+    clearance: float = OPENING_CLEARANCE,
+    tol: float = QA_TOLERANCE,
+    min_gap_area: float = MIN_GAP_AREA,
+) -> QAReport:
+    """Run every check on a batch of WallBuildUp objects."""
+    buildups = list(buildups)
+    boxes, panel, slab, ids, slabs, filled, outlines, framing = _flatten(buildups)
+    issues: List[QAIssue] = []
+
+    # layer order in y
+    for buildup in buildups:
+        ranges = [(layer.y_min, layer.y_max, f"{layer.name} ({layer.layer_index})") for layer in buildup.layers]
+        if buildup.lattice is not None and buildup.lattice.layer_ranges:
+            ranges.append((buildup.lattice.layer_ranges[0][0], buildup.lattice.layer_ranges[-1][1], "lattice"))
+        ranges.sort()
+        for (_, hi_a, name_a), (lo_b, _, name_b) in zip(ranges[:-1], ranges[1:]):
+            if hi_a - lo_b > tol:
+                issues.append(QAIssue(buildup.panel_id, "layer_overlap", name_a, name_b, float(hi_a - lo_b)))
+
+    # element clashes
+    ii, jj, volume = _overlaps(boxes, slab, outlines, tol)
+    overlap_area = np.bincount(
+        slab[ii], weights=volume / np.maximum(boxes[ii, 3] - boxes[ii, 2], tol), minlength=len(slabs)
+    )
+    for i, j, v in zip(ii.tolist(), jj.tolist(), volume.tolist()):
+        issues.append(QAIssue(buildups[panel[i]].panel_id, "overlap", ids[i], ids[j], v))
+
+    # clearance around openings and coverage of filled slabs
+    face_area = (boxes[:, 1] - boxes[:, 0]) * (boxes[:, 5] - boxes[:, 4])
+    for i, outline in enumerate(outlines):
+        if outline is not None:
+            face_area[i] = outline.area
+    slab_area = np.bincount(slab, weights=face_area, minlength=len(slabs))
+    first = np.searchsorted(panel, np.arange(len(buildups)))
+    last = np.searchsorted(panel, np.arange(len(buildups)), side="right")
+    slab_panel = np.array([key[0] for key in slabs], dtype=np.int64)
+    for p, buildup in enumerate(buildups):
+        envelope = box(0.0, 0.0, buildup.panel_width, buildup.panel_height)
+        voids = _opening_polygons(buildup)
+        b = boxes[first[p]:last[p]]
+        for k, void in enumerate(voids):
+            vx0, vz0, vx1, vz1 = void.bounds
+            near = np.flatnonzero(
+                (b[:, 0] < vx1 + clearance - tol) & (b[:, 1] > vx0 - clearance + tol)
+                & (b[:, 4] < vz1 + clearance - tol) & (b[:, 5] > vz0 - clearance + tol)
+            )
+            for e in near.tolist():
+                i = first[p] + e
+                if framing[i] and _flush_framing(b[e], void.bounds, tol):
+                    continue
+                distance = void.distance(_face(b[e], outlines[i]))
+                if distance < clearance - tol:
+                    issues.append(QAIssue(buildup.panel_id, "clearance", ids[i], f"opening {k}", distance))
+
+        expected = envelope.area
+        if voids:
+            expected -= unary_union(voids).buffer(clearance).intersection(envelope).area
+        for s in np.flatnonzero((slab_panel == p) & filled).tolist():
+            gap = expected - slab_area[s] + overlap_area[s]
+            if gap > min_gap_area:
+                _, y_min, y_max = slabs[s]
+                issues.append(QAIssue(buildup.panel_id, "coverage_gap", f"y {y_min:g}..{y_max:g}", "", float(gap)))
+
+    return QAReport(panel_ids=[b.panel_id for b in buildups], issues=issues)
+
+
+def check_buildup(buildup, **kwargs) -> QAReport:
+    return check_buildups([buildup], **kwargs)
+
+
+__all__ = [
+    "QAIssue",
+    "QAReport",
+    "check_buildup",
+    "check_buildups",
+]
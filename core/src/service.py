@@ -0,0 +1,292 @@
+"""
+Background generation of buildups for interactive exploration (playground widgets).
+
+A GenerationService owns one worker thread. Every `submit` supersedes the previous
+request: a request still waiting is dropped, a running one stops at its next stage.
+The worker waits `debounce` seconds after the last submit before starting, so a
+slider dragged over ten values builds once. A build runs stage by stage (lattice,
+each layer in order, then the optional figure) and reports the progress after each
+stage; stages are cached on their own parameters (LRU), so changing one layer
+only regenerates that layer and the figure.
+
+    service = GenerationService(render=fig_3D_buildup, on_done=lambda job: show(job.figure))
+    slider.observe(lambda change: service.submit(params(change)), "value")
+    job = service.submit(params)   # params: keyword arguments of generate_wall_buildup but lazy
+    job.result(timeout=30)
+
+Cancellation is cooperative: a stage already running (one generate_layer call)
+finishes before the job stops. Threads rather than processes: stages are mostly
+shapely calls and the results (element lists, figures) stay in the kernel.
+"""
+from __future__ import annotations
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional
+
+from .wall import WallBuildUp, generate_lattice_layout, generate_layer
+
+DEBOUNCE = 0.25           # [s] quiet time after the last submit before a build starts
+CACHE_SIZE = 64           # cached stages (lattices, layers, figures)
+
+PENDING, RUNNING, DONE, CANCELLED, FAILED = "pending", "running", "done", "cancelled", "failed"
+
+_JOB_IDS = itertools.count(1)
+
+
+def _freeze(value):
+    """Hashable key of a parameter value (dicts, lists, Opening, shapely geometries)."""
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if hasattr(value, "bounds") and hasattr(value, "center_x"):     # Opening
+        return ("opening", tuple(value.bounds))
+    if hasattr(value, "wkb"):                                       # shapely geometry
+        return ("geometry", value.wkb)
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+@dataclass
+class GenerationJob:
+    params: Dict
+    job_id: int = field(default_factory=lambda: next(_JOB_IDS))
+    status: str = PENDING
+    stage: str = ""
+    done: int = 0                      # completed stages
+    total: int = 0
+    cached: int = 0                    # stages taken from the cache
+    buildup: Optional[WallBuildUp] = None
+    figure: object = None
+    error: Optional[BaseException] = None
+    duration: float = 0.0              # [s] from start to end of the build
+    _event: threading.Event = field(default_factory=threading.Event, repr=False)
+    _cancel: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def progress(self) -> float:
+        return self.done / self.total if self.total else 0.0
+
+    @property
+    def finished(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._event.wait(timeout)
+
+    def result(self, timeout: Optional[float] = None) -> WallBuildUp:
+        """Block until the build ends; raises its error, or ValueError if it was cancelled."""
+        if not self._event.wait(timeout):
+            raise TimeoutError(f"Job {self.job_id} still {self.status} after {timeout} s.")
+        if self.status == FAILED:
+            raise self.error
+        if self.status == CANCELLED:
+            raise ValueError(f"Job {self.job_id} was cancelled.")
+        return self.buildup
+
+    def as_dict(self) -> Dict:
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "stage": self.stage,
+            "done": self.done,
+            "total": self.total,
+            "cached": self.cached,
+            "duration": self.duration,
+            "error": repr(self.error) if self.error is not None else None,
+        }
+
+
+class GenerationService:
+    """
+    Debounced, cancellable, cached buildup generation in a worker thread.
+    render: optional callable (buildup -> figure) run as the last stage (e.g. fig_3D_buildup).
+    on_progress(job) is called after every stage, on_done(job) once the job ends
+    (done, cancelled or failed); both run in the worker thread.
+    """
+
+    def __init__(
+        self,
+        render: Optional[Callable[[WallBuildUp], object]] = None,
+        on_progress: Optional[Callable[[GenerationJob], None]] = None,
+        on_done: Optional[Callable[[GenerationJob], None]] = None,
+        debounce: float = DEBOUNCE,
+        cache_size: int = CACHE_SIZE,
+    ):
+        if debounce < 0:
+            raise ValueError("debounce must be >= 0.")
+        self.render = render
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.debounce = debounce
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[tuple, object]" = OrderedDict()
+        self._pending: Optional[GenerationJob] = None
+        self._running: Optional[GenerationJob] = None
+        self._deadline = 0.0
+        self._closed = False
+        self._lock = threading.Condition()
+        self._thread = threading.Thread(target=self._loop, name="generation-service", daemon=True)
+        self._thread.start()
+
+    # --- requests ---------------------------------------------------------
+    def submit(self, params: Dict) -> GenerationJob:
+        """
+        Queue a build with the keyword arguments of generate_wall_buildup (panel_id,
+        panel_width, panel_height, openings, lattice_config, layer_configs, opening_voids,
+        exact). Other keys, lazy included (a job always builds every stage), fail the job
+        with a ValueError.
+        Supersedes the waiting and the running job.
+        """
+        job = GenerationJob(params=dict(params))
+        with self._lock:
+            if self._closed:
+                raise ValueError("The generation service is closed.")
+            if self._running is not None:
+                self._running.cancel()
+            if self._pending is not None:
+                self._pending.cancel()
+                self._finish(self._pending, CANCELLED)
+            self._pending = job
+            self._deadline = time.monotonic() + self.debounce
+            self._lock.notify_all()
+        return job
+
+    def latest(self) -> Optional[GenerationJob]:
+        with self._lock:
+            return self._pending or self._running
+
+    def cache_clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self.hits = self.misses = 0
+
+    def close(self, wait: bool = True) -> None:
+        """Cancel the outstanding jobs and stop the worker."""
+        with self._lock:
+            self._closed = True
+            jobs = [j for j in (self._pending, self._running) if j is not None]
+            self._lock.notify_all()
+        for job in jobs:
+            job.cancel()
+        if wait:
+            self._thread.join()
+
+    def __enter__(self) -> "GenerationService":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # --- worker -----------------------------------------------------------
+    def _loop(self) -> None:
+        while True:
+            with self._lock:
+                while not self._closed and (self._pending is None or time.monotonic() < self._deadline):
+                    timeout = None if self._pending is None else self._deadline - time.monotonic()
+                    self._lock.wait(timeout)
+                if self._closed:
+                    job = self._pending
+                    self._pending = None
+                    if job is not None:
+                        self._finish(job, CANCELLED)
+                    return
+                job, self._pending = self._pending, None
+                self._running = job
+            self._run(job)
+            with self._lock:
+                self._running = None
+
+    def _cached(self, key: tuple, build: Callable[[], object], job: GenerationJob):
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                job.cached += 1
+                return self._cache[key]
+            self.misses += 1
+        value = build()
+        with self._lock:
+            self._cache[key] = value
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return value
+
+    def _stage(self, job: GenerationJob, name: str) -> bool:
+        """Report the completed stage; False once the job has been superseded."""
+        job.done += 1
+        job.stage = name
+        if self.on_progress is not None:
+            self.on_progress(job)
+        return not job._cancel.is_set()
+
+    def _run(self, job: GenerationJob) -> None:
+        if job._cancel.is_set():
+            return self._finish(job, CANCELLED)
+        start = time.perf_counter()
+        job.status = RUNNING
+        params = dict(job.params)
+        try:
+            lattice_config = params.pop("lattice_config")
+            layer_configs = list(params.pop("layer_configs"))
+            common = dict(
+                panel_id=params.pop("panel_id"),
+                panel_width=params.pop("panel_width"),
+                panel_height=params.pop("panel_height"),
+                openings=params.pop("openings"),
+                opening_voids=params.pop("opening_voids", ()),
+            )
+            generation = dict(common, exact=bool(params.pop("exact", False)))
+            if params:
+                raise ValueError(f"Unknown generation parameter(s) {sorted(params)}.")
+            job.total = 1 + len(layer_configs) + (self.render is not None)
+            base = _freeze(generation)
+
+            lattice = self._cached(("lattice", base, _freeze(lattice_config)),
+                                   lambda: generate_lattice_layout(**generation, **lattice_config), job)
+            if not self._stage(job, "lattice"):
+                return self._finish(job, CANCELLED, start)
+            layers = []
+            for cfg in layer_configs:
+                layers.append(self._cached(("layer", base, _freeze(cfg)),
+                                           lambda: generate_layer(**generation, **cfg), job))
+                if not self._stage(job, f"layer {cfg.get('layer_index', '')} {cfg.get('name', '')}".strip()):
+                    return self._finish(job, CANCELLED, start)
+            job.buildup = WallBuildUp(lattice=lattice, layers=layers, **common)
+
+            if self.render is not None:
+                key = ("figure", base, _freeze(lattice_config), _freeze(layer_configs))
+                job.figure = self._cached(key, lambda: self.render(job.buildup), job)
+                if not self._stage(job, "figure"):
+                    return self._finish(job, CANCELLED, start)
+        except Exception as exc:
+            job.error = exc
+            return self._finish(job, FAILED, start)
+        self._finish(job, DONE, start)
+
+    def _finish(self, job: GenerationJob, status: str, start: Optional[float] = None) -> None:
+        if job.finished:
+            return
+        job.status = status
+        if start is not None:
+            job.duration = time.perf_counter() - start
+        job._event.set()
+        if self.on_done is not None:
+            self.on_done(job)
+
+
+__all__ = [
+    "GenerationJob",
+    "GenerationService",
+]
@@ -0,0 +1,172 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from shapely.geometry import box
+
+from .materials import LATTICE_MATERIALS, Material, get_material
+
+
+@dataclass
+class StackLayer:
+    layer_index: object      # int for the lattice sub-layers, str for the wall layers
+    name: str
+    y_min: float
+    y_max: float
+    fractions: Dict[str, float]  # material -> share of the net panel area
+
+    @property
+    def thickness(self) -> float:
+        return self.y_max - self.y_min
+
+    def equivalent(self, materials: Dict[str, Material] = None) -> Dict[str, float]:
+        """Homogenised properties of the layer (parallel paths, ISO 6946 lower bound)."""
+        conductivity = 0.0
+        density = 0.0
+        heat = 0.0
+        vapour = 0.0
+        for name, frac in self.fractions.items():
+            mat = get_material(name, materials)
+            conductivity += frac * mat.conductivity
+            density += frac * mat.density
+            heat += frac * mat.density * mat.heat_capacity
+            vapour += frac * mat.vapour_resistance
+        return {
+            "thickness": self.thickness,
+            "conductivity": conductivity,
+            "density": density,
+            "heat_capacity": heat / density if density > 0 else 0.0,
+            "vapour_resistance": vapour,
+        }
+
+    def as_dict(self) -> Dict:
+        return {
+            "layer_index": self.layer_index,
+            "name": self.name,
+            "y_min": self.y_min,
+            "y_max": self.y_max,
+            "thickness": self.thickness,
+            "fractions": self.fractions,
+        }
+
+
+def net_panel_area(buildup) -> float:
+    """Panel area minus the openings (clipped to the panel envelope) [mm2]."""
+    gross = buildup.panel_width * buildup.panel_height
+    if buildup.opening_voids:
+        envelope = box(0.0, 0.0, buildup.panel_width, buildup.panel_height)
+        return gross - sum(poly.intersection(envelope).area for poly in buildup.opening_voids)
+    openings_area = 0.0
+    for opening in buildup.openings:
+        x_min, z_min, x_max, z_max = opening.bounds
+        dx = min(x_max, buildup.panel_width) - max(x_min, 0.0)
+        dz = min(z_max, buildup.panel_height) - max(z_min, 0.0)
+        if dx > 0 and dz > 0:
+            openings_area += dx * dz
+    return gross - openings_area
+
+
+def _fractions(areas: Dict[str, float], net_area: float) -> Dict[str, float]:
+    fractions = {name: area / net_area for name, area in areas.items() if area > 0}
+    remainder = 1.0 - sum(fractions.values())
+    if remainder > 1e-6:
+        # unfilled cavity (no insulation, or clearance around openings)
+        fractions["Air"] = fractions.get("Air", 0.0) + remainder
+    return fractions
+
+
+def get_layer_stack(
+    buildup,
+    lattice_materials: Dict[str, str] = None,
+) -> List[StackLayer]:
+    """
+    Flatten a WallBuildUp into homogeneous layers ordered by y (interior first).
+    Each layer carries the area fraction of every material found in its elements.
+    """
+    lattice_materials = LATTICE_MATERIALS if lattice_materials is None else lattice_materials
+    net_area = net_panel_area(buildup)
+    if net_area <= 0:
+        raise ValueError(f"Panel '{buildup.panel_id}' has no net area.")
+
+    stack: List[StackLayer] = []
+
+    if buildup.lattice is not None:
+        areas_per_layer: Dict[int, Dict[str, float]] = {
+            idx: {} for idx in range(1, len(buildup.lattice.layer_ranges) + 1)
+        }
+        for elem in buildup.lattice.elements:
+            material = lattice_materials.get(elem.element_type, elem.element_type)
+            areas = areas_per_layer.setdefault(elem.layer, {})
+            areas[material] = areas.get(material, 0.0) + elem.width * elem.length
+        for idx, (y_min, y_max) in enumerate(buildup.lattice.layer_ranges, start=1):
+            stack.append(
+                StackLayer(
+                    layer_index=idx,
+                    name=f"Lattice L{idx}",
+                    y_min=y_min,
+                    y_max=y_max,
+                    fractions=_fractions(areas_per_layer[idx], net_area),
+                )
+            )
+
+    for layer in buildup.layers:
+        areas: Dict[str, float] = {}
+        for elem in layer.elements:
+            material = (layer.materials or {}).get(elem.element_type, elem.element_type)
+            areas[material] = areas.get(material, 0.0) + elem.width * elem.length
+        stack.append(
+            StackLayer(
+                layer_index=layer.layer_index,
+                name=layer.name,
+                y_min=layer.y_min,
+                y_max=layer.y_max,
+                fractions=_fractions(areas, net_area),
+            )
+        )
+
+    stack.sort(key=lambda layer: layer.y_min)
+    return stack
+
+
+STACK_KEYS = ("thickness", "conductivity", "density", "heat_capacity", "vapour_resistance")
+
+
+def stack_arrays(
+    stacks: Sequence[Sequence[StackLayer]],
+    materials: Dict[str, Material] = None,
+    n_layers: Optional[int] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Pack a batch of layer stacks into (batch, n_layers) arrays.
+    Shorter stacks are padded with zero-thickness layers on the exterior side,
+    which are neutral for every solver (identity transfer matrix, zero resistance).
+    Thicknesses stay in mm like the rest of the core.
+    """
+    stacks = list(stacks)
+    depth = max((len(s) for s in stacks), default=0)
+    if n_layers is None:
+        n_layers = depth
+    elif n_layers < depth:
+        raise ValueError(f"n_layers={n_layers} is smaller than the deepest stack ({depth}).")
+
+    out = {key: np.zeros((len(stacks), n_layers)) for key in STACK_KEYS}
+    # padding values that keep the equations well defined
+    out["conductivity"][:] = 1.0
+    out["density"][:] = 1.0
+    out["heat_capacity"][:] = 1.0
+    for b, stack in enumerate(stacks):
+        for n, layer in enumerate(stack):
+            props = layer.equivalent(materials)
+            for key in STACK_KEYS:
+                out[key][b, n] = props[key]
+    return out
+
+
+__all__ = [
+    "StackLayer",
+    "STACK_KEYS",
+    "get_layer_stack",
+    "net_panel_area",
+    "stack_arrays",
+]
@@ -0,0 +1,140 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from .materials import LATTICE_MATERIALS
+from .stack import net_panel_area
+
+LATTICE_SOURCE = 0
+LAYER_SOURCE = 1
+
+
+@dataclass
+class ElementTable:
+    """Every element of a batch of buildups as flat columns (one row per element)."""
+    panel: np.ndarray      # index in panel_ids
+    material: np.ndarray   # index in materials
+    source: np.ndarray     # LATTICE_SOURCE / LAYER_SOURCE
+    width: np.ndarray      # x [mm]
+    thickness: np.ndarray  # y [mm]
+    length: np.ndarray     # z [mm]
+    panel_ids: List[str]
+    materials: List[str]
+
+    def __len__(self) -> int:
+        return len(self.panel)
+
+    @property
+    def area(self) -> np.ndarray:
+        """Face area in the wall plane [m2]."""
+        return self.width * self.length / 1e6
+
+    @property
+    def volume(self) -> np.ndarray:
+        """[m3]"""
+        return self.width * self.length * self.thickness / 1e9
+
+
+def element_table(
+    buildups: Sequence,
+    lattice_materials: Dict[str, str] = None,
+) -> ElementTable:
+    """
+    Collect the elements of WallBuildUp objects. Lattice elements take their material from
+    lattice_materials, layer elements from Layer.materials (element_type as fallback).
+    """
+    lattice_materials = LATTICE_MATERIALS if lattice_materials is None else lattice_materials
+    codes: Dict[str, int] = {}
+    panel, material, source, dims = [], [], [], []
+
+    for p, buildup in enumerate(buildups):
+        groups = []
+        if buildup.lattice is not None:
+            groups.append((LATTICE_SOURCE, buildup.lattice.elements, lattice_materials))
+        for layer in buildup.layers:
+            groups.append((LAYER_SOURCE, layer.elements, layer.materials or {}))
+
+        for src, elements, mapping in groups:
+            for elem in elements:
+                name = mapping.get(elem.element_type, elem.element_type)
+                material.append(codes.setdefault(name, len(codes)))
+                dims.append((elem.width, elem.thickness, elem.length))
+            panel.extend([p] * len(elements))
+            source.extend([src] * len(elements))
+
+    dims = np.array(dims, dtype=float).reshape(-1, 3)
+    return ElementTable(
+        panel=np.array(panel, dtype=np.int64),
+        material=np.array(material, dtype=np.int64),
+        source=np.array(source, dtype=np.int8),
+        width=dims[:, 0],
+        thickness=dims[:, 1],
+        length=dims[:, 2],
+        panel_ids=[b.panel_id for b in buildups],
+        materials=list(codes),
+    )
+
+
+@dataclass
+class Takeoff:
+    panel_ids: List[str]
+    materials: List[str]
+    volume: np.ndarray         # (panels, materials) net volume [m3]
+    area: np.ndarray           # (panels, materials) face area [m2]
+    lattice_volume: np.ndarray # (panels, materials) part of volume inside the lattice [m3]
+    lattice_area: np.ndarray   # (panels, materials) part of area inside the lattice [m2]
+    net_area: np.ndarray       # (panels,) panel area minus openings [m2]
+    panel_types: List[str]     # lattice panel type, "" without lattice
+
+    def as_records(self) -> List[Dict]:
+        """One row per panel and material (for pandas)."""
+        rows = []
+        for p, pid in enumerate(self.panel_ids):
+            for m, name in enumerate(self.materials):
+                if self.volume[p, m] > 0:
+                    rows.append({
+                        "panel_id": pid,
+                        "material": name,
+                        "volume": self.volume[p, m],
+                        "area": self.area[p, m],
+                        "lattice_volume": self.lattice_volume[p, m],
+                    })
+        return rows
+
+
+def quantity_takeoff(
+    buildups: Sequence,
+    lattice_materials: Dict[str, str] = None,
+) -> Takeoff:
+    """Net volumes and areas per panel and material, summed with np.bincount."""
+    buildups = list(buildups)
+    table = element_table(buildups, lattice_materials)
+    n_panels, n_materials = len(buildups), len(table.materials)
+    cell = table.panel * n_materials + table.material
+    size = n_panels * n_materials
+
+    def grouped(weights):
+        return np.bincount(cell, weights=weights, minlength=size).reshape(n_panels, n_materials)
+
+    volume, area = table.volume, table.area
+    in_lattice = table.source == LATTICE_SOURCE
+    return Takeoff(
+        panel_ids=table.panel_ids,
+        materials=table.materials,
+        volume=grouped(volume),
+        area=grouped(area),
+        lattice_volume=grouped(np.where(in_lattice, volume, 0.0)),
+        lattice_area=grouped(np.where(in_lattice, area, 0.0)),
+        net_area=np.array([net_panel_area(b) for b in buildups], dtype=float) / 1e6,
+        panel_types=[b.lattice.panel_type if b.lattice is not None else "" for b in buildups],
+    )
+
+
+__all__ = [
+    "ElementTable",
+    "Takeoff",
+    "element_table",
+    "quantity_takeoff",
+]
@@ -1,5 +1,7 @@
 import plotly.graph_objs as go
-from src.wall import *
+from .wall import *
+from .wall import SECTION_DEFAULT_CUT
+from .profiling import profiled
 import pandas as pd
 
 
@@ -29,6 +31,7 @@ def create_volume_trace(_id,element_type,x_min, x_max, y_min, y_max, z_min, z_ma
 
         
 
+@profiled("fig_3D_lattice")
 def fig_3D_lattice(lattice):
 
     traces = []
@@ -190,6 +193,7 @@ def fig_3D_buildup_old(buildup):
 import pandas as pd
 import plotly.graph_objects as go
 
+@profiled("fig_3D_buildup")
 def fig_3D_buildup(buildup):
     """
     Génère une figure Plotly 3D interactive.
@@ -307,6 +311,7 @@ import plotly.graph_objects as go
 
 import plotly.graph_objects as go
 
+@profiled("fig_section_view")
 def fig_section_view(buildup, view_type='vertical', cut_pos=None):
     """
     Génère une vue technique 2D avec proportions réelles (1:1) et cadrage automatique.
@@ -323,44 +328,30 @@ def fig_section_view(buildup, view_type='vertical', cut_pos=None):
     fig = go.Figure()
     
     if cut_pos is None:
-        if view_type == 'vertical': cut_pos = 100 
-        else: cut_pos = 1500 
+        cut_pos = SECTION_DEFAULT_CUT[view_type]
 
     # --- 1. AJOUT DES FORMES (SHAPES) ---
-    def add_layer_shapes(elements, context="layer", obj=None):
-        for el in elements:
-            is_visible = False
-            if view_type == 'vertical': 
-                if el['x_min'] <= cut_pos <= el['x_max']:
-                    is_visible = True
-                    x0, y0 = el['y_min'], el['z_min']
-                    x1, y1 = el['y_max'], el['z_max']
-            elif view_type == 'horizontal': 
-                if el['z_min'] <= cut_pos <= el['z_max']:
-                    is_visible = True
-                    x0, y0 = el['y_min'], el['x_min']
-                    x1, y1 = el['y_max'], el['x_max']
-            
-            if not is_visible: continue
-
-            color = '#CCCCCC'
-            if context == "lattice":
-                if el['element_type'] == 'slat': color = '#E6D6C2'
-                elif el['element_type'] == 'insulation': color = '#C29453'
-            elif context == "layer" and obj:
-                mat = obj.materials.get(el['element_type'], 'default')
-                color = material_color_dict.get(mat, '#CCCCCC')
-
-            fig.add_shape(
-                type="rect", x0=x0, y0=y0, x1=x1, y1=y1,
-                line=dict(color="black", width=1),
-                fillcolor=color, opacity=1, layer="below" 
-            )
+    for el, layer in section_elements(buildup, view_type, cut_pos):
+        if view_type == 'vertical': 
+            x0, y0 = el['y_min'], el['z_min']
+            x1, y1 = el['y_max'], el['z_max']
+        else: 
+            x0, y0 = el['y_min'], el['x_min']
+            x1, y1 = el['y_max'], el['x_max']
 
-    if buildup.lattice:
-        add_layer_shapes(buildup.lattice.as_dict()['elements'], "lattice")
-    for layer in buildup.layers:
-        add_layer_shapes(layer.as_dict().get('elements', []), "layer", layer)
+        color = '#CCCCCC'
+        if layer is None:
+            if el['element_type'] == 'slat': color = '#E6D6C2'
+            elif el['element_type'] == 'insulation': color = '#C29453'
+        else:
+            mat = layer.materials.get(el['element_type'], 'default')
+            color = material_color_dict.get(mat, '#CCCCCC')
+
+        fig.add_shape(
+            type="rect", x0=x0, y0=y0, x1=x1, y1=y1,
+            line=dict(color="black", width=1),
+            fillcolor=color, opacity=1, layer="below" 
+        )
 
     # --- 2. CALCUL DU ZOOM (BOUNDING BOX) ---
     x_range = [0, 1000]
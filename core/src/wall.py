@@ -1,11 +1,16 @@
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Dict, Iterable, List, Sequence, Tuple
+import functools
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
 from shapely.geometry import GeometryCollection, Polygon, box
 from shapely.ops import unary_union
 from .openings import Opening
+from .profiling import profiled
 
 OPENING_CLEARANCE = 1.0
+EXACT_SCALE = 1000        # exact mode: integer plan coordinates per mm (micrometres)
+POSITION_TOLERANCE = 1e-6 # [mm] member positions closer than this are one (float round-off)
+BOARD_LENGTH = 2500.0     # default stock board length of continuous layers [mm]
 
 @dataclass
 class LatticeElement:
@@ -19,6 +24,8 @@ class LatticeElement:
     z_min: float
     z_max: float
     orientation: str
+    # (x, z) face of a piece cut around an opening when it is not its bounding box
+    outline: Optional[Polygon] = field(default=None, repr=False, compare=False)
 
     @property
     def length(self) -> float:
@@ -56,6 +63,9 @@ class LatticeLayout:
     post_positions: List[float]
     traverse_positions: List[float]
     layer_ranges: List[Tuple[float, float]]
+    panel_type: str = ""
+    slat_width: float = 0.0          # 0: unknown (layout not built by generate_lattice_layout)
+    include_insulation: bool = True
 
     def elements_of_type(self, element_type: str) -> List[LatticeElement]:
         return [elem for elem in self.elements if elem.element_type == element_type]
@@ -66,6 +76,9 @@ class LatticeLayout:
             "post_positions": self.post_positions,
             "traverse_positions": self.traverse_positions,
             "layer_ranges": self.layer_ranges,
+            "panel_type": self.panel_type,
+            "slat_width": self.slat_width,
+            "include_insulation": self.include_insulation,
         }
 
 
@@ -84,6 +97,8 @@ class LayerElement:
     z_min: float
     z_max: float
     orientation: str # "vertical" / "horizontal"
+    # (x, z) face of a piece cut around an opening when it is not its bounding box
+    outline: Optional[Polygon] = field(default=None, repr=False, compare=False)
 
     @property
     def length(self) -> float:
@@ -128,6 +143,7 @@ class Layer:
     include_insulation: bool
     materials: Dict[str, str]  # Ex: {"surface": "OSB3"} ou {"batten": "Douglas", "fill": "Laine minérale"}
     elements: List[LayerElement]
+    board_length: float = 0.0      # continuous layers: board = layer_pitch x board_length
 
     @property
     def thickness(self) -> float:
@@ -146,6 +162,7 @@ class Layer:
             "batten_width": self.batten_width,
             "include_insulation": self.include_insulation,
             "materials": self.materials,
+            "board_length": self.board_length,
             "elements": [e.as_dict() for e in self.elements]
         }
 
@@ -169,6 +186,14 @@ class WallBuildUp:
     def layers_of_type(self, name: str) -> List[Layer]:
         return [layer for layer in self.layers if layer.name == name]
 
+    def materialize(self) -> "WallBuildUp":
+        """Generate every element of a lazy buildup now (no-op for an eager one)."""
+        if self.lattice is not None:
+            self.lattice.elements
+        for layer in self.layers:
+            layer.elements
+        return self
+
     def as_dict(self) -> Dict:
         return {
             "panel_id": self.panel_id,
@@ -181,6 +206,60 @@ class WallBuildUp:
 
 
 
+
+# Lazy buildup: elements generated on first access
+
+class _LazyElements:
+    """`elements` descriptor of the lazy classes: built by the instance factory on first read."""
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        elements = obj.__dict__.get("_elements")
+        if elements is None:
+            elements = obj._factory()
+            obj.__dict__["_elements"] = elements
+            obj._factory = None
+        return elements
+
+    def __set__(self, obj, value):
+        obj.__dict__["_elements"] = value
+
+
+def _lattice_elements(kwargs: Dict) -> List[LatticeElement]:
+    return generate_lattice_layout(**kwargs).elements
+
+
+def _layer_elements(kwargs: Dict) -> List[LayerElement]:
+    return generate_layer(**kwargs).elements
+
+
+class LazyLatticeLayout(LatticeLayout):
+    """LatticeLayout whose elements are generated on first access (positions and ranges are eager)."""
+    elements = _LazyElements()
+
+    def __init__(self, factory, **fields):
+        self._factory = factory
+        super().__init__(elements=None, **fields)
+
+    @property
+    def materialized(self) -> bool:
+        return self.__dict__.get("_elements") is not None
+
+
+class LazyLayer(Layer):
+    """Layer whose elements are generated on first access."""
+    elements = _LazyElements()
+
+    def __init__(self, factory, **fields):
+        self._factory = factory
+        super().__init__(elements=None, **fields)
+
+    @property
+    def materialized(self) -> bool:
+        return self.__dict__.get("_elements") is not None
+
+
     
 
 def get_layer_thickness(panel_type: str) -> List[float]:
@@ -205,41 +284,53 @@ def get_range_thickness(layer_thickness: Sequence[float]) -> List[Tuple[float, f
     return ranges
 
 
+def _merge_positions(positions: Iterable[float], tol: float) -> List[float]:
+    """Sorted positions, values within tol of the previous one dropped."""
+    merged: List[float] = []
+    for pos in sorted(positions):
+        if not merged or pos - merged[-1] > tol:
+            merged.append(pos)
+    return merged
+
+
 def _fill_positions(
     base_positions: Iterable[float],
     pitch: float,
     slat_width: float,
     limit: float,
+    tol: float = POSITION_TOLERANCE,
 ) -> List[float]:
+    # comparisons within tol: float round-off (a gap of 600.0000000001 on a 600 pitch)
+    # must not add a member the exact (integer) mode does not have
     if pitch <= 0:
         clipped = [max(0.0, min(pos, limit)) for pos in base_positions]
-        return sorted(set(clipped))
+        return _merge_positions(clipped, tol)
 
-    positions = sorted(set(base_positions))
+    positions = _merge_positions(base_positions, tol)
     changed = True
     while changed:
         changed = False
         new_positions: List[float] = []
         for left, right in zip(positions[:-1], positions[1:]):
             gap = right - left
-            if gap <= pitch:
+            if gap <= pitch + tol:
                 continue
-            steps = int(gap // pitch)
+            steps = int((gap + tol) // pitch)
             for step in range(1, steps + 1):
                 candidate = left + step * pitch
-                if step == steps and candidate + slat_width > right:
+                if step == steps and candidate + slat_width > right + tol:
                     candidate = max(right - slat_width, left)
-                if left < candidate < right:
+                if left + tol < candidate < right - tol:
                     candidate = max(0.0, min(candidate, limit))
-                    if candidate not in positions and candidate not in new_positions:
+                    if all(abs(candidate - pos) > tol for pos in positions + new_positions):
                         new_positions.append(candidate)
             if new_positions:
                 changed = True
         if changed:
-            positions = sorted(set(positions + new_positions))
+            positions = _merge_positions(positions + new_positions, tol)
 
     clipped = [max(0.0, min(pos, limit)) for pos in positions]
-    return sorted(set(clipped))
+    return _merge_positions(clipped, tol)
 
 
 def compute_post_positions(
@@ -247,7 +338,12 @@ def compute_post_positions(
     horizontal_pitch: float,
     slat_width: float,
     openings: Iterable[Opening],
+    exact: bool = False,
 ) -> List[float]:
+    if exact:
+        units = compute_post_positions(_to_units(panel_width), _to_units(horizontal_pitch),
+                                       _to_units(slat_width), _unit_openings(openings))
+        return [_from_units(pos) for pos in units]
     limit = max(panel_width - slat_width, 0.0) # pourquoi 0 ? (+ robuste? on ne vas pas faire des panneaux de moins de 120mm c'est inutile : vérifier plutot l'input)
     base = [0.0, limit]  
     for opening in openings:
@@ -261,7 +357,12 @@ def compute_traverse_positions(
     vertical_pitch: float,
     slat_width: float,
     openings: Iterable[Opening],
+    exact: bool = False,
 ) -> List[float]:
+    if exact:
+        units = compute_traverse_positions(_to_units(panel_height), _to_units(vertical_pitch),
+                                           _to_units(slat_width), _unit_openings(openings))
+        return [_from_units(pos) for pos in units]
     limit = max(panel_height - slat_width, 0.0)
     base = [0.0, limit]
     for opening in openings:
@@ -295,6 +396,221 @@ def _heal(g, tol=1e-6):
     return g.buffer(tol).buffer(-tol)
 
 
+def _board_grid(
+    panel_width: float,
+    panel_height: float,
+    board_width: float,
+    board_length: float,
+    orientation: str,
+) -> List[Tuple[int, int, float, float, float, float]]:
+    """
+    Board positions (course, index, x0, z0, x1, z1) covering the panel.
+    Boards run along `orientation` in courses of board_width; joints of every
+    other course are shifted by half a board.
+    """
+    along, across = (panel_height, panel_width) if orientation == "vertical" else (panel_width, panel_height)
+    boards = []
+    n_courses = int(-(-across // board_width))
+    for course in range(n_courses):
+        a0, a1 = course * board_width, min((course + 1) * board_width, across)
+        shift = 0.5 * board_length if course % 2 else 0.0
+        joints = [0.0]
+        pos = board_length - shift
+        while pos < along - 1e-6:
+            joints.append(pos)
+            pos += board_length
+        joints.append(along)
+        for idx, (b0, b1) in enumerate(zip(joints[:-1], joints[1:])):
+            if orientation == "vertical":
+                boards.append((course, idx, a0, b0, a1, b1))
+            else:
+                boards.append((course, idx, b0, a0, b1, a1))
+    return boards
+
+
+def _subtract_rectangles(
+    rect: Tuple[float, float, float, float],
+    holes: Sequence[Tuple[float, float, float, float]],
+    tol: float = 1e-6,
+) -> List[Tuple[float, float, float, float]]:
+    """
+    Rectangle minus axis-aligned holes, as rectangles (x0, z0, x1, z1):
+    vertical strips between hole edges, merged when their z intervals match.
+    """
+    x0, z0, x1, z1 = rect
+    holes = [h for h in holes if h[0] < x1 - tol and h[2] > x0 + tol and h[1] < z1 - tol and h[3] > z0 + tol]
+    if not holes:
+        return [rect]
+    xs = sorted({x0, x1} | {min(max(v, x0), x1) for h in holes for v in (h[0], h[2])})
+    pieces: List[Tuple[float, float, float, float]] = []
+    open_strips: Dict[Tuple[float, float], int] = {}    # z interval -> index of the piece ending at xa
+    for xa, xb in zip(xs[:-1], xs[1:]):
+        if xb - xa <= tol:
+            continue
+        cuts = sorted((h[1], h[3]) for h in holes if h[0] < xb - tol and h[2] > xa + tol)
+        intervals, z = [], z0
+        for c0, c1 in cuts:
+            if c0 > z + tol:
+                intervals.append((z, min(c0, z1)))
+            z = max(z, c1)
+        if z < z1 - tol:
+            intervals.append((z, z1))
+        next_open = {}
+        for interval in intervals:
+            k = open_strips.get(interval)
+            if k is not None and abs(pieces[k][2] - xa) <= tol:
+                pieces[k] = (pieces[k][0], interval[0], xb, interval[1])
+            else:
+                k = len(pieces)
+                pieces.append((xa, interval[0], xb, interval[1]))
+            next_open[interval] = k
+        open_strips = next_open
+    return pieces
+
+
+
+# Exact mode: plan coordinates as integer micrometres. Positions, cuts and gaps are
+# integer arithmetic (no epsilon, no GEOS, no healing); elements get mm floats back.
+# The opening clearance is a square offset of the opening rectangles (the float mode
+# buffers with rounded corners), so opening_voids must be axis-aligned rectangles.
+
+def _to_units(value: float) -> int:
+    return int(round(value * EXACT_SCALE))
+
+
+def _from_units(value) -> float:
+    return value / EXACT_SCALE
+
+
+class _UnitOpening(NamedTuple):
+    bounds: Tuple[int, int, int, int]
+
+
+def _unit_openings(openings: Iterable[Opening]) -> List[_UnitOpening]:
+    return [_UnitOpening(tuple(_to_units(v) for v in opening.bounds)) for opening in openings]
+
+
+def _exact_holes(opening_polys: Sequence[Polygon]) -> List[Tuple[int, int, int, int]]:
+    """Opening rectangles grown by the clearance, in units."""
+    clearance = _to_units(OPENING_CLEARANCE)
+    holes = []
+    for poly in opening_polys:
+        x0, z0, x1, z1 = poly.bounds
+        if poly.geom_type != "Polygon" or abs((x1 - x0) * (z1 - z0) - poly.area) > 1e-9 * max(poly.area, 1.0):
+            raise ValueError("Exact mode needs rectangular openings (opening_voids must be axis-aligned boxes).")
+        holes.append((_to_units(x0) - clearance, _to_units(z0) - clearance,
+                      _to_units(x1) + clearance, _to_units(z1) + clearance))
+    return holes
+
+
+def _free_boxes(rect: Tuple, holes: Sequence[Tuple]) -> List[Tuple[Tuple, List[Tuple]]]:
+    """
+    Connected pieces (edge neighbours) of rect minus holes, exact on integers:
+    (bounding box, grid cells of the piece).
+    """
+    x0, z0, x1, z1 = rect
+    holes = [h for h in holes if h[0] < x1 and h[2] > x0 and h[1] < z1 and h[3] > z0]
+    if not holes:
+        return [(rect, [rect])]
+    xs = sorted({x0, x1} | {min(max(v, x0), x1) for h in holes for v in (h[0], h[2])})
+    zs = sorted({z0, z1} | {min(max(v, z0), z1) for h in holes for v in (h[1], h[3])})
+    nx, nz = len(xs) - 1, len(zs) - 1
+    free = [[True] * nx for _ in range(nz)]
+    for hx0, hz0, hx1, hz1 in holes:
+        cols = [i for i in range(nx) if hx0 <= xs[i] and xs[i + 1] <= hx1]
+        for j in range(nz):
+            if hz0 <= zs[j] and zs[j + 1] <= hz1:
+                for i in cols:
+                    free[j][i] = False
+
+    boxes = []
+    for j0 in range(nz):
+        for i0 in range(nx):
+            if not free[j0][i0]:
+                continue
+            free[j0][i0] = False
+            stack = [(j0, i0)]
+            cells = []
+            i_lo = i_hi = i0
+            j_lo = j_hi = j0
+            while stack:
+                j, i = stack.pop()
+                cells.append((xs[i], zs[j], xs[i + 1], zs[j + 1]))
+                i_lo, i_hi, j_lo, j_hi = min(i_lo, i), max(i_hi, i), min(j_lo, j), max(j_hi, j)
+                for nj, ni in ((j - 1, i), (j + 1, i), (j, i - 1), (j, i + 1)):
+                    if 0 <= nj < nz and 0 <= ni < nx and free[nj][ni]:
+                        free[nj][ni] = False
+                        stack.append((nj, ni))
+            boxes.append(((xs[i_lo], zs[j_lo], xs[i_hi + 1], zs[j_hi + 1]), cells))
+    return boxes
+
+
+def _exact_outline(bounds: Tuple, cells: List[Tuple]) -> Optional[Polygon]:
+    """Face of an exact piece in mm, None when it fills its bounding box."""
+    x0, z0, x1, z1 = bounds
+    if sum((c[2] - c[0]) * (c[3] - c[1]) for c in cells) == (x1 - x0) * (z1 - z0):
+        return None
+    return unary_union([box(*(_from_units(v) for v in c)) for c in cells])
+
+
+def _outline(bounds: Tuple, piece: Polygon, tol: float = 1e-3) -> Optional[Polygon]:
+    """The piece when it is not its bounding box (more than tol mm2 missing), else None."""
+    x0, z0, x1, z1 = bounds
+    return piece if (x1 - x0) * (z1 - z0) - piece.area > tol else None
+
+
+def _cutters(opening_polys: Sequence[Polygon], exact: bool = False):
+    """
+    (cut, fill) of a generator. cut(rect) -> [(bounds, occupied shape, outline)]: pieces of
+    the rectangle minus the openings (clearance included); fill(envelope, occupied) ->
+    [(bounds, outline)]: pieces of the envelope minus the occupied shapes and the openings.
+    outline is the (x, z) face in mm of a piece that is not its bounding box, else None.
+    """
+    if exact:
+        holes = _exact_holes(opening_polys)
+
+        def cut(rect):
+            return [(piece, rect, _exact_outline(piece, cells)) for piece, cells in _free_boxes(rect, holes)]
+
+        def fill(envelope, occupied):
+            pieces = _free_boxes(envelope, list(occupied) + holes)
+            return [(piece, _exact_outline(piece, cells)) for piece, cells in pieces]
+
+        return cut, fill
+
+    # Build a buffered opening union so slats/insulation never encroach,
+    # even with floating-point fuzz along shared edges.
+    if opening_polys:
+        openings_raw_union = unary_union(opening_polys)
+        openings_union = openings_raw_union.buffer(OPENING_CLEARANCE)
+    else:
+        openings_union = None
+
+    def cut(rect):
+        geom = box(*rect)
+        if openings_union:
+            geom = geom.difference(openings_union)
+        geom = _heal(geom, tol=1e-6)
+        return [(piece.bounds, piece, _outline(piece.bounds, piece)) for piece in _collect_polygons(geom)]
+
+    def fill(envelope, occupied):
+        envelope = box(*envelope)
+        occupied = list(occupied)
+        if openings_union:
+            occupied.append(openings_union)
+        if occupied:
+            occupied_union = unary_union(occupied)
+            geom = envelope.difference(occupied_union)
+        else:
+            geom = envelope
+        geom = _heal(geom, tol=1e-6)
+        return [(piece.bounds, _outline(piece.bounds, piece)) for piece in _collect_polygons(geom)]
+
+    return cut, fill
+
+
+
+@profiled("generate_lattice_layout", label_args=("panel_type",))
 def generate_lattice_layout(
     panel_id: str,
     panel_width: float,
@@ -306,6 +622,7 @@ def generate_lattice_layout(
     openings: Sequence[Opening],
     include_insulation: bool = True,
     opening_voids: Sequence[Polygon] = (),   # precise boolean geoms (optional)
+    exact: bool = False,                     # integer micrometre geometry (see _cutters)
 ) -> LatticeLayout:
     openings_list = list(openings)
 
@@ -315,24 +632,29 @@ def generate_lattice_layout(
     else:
         opening_polys = [opening.to_polygon() for opening in openings_list]
 
-    # Build a buffered opening union so slats/insulation never encroach,
-    # even with floating-point fuzz along shared edges.
-    if opening_polys:
-        openings_raw_union = unary_union(opening_polys)
-        openings_union = openings_raw_union.buffer(OPENING_CLEARANCE)
-    else:
-        openings_union = None
+    # Pieces of a rectangle minus the buffered openings (exact: integer micrometres)
+    cut, fill = _cutters(opening_polys, exact)
 
     layer_thickness = get_layer_thickness(panel_type)
     layer_ranges = get_range_thickness(layer_thickness)
 
     post_positions = compute_post_positions(
-        panel_width, horizontal_pitch, slat_width, openings_list
+        panel_width, horizontal_pitch, slat_width, openings_list, exact
     )
     traverse_positions = compute_traverse_positions(
-        panel_height, vertical_pitch, slat_width, openings_list
+        panel_height, vertical_pitch, slat_width, openings_list, exact
     )
 
+    # plan coordinates of the cuts (exact: integer micrometres, mm() converts back)
+    if exact:
+        width, height, slat = _to_units(panel_width), _to_units(panel_height), _to_units(slat_width)
+        posts = [_to_units(pos) for pos in post_positions]
+        traverses = [_to_units(pos) for pos in traverse_positions]
+        mm = _from_units
+    else:
+        width, height, slat = panel_width, panel_height, slat_width
+        posts, traverses, mm = post_positions, traverse_positions, float
+
     elements: List[LatticeElement] = []
 
     # --------------------------------
@@ -344,18 +666,10 @@ def generate_lattice_layout(
         if layer_index % 2 == 1:
             # Vertical slats (posts)
             segment_counter = 0
-            for idx, x_pos in enumerate(post_positions):
-                x_min = max(0.0, min(x_pos, panel_width - slat_width))
-                x_max = min(panel_width, x_min + slat_width)
-                base_geom = box(x_min, 0.0, x_max, panel_height)
-
-                geom = base_geom
-                if openings_union:
-                    geom = geom.difference(openings_union)
-                geom = _heal(geom, tol=1e-6)
-
-                for piece in _collect_polygons(geom):
-                    x0, z0, x1, z1 = piece.bounds
+            for idx, x_pos in enumerate(posts):
+                x_min = max(0.0, min(x_pos, width - slat))
+                x_max = min(width, x_min + slat)
+                for (x0, z0, x1, z1), piece, outline in cut((x_min, 0.0, x_max, height)):
                     if (x1 - x0) <= 1e-6 or (z1 - z0) <= 1e-6:
                         continue
                     segment_counter += 1
@@ -366,12 +680,13 @@ def generate_lattice_layout(
                             element_type="slat",
                             layer=layer_index,
                             orientation="vertical",
-                            x_min=x0,
-                            x_max=x1,
+                            x_min=mm(x0),
+                            x_max=mm(x1),
                             y_min=y_min,
                             y_max=y_max,
-                            z_min=z0,
-                            z_max=z1,
+                            z_min=mm(z0),
+                            z_max=mm(z1),
+                            outline=outline,
                         )
                     )
                     layer_polys.append(piece)
@@ -379,18 +694,10 @@ def generate_lattice_layout(
         else:
             # Horizontal slats (traverses)
             segment_counter = 0
-            for idx, z_pos in enumerate(traverse_positions):
-                z_min = max(0.0, min(z_pos, panel_height - slat_width))
-                z_max = min(panel_height, z_min + slat_width)
-                base_geom = box(0.0, z_min, panel_width, z_max)
-
-                geom = base_geom
-                if openings_union:
-                    geom = geom.difference(openings_union)
-                geom = _heal(geom, tol=1e-6)
-
-                for piece in _collect_polygons(geom):
-                    x0, z0, x1, z1 = piece.bounds
+            for idx, z_pos in enumerate(traverses):
+                z_min = max(0.0, min(z_pos, height - slat))
+                z_max = min(height, z_min + slat)
+                for (x0, z0, x1, z1), piece, outline in cut((0.0, z_min, width, z_max)):
                     if (x1 - x0) <= 1e-6 or (z1 - z0) <= 1e-6:
                         continue
                     segment_counter += 1
@@ -401,12 +708,13 @@ def generate_lattice_layout(
                             element_type="slat",
                             layer=layer_index,
                             orientation="horizontal",
-                            x_min=x0,
-                            x_max=x1,
+                            x_min=mm(x0),
+                            x_max=mm(x1),
                             y_min=y_min,
                             y_max=y_max,
-                            z_min=z0,
-                            z_max=z1,
+                            z_min=mm(z0),
+                            z_max=mm(z1),
+                            outline=outline,
                         )
                     )
                     layer_polys.append(piece)
@@ -415,24 +723,13 @@ def generate_lattice_layout(
         # 2) INSULATION PER LAYER
         # --------------------------------
         if include_insulation:
-            envelope = box(0.0, 0.0, panel_width, panel_height)
+            envelope = (0.0, 0.0, width, height)
 
             if layer_index % 2 == 1:
                 # VERTICAL LAYER:
                 # insulation between vertical slats of THIS layer,
                 # also avoiding openings.
-                occupied = layer_polys.copy()
-                if openings_union:
-                    occupied.append(openings_union)
-                if occupied:
-                    occupied_union = unary_union(occupied)
-                    insulation_geom = envelope.difference(occupied_union)
-                else:
-                    insulation_geom = envelope
-                insulation_geom = _heal(insulation_geom, tol=1e-6)
-
-                for idx, piece in enumerate(_collect_polygons(insulation_geom), start=1):
-                    x0, z0, x1, z1 = piece.bounds
+                for idx, ((x0, z0, x1, z1), outline) in enumerate(fill(envelope, layer_polys), start=1):
                     if (x1 - x0) <= 1e-6 or (z1 - z0) <= 1e-6:
                         continue
                     element_id = f"{panel_id}-L{layer_index}-I{idx}"
@@ -442,12 +739,13 @@ def generate_lattice_layout(
                             element_type="insulation",
                             layer=layer_index,
                             orientation="surface",
-                            x_min=x0,
-                            x_max=x1,
+                            x_min=mm(x0),
+                            x_max=mm(x1),
                             y_min=y_min,
                             y_max=y_max,
-                            z_min=z0,
-                            z_max=z1,
+                            z_min=mm(z0),
+                            z_max=mm(z1),
+                            outline=outline,
                         )
                     )
             else:
@@ -456,9 +754,9 @@ def generate_lattice_layout(
                 # also avoiding openings (buffered).
                 # 1D intervals of slats along Z
                 slat_intervals: List[Tuple[float, float]] = []
-                for z_pos in traverse_positions:
-                    z_min = max(0.0, min(z_pos, panel_height - slat_width))
-                    z_max = min(panel_height, z_min + slat_width)
+                for z_pos in traverses:
+                    z_min = max(0.0, min(z_pos, height - slat))
+                    z_max = min(height, z_min + slat)
                     slat_intervals.append((z_min, z_max))
 
                 # Merge overlapping intervals
@@ -483,34 +781,30 @@ def generate_lattice_layout(
                     if a > prev + eps:
                         gaps.append((prev, a))
                     prev = max(prev, b)
-                if prev < panel_height - eps:
-                    gaps.append((prev, panel_height))
+                if prev < height - eps:
+                    gaps.append((prev, height))
 
                 # For each gap: full-width band, then subtract buffered openings
                 for gap_idx, (gz0, gz1) in enumerate(gaps, start=1):
-                    base_gap = box(0.0, gz0, panel_width, gz1)
-                    geom_gap = base_gap
-                    if openings_union:
-                        geom_gap = geom_gap.difference(openings_union)
-                    geom_gap = _heal(geom_gap, tol=1e-6)
-
-                    for piece in _collect_polygons(geom_gap):
-                        x0, z0, x1, z1 = piece.bounds
+                    piece_counter = 0
+                    for (x0, z0, x1, z1), _, outline in cut((0.0, gz0, width, gz1)):
                         if (x1 - x0) <= 1e-6 or (z1 - z0) <= 1e-6:
                             continue
-                        element_id = f"{panel_id}-L{layer_index}-I{gap_idx}"
+                        piece_counter += 1
+                        element_id = f"{panel_id}-L{layer_index}-I{gap_idx}-{piece_counter}"
                         elements.append(
                             LatticeElement(
                                 element_id=element_id,
                                 element_type="insulation",
                                 layer=layer_index,
                                 orientation="surface",
-                                x_min=x0,
-                                x_max=x1,
+                                x_min=mm(x0),
+                                x_max=mm(x1),
                                 y_min=y_min,
                                 y_max=y_max,
-                                z_min=z0,
-                                z_max=z1,
+                                z_min=mm(z0),
+                                z_max=mm(z1),
+                                outline=outline,
                             )
                         )
 
@@ -519,10 +813,14 @@ def generate_lattice_layout(
         post_positions=post_positions,
         traverse_positions=traverse_positions,
         layer_ranges=layer_ranges,
+        panel_type=panel_type,
+        slat_width=slat_width,
+        include_insulation=include_insulation,
     )
 
 
 
+@profiled("generate_layer", label_args=("layer_index", "name"))
 def generate_layer(
         panel_id: str,
         panel_width: float,
@@ -539,6 +837,8 @@ def generate_layer(
         include_insulation: bool = True,
         materials: Dict[str, str] = None, # {"batten": "Douglas", "insulation": "Mineral wool"}
         opening_voids: Sequence[Polygon] = (),   # precise boolean geoms (optional)
+        board_length: float = BOARD_LENGTH,      # continuous layers only
+        exact: bool = False,                     # integer micrometre geometry (see _cutters)
     ) -> Layer:
     
     openings_list = list(openings)
@@ -549,29 +849,52 @@ def generate_layer(
     else:
         opening_polys = [opening.to_polygon() for opening in openings_list]
 
-    # Build a buffered opening union so slats/insulation never encroach,
-    # even with floating-point fuzz along shared edges.
-    if opening_polys:
-        openings_raw_union = unary_union(opening_polys)
-        openings_union = openings_raw_union.buffer(OPENING_CLEARANCE)
+    # Pieces of a rectangle minus the buffered openings (exact: integer micrometres)
+    cut, fill = _cutters(opening_polys, exact)
+
+    # plan coordinates of the cuts (exact: integer micrometres, mm() converts back)
+    if exact:
+        width, height, batten = _to_units(panel_width), _to_units(panel_height), _to_units(batten_width)
+        mm = _from_units
     else:
-        openings_union = None
+        width, height, batten, mm = panel_width, panel_height, batten_width, float
 
     elements: List[LayerElement] = []
     layer_polys: List[Polygon] = []
-    # continuous layer
-    #if layer_type == 'continuous':
-        
-    #    if layer_orientation == 'vertical':
-    #        cut_positions = compute_post_positions(
-    #            panel_width, layer_pitch, 0, openings_list
-    #        )
-        
-    #    if layer_orientation == 'horizontal':
-    #        cut_positions = compute_traverse_positions(
-    #            panel_height, layer_pitch, 0, openings_list
-    #        )
-    
+    # continuous layer: boards of layer_pitch x board_length, staggered joints,
+    # cut around the openings (clearance included) as rectangles
+    if layer_type == 'continuous':
+        if layer_pitch <= 0 or board_length <= 0:
+            raise ValueError(f"Continuous layer '{name}' needs a positive board size (layer_pitch, board_length).")
+        board_type = next(iter(materials or {}), "board")
+        if exact:
+            holes, tol = _exact_holes(opening_polys), 0
+            boards = _board_grid(width, height, _to_units(layer_pitch), _to_units(board_length), layer_orientation)
+        else:
+            holes = [
+                (x0 - OPENING_CLEARANCE, z0 - OPENING_CLEARANCE, x1 + OPENING_CLEARANCE, z1 + OPENING_CLEARANCE)
+                for x0, z0, x1, z1 in (poly.bounds for poly in opening_polys)
+            ]
+            tol = 1e-6
+            boards = _board_grid(panel_width, panel_height, layer_pitch, board_length, layer_orientation)
+        for course, idx, bx0, bz0, bx1, bz1 in boards:
+            for k, (x0, z0, x1, z1) in enumerate(_subtract_rectangles((bx0, bz0, bx1, bz1), holes, tol), start=1):
+                if (x1 - x0) <= 1e-6 or (z1 - z0) <= 1e-6:
+                    continue
+                elements.append(
+                    LayerElement(
+                        element_id=f"{panel_id}-L{layer_index}-B{course}.{idx}-{k}",
+                        element_type=board_type,
+                        layer=layer_index,
+                        orientation=layer_orientation,
+                        x_min=mm(x0),
+                        x_max=mm(x1),
+                        y_min=y_min,
+                        y_max=y_max,
+                        z_min=mm(z0),
+                        z_max=mm(z1),
+                    )
+                )
 
     # battened layer
     if layer_type == 'battened':
@@ -581,23 +904,16 @@ def generate_layer(
 
             # batten 
             post_positions = compute_post_positions(
-                panel_width, layer_pitch, batten_width, openings_list
+                panel_width, layer_pitch, batten_width, openings_list, exact
             )
+            posts = [_to_units(pos) for pos in post_positions] if exact else post_positions
 
             # Vertical slats (posts)
             segment_counter = 0
-            for idx, x_pos in enumerate(post_positions):
-                x_min = max(0.0, min(x_pos, panel_width - batten_width))
-                x_max = min(panel_width, x_min + batten_width)
-                base_geom = box(x_min, 0.0, x_max, panel_height)
-
-                geom = base_geom
-                if openings_union:
-                    geom = geom.difference(openings_union)
-                geom = _heal(geom, tol=1e-6)
-
-                for piece in _collect_polygons(geom):
-                    x0, z0, x1, z1 = piece.bounds
+            for idx, x_pos in enumerate(posts):
+                x_min = max(0.0, min(x_pos, width - batten))
+                x_max = min(width, x_min + batten)
+                for (x0, z0, x1, z1), piece, outline in cut((x_min, 0.0, x_max, height)):
                     if (x1 - x0) <= 1e-6 or (z1 - z0) <= 1e-6:
                         continue
                     segment_counter += 1
@@ -608,35 +924,23 @@ def generate_layer(
                             element_type="batten",
                             layer=layer_index,
                             orientation="vertical",
-                            x_min=x0,
-                            x_max=x1,
+                            x_min=mm(x0),
+                            x_max=mm(x1),
                             y_min=y_min,
                             y_max=y_max,
-                            z_min=z0,
-                            z_max=z1,
+                            z_min=mm(z0),
+                            z_max=mm(z1),
+                            outline=outline,
                         )
                     )
                     layer_polys.append(piece)
 
             if include_insulation:
-                envelope = box(0.0, 0.0, panel_width, panel_height)
-
-
                 # VERTICAL LAYER:
                 # insulation between vertical slats of THIS layer,
                 # also avoiding openings.
-                occupied = layer_polys.copy()
-                if openings_union:
-                    occupied.append(openings_union)
-                if occupied:
-                    occupied_union = unary_union(occupied)
-                    insulation_geom = envelope.difference(occupied_union)
-                else:
-                    insulation_geom = envelope
-                insulation_geom = _heal(insulation_geom, tol=1e-6)
-
-                for idx, piece in enumerate(_collect_polygons(insulation_geom), start=1):
-                    x0, z0, x1, z1 = piece.bounds
+                envelope = (0.0, 0.0, width, height)
+                for idx, ((x0, z0, x1, z1), outline) in enumerate(fill(envelope, layer_polys), start=1):
                     if (x1 - x0) <= 1e-6 or (z1 - z0) <= 1e-6:
                         continue
                     element_id = f"{panel_id}-L{layer_index}-I{idx}"
@@ -646,34 +950,28 @@ def generate_layer(
                             element_type=fill_material,
                             layer=layer_index,
                             orientation="surface",
-                            x_min=x0,
-                            x_max=x1,
+                            x_min=mm(x0),
+                            x_max=mm(x1),
                             y_min=y_min,
                             y_max=y_max,
-                            z_min=z0,
-                            z_max=z1,
+                            z_min=mm(z0),
+                            z_max=mm(z1),
+                            outline=outline,
                         )
                     )
 
         if layer_orientation == 'horizontal':
 
             traverse_positions = compute_traverse_positions(
-                panel_height, layer_pitch, batten_width, openings_list
+                panel_height, layer_pitch, batten_width, openings_list, exact
             )
+            traverses = [_to_units(pos) for pos in traverse_positions] if exact else traverse_positions
             # Horizontal slats (traverses)
             segment_counter = 0
-            for idx, z_pos in enumerate(traverse_positions):
-                z_min = max(0.0, min(z_pos, panel_height - batten_width))
-                z_max = min(panel_height, z_min + batten_width)
-                base_geom = box(0.0, z_min, panel_width, z_max)
-
-                geom = base_geom
-                if openings_union:
-                    geom = geom.difference(openings_union)
-                geom = _heal(geom, tol=1e-6)
-
-                for piece in _collect_polygons(geom):
-                    x0, z0, x1, z1 = piece.bounds
+            for idx, z_pos in enumerate(traverses):
+                z_min = max(0.0, min(z_pos, height - batten))
+                z_max = min(height, z_min + batten)
+                for (x0, z0, x1, z1), piece, outline in cut((0.0, z_min, width, z_max)):
                     if (x1 - x0) <= 1e-6 or (z1 - z0) <= 1e-6:
                         continue
                     segment_counter += 1
@@ -684,27 +982,27 @@ def generate_layer(
                             element_type="batten",
                             layer=layer_index,
                             orientation="horizontal",
-                            x_min=x0,
-                            x_max=x1,
+                            x_min=mm(x0),
+                            x_max=mm(x1),
                             y_min=y_min,
                             y_max=y_max,
-                            z_min=z0,
-                            z_max=z1,
+                            z_min=mm(z0),
+                            z_max=mm(z1),
+                            outline=outline,
                         )
                     )
                     layer_polys.append(piece)
 
             if include_insulation:
-                envelope = box(0.0, 0.0, panel_width, panel_height)
 
                 # HORIZONTAL LAYER:
                 # insulation between horizontal slats of THIS layer (bands along Z),
                 # also avoiding openings (buffered).
                 # 1D intervals of slats along Z
                 slat_intervals: List[Tuple[float, float]] = []
-                for z_pos in traverse_positions:
-                    z_min = max(0.0, min(z_pos, panel_height - batten_width))
-                    z_max = min(panel_height, z_min + batten_width)
+                for z_pos in traverses:
+                    z_min = max(0.0, min(z_pos, height - batten))
+                    z_max = min(height, z_min + batten)
                     slat_intervals.append((z_min, z_max))
 
                 # Merge overlapping intervals
@@ -729,34 +1027,30 @@ def generate_layer(
                     if a > prev + eps:
                         gaps.append((prev, a))
                     prev = max(prev, b)
-                if prev < panel_height - eps:
-                    gaps.append((prev, panel_height))
+                if prev < height - eps:
+                    gaps.append((prev, height))
 
                 # For each gap: full-width band, then subtract buffered openings
                 for gap_idx, (gz0, gz1) in enumerate(gaps, start=1):
-                    base_gap = box(0.0, gz0, panel_width, gz1)
-                    geom_gap = base_gap
-                    if openings_union:
-                        geom_gap = geom_gap.difference(openings_union)
-                    geom_gap = _heal(geom_gap, tol=1e-6)
-
-                    for piece in _collect_polygons(geom_gap):
-                        x0, z0, x1, z1 = piece.bounds
+                    piece_counter = 0
+                    for (x0, z0, x1, z1), _, outline in cut((0.0, gz0, width, gz1)):
                         if (x1 - x0) <= 1e-6 or (z1 - z0) <= 1e-6:
                             continue
-                        element_id = f"{panel_id}-L{layer_index}-I{gap_idx}"
+                        piece_counter += 1
+                        element_id = f"{panel_id}-L{layer_index}-I{gap_idx}-{piece_counter}"
                         elements.append(
                             LatticeElement(
                                 element_id=element_id,
                                 element_type=fill_material,
                                 layer=layer_index,
                                 orientation="surface",
-                                x_min=x0,
-                                x_max=x1,
+                                x_min=mm(x0),
+                                x_max=mm(x1),
                                 y_min=y_min,
                                 y_max=y_max,
-                                z_min=z0,
-                                z_max=z1,
+                                z_min=mm(z0),
+                                z_max=mm(z1),
+                                outline=outline,
                             )
                         )
 
@@ -772,8 +1066,10 @@ def generate_layer(
         include_insulation=include_insulation,
         materials=materials,
         elements=elements,
+        board_length=board_length if layer_type == 'continuous' else 0.0,
     )
 
+@profiled("generate_wall_buildup")
 def generate_wall_buildup(
     panel_id: str,
     panel_width: float,
@@ -782,53 +1078,137 @@ def generate_wall_buildup(
     lattice_config: Dict,             # Dict avec SEULEMENT les paramètres d'ossature
     layer_configs: Sequence[Dict],    # Liste de dicts avec SEULEMENT les paramètres de couche
     opening_voids: Sequence[Polygon] = (),  # Optionnel, défaut: tuple vide
+    lazy: bool = False,
+    exact: bool = False,
 ) -> WallBuildUp:
     """
     Generate a WallBuildUp object from global info and specific configs for each layer and the lattice.
+    lazy=True only sets up the summaries (layer y ranges, lattice layer_ranges, post and
+    traverse positions): the elements of the lattice and of each layer are generated
+    on first access, e.g. by get_layer_stack, or all at once by WallBuildUp.materialize().
+    exact=True generates on integer micrometres (rectangular openings only, see _cutters).
+    Both modes place the same members (_fill_positions compares positions within
+    POSITION_TOLERANCE); the pieces differ by the corner slivers of the rounded float
+    clearance and the boxes they grow (see core/src/quantities.py).
     """
-    # Generate the main framework (lattice)
-    lattice = generate_lattice_layout(
+    common = dict(
         panel_id=panel_id,
         panel_width=panel_width,
         panel_height=panel_height,
         openings=openings,
         opening_voids=opening_voids,
-        **lattice_config
     )
+    generation = dict(common, exact=exact)
+    if lazy:
+        return WallBuildUp(
+            lattice=_lazy_lattice(dict(generation, **lattice_config)),
+            layers=[_lazy_layer(dict(generation, **layer_cfg)) for layer_cfg in layer_configs],
+            **common,
+        )
+
+    # Generate the main framework (lattice)
+    lattice = generate_lattice_layout(**generation, **lattice_config)
 
     # Generate the wall layers
     layers = []
     for layer_cfg in layer_configs:
-        layer = generate_layer(
-            panel_id=panel_id,
-            panel_width=panel_width,
-            panel_height=panel_height,
-            openings=openings,
-            opening_voids=opening_voids,
-            **layer_cfg
-        )
+        layer = generate_layer(**generation, **layer_cfg)
         layers.append(layer)
 
     # Return the complete composition
     buildup = WallBuildUp(
-        panel_id=panel_id,
-        panel_width=panel_width,
-        panel_height=panel_height,
-        openings=openings,
-        opening_voids=opening_voids,
         lattice=lattice,
-        layers=layers
+        layers=layers,
+        **common,
     )
     return buildup
 
 
+def _lazy_lattice(kwargs: Dict) -> LazyLatticeLayout:
+    openings_list = list(kwargs["openings"])
+    slat_width = kwargs["slat_width"]
+    return LazyLatticeLayout(
+        functools.partial(_lattice_elements, kwargs),
+        post_positions=compute_post_positions(
+            kwargs["panel_width"], kwargs["horizontal_pitch"], slat_width, openings_list, kwargs.get("exact", False)
+        ),
+        traverse_positions=compute_traverse_positions(
+            kwargs["panel_height"], kwargs["vertical_pitch"], slat_width, openings_list, kwargs.get("exact", False)
+        ),
+        layer_ranges=get_range_thickness(get_layer_thickness(kwargs["panel_type"])),
+        panel_type=kwargs["panel_type"],
+        slat_width=slat_width,
+        include_insulation=kwargs.get("include_insulation", True),
+    )
+
+
+def _lazy_layer(kwargs: Dict) -> LazyLayer:
+    layer_type = kwargs["layer_type"]
+    board_length = kwargs.get("board_length", BOARD_LENGTH)
+    return LazyLayer(
+        functools.partial(_layer_elements, kwargs),
+        layer_index=kwargs["layer_index"],
+        name=kwargs["name"],
+        layer_type=layer_type,
+        y_min=kwargs["y_min"],
+        y_max=kwargs["y_max"],
+        layer_pitch=kwargs["layer_pitch"],
+        layer_orientation=kwargs["layer_orientation"],
+        batten_width=kwargs["batten_width"],
+        include_insulation=kwargs.get("include_insulation", True),
+        materials=kwargs.get("materials"),
+        board_length=board_length if layer_type == 'continuous' else 0.0,
+    )
+
+
+# Section cuts
 
+SECTION_DEFAULT_CUT = {"vertical": 100, "horizontal": 1500}
 
 
+def iter_section_elements(
+    buildup: WallBuildUp,
+    view_type: str = "vertical",
+    cut_pos: float = None,
+) -> Iterator[Tuple[object, Layer]]:
+    """
+    Elements crossed by a section plane (element objects, no dict copies), with their
+    owning Layer (None for the lattice).
+    - view_type='vertical' : plane x = cut_pos (YZ section)
+    - view_type='horizontal' : plane z = cut_pos (XY section)
+    """
+    if view_type not in SECTION_DEFAULT_CUT:
+        raise ValueError(f"Unknown view type '{view_type}'.")
+    if cut_pos is None:
+        cut_pos = SECTION_DEFAULT_CUT[view_type]
+    lo, hi = ("x_min", "x_max") if view_type == "vertical" else ("z_min", "z_max")
+
+    if buildup.lattice:
+        for el in buildup.lattice.elements:
+            if getattr(el, lo) <= cut_pos <= getattr(el, hi):
+                yield el, None
+    for layer in buildup.layers:
+        for el in layer.elements:
+            if getattr(el, lo) <= cut_pos <= getattr(el, hi):
+                yield el, layer
+
+
+def section_elements(
+    buildup: WallBuildUp,
+    view_type: str = "vertical",
+    cut_pos: float = None,
+) -> List[Tuple[Dict, Layer]]:
+    """Same as iter_section_elements, elements as dicts."""
+    return [(el.as_dict(), layer) for el, layer in iter_section_elements(buildup, view_type, cut_pos)]
+
 
 __all__ = [
+    "BOARD_LENGTH",
+    "EXACT_SCALE",
     "LatticeElement",
     "LatticeLayout",
+    "LazyLatticeLayout",
+    "LazyLayer",
     "compute_post_positions",
     "compute_traverse_positions",
     "generate_lattice_layout",
@@ -836,4 +1216,6 @@ __all__ = [
     "generate_wall_buildup",
     "get_layer_thickness",
     "get_range_thickness",
+    "iter_section_elements",
+    "section_elements",
 ]
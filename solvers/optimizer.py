@@ -0,0 +1,411 @@
+"""
+Multi-Objective Design Space Exploration of wall configurations.
+
+The design space is the cartesian product of options on the `generate_wall_buildup`
+parameters (lattice pitches, slat width, panel type, layer thicknesses and materials).
+Candidates are integer codes (one option index per parameter), so 10^5 candidates are
+a (n, n_params) array, never a list of configs.
+
+1. Surrogate: every candidate is evaluated on a nominal 1 m2 stack (area fractions
+   from pitch ratios, no geometry), vectorised over the whole space.
+2. Pruning: only candidates close to the surrogate Pareto front (margin as a share
+   of each objective range) are kept.
+3. Full evaluation: geometry + `solvers.pipeline` stages, memoized per candidate and
+   run in a process pool.
+4. Pareto front of the full results (skyline sweep, O(n |F|)). Candidates failing the
+   Glaser condensation check (pipeline stage "hygrothermal") are rejected first.
+
+Objectives (all minimised): u_value, -rw, carbon_weight_per_m2, thickness.
+"""
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.src.materials import LATTICE_MATERIALS, MATERIALS, get_material
+from core.src.wall import generate_wall_buildup, get_layer_thickness
+
+from .physics.acoustics.sound_insulation import double_leaf_transmission_loss, single_number_rating
+from .physics.carbon.fdes import get_database
+from .physics.carbon.lca import LATTICE_PRODUCT, material_factors
+from .physics.thermal.transfer_matrix import RSE, RSI
+from .pipeline import evaluate_batch
+
+OBJECTIVES = ("u_value", "rw", "carbon_weight_per_m2", "thickness")
+MAXIMISED = ("rw",)
+EVALUATION_STAGES = ("acoustics", "thermal_static", "hygrothermal", "carbon")
+
+
+# Pareto front
+
+def pareto_front(objectives: np.ndarray) -> np.ndarray:
+    """
+    Indices of the non-dominated rows of an (n, k) array (minimisation).
+    Rows are swept in lexicographic order: a row can only be dominated by an earlier
+    one, so each row is checked against the current front only.
+    """
+    objectives = np.asarray(objectives, dtype=float)
+    order = np.lexsort(objectives.T[::-1])
+    front: List[int] = []
+    front_values = np.empty((0, objectives.shape[1]))
+    for i in order:
+        row = objectives[i]
+        if len(front) and np.any(np.all(front_values <= row, axis=1)):
+            continue   # dominated, or a duplicate of a front member
+        front.append(i)
+        front_values = np.vstack([front_values, row])
+    return np.array(sorted(front), dtype=np.int64)
+
+
+def near_front(objectives: np.ndarray, margin: float, chunk: int = 1024) -> np.ndarray:
+    """
+    Mask of the rows worth a full evaluation: rows that no front member dominates by
+    more than `margin` times the objective range in at least one objective.
+    """
+    objectives = np.asarray(objectives, dtype=float)
+    front = objectives[pareto_front(objectives)]
+    shifted = front + margin * np.ptp(objectives, axis=0)
+    keep = np.empty(len(objectives), dtype=bool)
+    for start in range(0, len(objectives), chunk):
+        block = objectives[start:start + chunk, None, :]
+        dominated = np.all(front[None] <= block, axis=-1) & np.any(shifted[None] <= block, axis=-1)
+        keep[start:start + chunk] = ~dominated.any(axis=1)
+    return keep
+
+
+# Design space
+
+@dataclass
+class DesignSpace:
+    """
+    Options per parameter.
+    lattice : lattice_config key -> options (vertical_pitch, horizontal_pitch, slat_width, panel_type)
+    layers  : position in the base layer list -> {"thickness": [...], <materials key>: [...]}
+    """
+    lattice: Dict[str, Sequence] = field(default_factory=dict)
+    layers: Dict[int, Dict[str, Sequence]] = field(default_factory=dict)
+
+    @property
+    def parameters(self) -> List[Tuple]:
+        params = [("lattice", key, list(options)) for key, options in self.lattice.items()]
+        for position, options in sorted(self.layers.items()):
+            params += [(position, key, list(values)) for key, values in options.items()]
+        return params
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return tuple(len(options) for _, _, options in self.parameters)
+
+    @property
+    def size(self) -> int:
+        return int(np.prod(self.shape, dtype=np.int64))
+
+    def codes(self, index=None) -> np.ndarray:
+        """Option indices (n, n_params) of the candidates with the given flat indices (all by default)."""
+        index = np.arange(self.size) if index is None else np.asarray(index)
+        return np.stack(np.unravel_index(index, self.shape), axis=-1) if self.shape else np.zeros((len(index), 0), int)
+
+    def decode(self, code: Sequence[int]) -> Dict[str, object]:
+        """{'lattice.<key>': value, '<position>.<key>': value} of one candidate."""
+        return {f"{scope}.{key}": options[c] for (scope, key, options), c in zip(self.parameters, code)}
+
+
+def apply_candidate(base: Dict, space: DesignSpace, code: Sequence[int]) -> Tuple[Dict, List[Dict]]:
+    """
+    Lattice and layer configs of one candidate. Layer thickness changes (and a thicker
+    or thinner lattice) push the neighbouring layers so the stack stays contiguous.
+    """
+    lattice = dict(base["lattice_config"])
+    layers = [dict(cfg, materials=dict(cfg.get("materials") or {})) for cfg in base["layer_configs"]]
+    thickness = {n: cfg["y_max"] - cfg["y_min"] for n, cfg in enumerate(layers)}
+
+    for (scope, key, options), c in zip(space.parameters, code):
+        value = options[c]
+        if scope == "lattice":
+            lattice[key] = value
+        elif key == "thickness":
+            thickness[scope] = value
+        else:
+            layers[scope]["materials"][key] = value
+
+    base_core = sum(get_layer_thickness(base["lattice_config"]["panel_type"]))
+    core = sum(get_layer_thickness(lattice["panel_type"]))
+    inner = sorted((n for n, cfg in enumerate(layers) if cfg["y_max"] <= 1e-6), key=lambda n: -layers[n]["y_max"])
+    outer = sorted((n for n, cfg in enumerate(layers) if cfg["y_min"] >= base_core - 1e-6), key=lambda n: layers[n]["y_min"])
+
+    y = 0.0
+    for n in inner:
+        layers[n]["y_max"], layers[n]["y_min"] = y, y - thickness[n]
+        y -= thickness[n]
+    y = float(core)
+    for n in outer:
+        layers[n]["y_min"], layers[n]["y_max"] = y, y + thickness[n]
+        y += thickness[n]
+    return lattice, layers
+
+
+def _evaluate_codes(base: Dict, space: DesignSpace, codes: np.ndarray, materials, lattice_materials) -> np.ndarray:
+    buildups = []
+    for n, code in enumerate(codes):
+        lattice, layers = apply_candidate(base, space, code)
+        buildups.append(
+            generate_wall_buildup(
+                f"candidate-{n}",
+                base["panel_width"],
+                base["panel_height"],
+                base.get("openings", ()),
+                lattice,
+                layers,
+            )
+        )
+    columns = evaluate_batch(buildups, EVALUATION_STAGES, materials, lattice_materials)
+    objectives = objective_matrix(columns)
+    # variants with interstitial condensation never reach the front
+    objectives[~np.asarray(columns["condensation_ok"], dtype=bool)] = np.inf
+    return objectives
+
+
+def objective_matrix(columns: Dict) -> np.ndarray:
+    """(n, 4) minimisation matrix from result columns."""
+    return np.stack(
+        [-np.asarray(columns[k], dtype=float) if k in MAXIMISED else np.asarray(columns[k], dtype=float)
+         for k in OBJECTIVES],
+        axis=-1,
+    )
+
+
+@dataclass
+class OptimizationResult:
+    space: DesignSpace
+    codes: np.ndarray          # (n_evaluated, n_params)
+    objectives: np.ndarray     # (n_evaluated, 4), minimisation form
+    front: np.ndarray          # indices into codes
+    n_candidates: int
+    n_evaluated: int
+    n_rejected: int = 0        # failed the condensation check
+
+    def front_table(self) -> pd.DataFrame:
+        rows = []
+        for i in self.front:
+            row = self.space.decode(self.codes[i])
+            for k, name in enumerate(OBJECTIVES):
+                row[name] = -self.objectives[i, k] if name in MAXIMISED else self.objectives[i, k]
+            rows.append(row)
+        return pd.DataFrame(rows)
+
+
+class WallOptimizer:
+    """
+    base: panel_width, panel_height, openings, lattice_config, layer_configs
+    (same arguments as generate_wall_buildup).
+    """
+
+    def __init__(
+        self,
+        base: Dict,
+        space: DesignSpace,
+        workers: int = None,
+        chunk_size: int = 32,
+        materials=None,
+        lattice_materials=None,
+        db=None,
+    ):
+        self.base = base
+        self.space = space
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.materials = MATERIALS if materials is None else materials
+        self.lattice_materials = LATTICE_MATERIALS if lattice_materials is None else lattice_materials
+        self.db = get_database() if db is None else db
+        self.cache: Dict[Tuple[int, ...], np.ndarray] = {}
+
+    # -- surrogate -------------------------------------------------------
+
+    def _slots(self, codes: np.ndarray):
+        """
+        Nominal stack of every candidate as layer slots (interior first):
+        thickness [m], share of material A, material A / B names per slot (arrays (n,)).
+        """
+        n = len(codes)
+        values = {
+            (scope, key): np.asarray(options, dtype=object)[codes[:, p]]
+            for p, (scope, key, options) in enumerate(self.space.parameters)
+        }
+        base_lattice = self.base["lattice_config"]
+
+        def param(scope, key, default):
+            return values.get((scope, key), np.full(n, default, dtype=object))
+
+        panel_type = param("lattice", "panel_type", base_lattice["panel_type"])
+        slat = param("lattice", "slat_width", base_lattice["slat_width"]).astype(float)
+        h_pitch = param("lattice", "horizontal_pitch", base_lattice["horizontal_pitch"]).astype(float)
+        v_pitch = param("lattice", "vertical_pitch", base_lattice["vertical_pitch"]).astype(float)
+        fill = self.lattice_materials["insulation"] if base_lattice.get("include_insulation", True) else "Air"
+
+        inner, outer = [], []
+        for n_layer, cfg in enumerate(self.base["layer_configs"]):
+            mats = cfg.get("materials") or {}
+            fill_key = next((k for k in mats if k != "batten"), None)
+            batten = param(n_layer, "batten", mats.get("batten", "Air"))
+            infill = param(n_layer, fill_key, mats.get(fill_key, "Air")) if fill_key else np.full(n, "Air", object)
+            if not cfg.get("include_insulation", True) and cfg.get("layer_type") != "continuous":
+                infill = np.full(n, "Air", dtype=object)
+            t = param(n_layer, "thickness", cfg["y_max"] - cfg["y_min"]).astype(float) / 1000.0
+            if cfg.get("layer_type") == "battened" and cfg.get("layer_pitch", 0) > 0:
+                share = np.full(n, min(cfg.get("batten_width", 0) / cfg["layer_pitch"], 1.0))
+            else:
+                share = np.zeros(n)
+            slot = (cfg["y_min"], t, share, batten, infill)
+            (inner if cfg["y_max"] <= 1e-6 else outer).append(slot)
+
+        inner.sort(key=lambda s: s[0])
+        outer.sort(key=lambda s: s[0])
+
+        # lattice sub-layers, padded to 5 slots
+        thick = np.zeros((n, 5))
+        share = np.zeros((n, 5))
+        for t_name in set(panel_type):
+            rows = panel_type == t_name
+            sub = np.asarray(get_layer_thickness(t_name), dtype=float) / 1000.0
+            thick[rows, :len(sub)] = sub
+            for k in range(len(sub)):
+                pitch = h_pitch[rows] if k % 2 == 0 else v_pitch[rows]   # posts on odd layers (1, 3, 5)
+                share[rows, k] = np.minimum(slat[rows] / pitch, 1.0)
+        core = [
+            (None, thick[:, k], share[:, k], np.full(n, self.lattice_materials["slat"], object), np.full(n, fill, object))
+            for k in range(5)
+        ]
+        return inner, core, outer, panel_type
+
+    def surrogate(self, codes: np.ndarray) -> np.ndarray:
+        """Nominal 1 m2 objectives (n, 4) without geometry generation."""
+        inner, core, outer, panel_type = self._slots(codes)
+        n = len(codes)
+        names = sorted({m for slots in (inner, core, outer) for s in slots for m in np.concatenate([s[3], s[4]])})
+        lam = {m: get_material(m, self.materials).conductivity for m in names}
+        rho = {m: get_material(m, self.materials).density for m in names}
+        carbon = {m: material_factors(m, self.db) for m in names}
+
+        def prop(table, materials):
+            return np.array([table[m] for m in materials], dtype=float)
+
+        def mixed(table, slot):
+            _, t, f, a, b = slot
+            return f * prop(table, a) + (1 - f) * prop(table, b)
+
+        def summed(slots, fn):
+            return sum((fn(s) for s in slots), np.zeros(n))
+
+        def mass(s):
+            return s[1] * mixed(rho, s)
+
+        def resistance(s):
+            return s[1] / mixed(lam, s)
+
+        def carbon_of(s, system=None):
+            _, t, f, a, b = s
+            per_volume = f * np.array([carbon[m][0] for m in a]) + (1 - f) * np.array([carbon[m][0] for m in b])
+            per_area = f * np.array([carbon[m][1] for m in a]) + (1 - f) * np.array([carbon[m][1] for m in b])
+            value = t * per_volume + per_area * (t > 0)
+            return value if system is None else np.where(system, 0.0, value)
+
+        all_slots = inner + core + outer
+        u_value = 1.0 / (RSI + RSE + summed(all_slots, resistance))
+        thickness = summed(all_slots, lambda s: s[1]) * 1000.0
+
+        m_core = summed(core, mass)
+        m1 = summed(inner, mass) + 0.5 * m_core
+        m2 = summed(outer, mass) + 0.5 * m_core
+        rw = single_number_rating(double_leaf_transmission_loss(m1, m2, summed(core, lambda s: s[1])))["rw"]
+
+        # lattice declared as a wall system when the FDES exists
+        system_cw = np.zeros(n)
+        system = np.zeros(n, dtype=bool)
+        for t_name in set(panel_type):
+            product = LATTICE_PRODUCT.format(panel_type=t_name)
+            if product in self.db:
+                rows = panel_type == t_name
+                system[rows] = True
+                system_cw[rows] = self.db.carbon_weight[self.db.lookup(product)]
+        carbon_weight = (
+            summed(inner + outer, carbon_of) + summed(core, lambda s: carbon_of(s, system)) + system_cw
+        )
+        return objective_matrix(
+            {"u_value": u_value, "rw": rw, "carbon_weight_per_m2": carbon_weight, "thickness": thickness}
+        )
+
+    # -- full evaluation -------------------------------------------------
+
+    def evaluate(self, codes: np.ndarray) -> np.ndarray:
+        """Full objectives (n, 4), memoized per candidate, chunks evaluated in parallel (inf: condensation)."""
+        codes = np.asarray(codes, dtype=np.int64)
+        keys = [tuple(code) for code in codes.tolist()]
+        todo = list(dict.fromkeys(k for k in keys if k not in self.cache))
+        chunks = [np.array(todo[i:i + self.chunk_size]) for i in range(0, len(todo), self.chunk_size)]
+        args = (self.materials, self.lattice_materials)
+
+        if self.workers is None or self.workers <= 1 or len(chunks) <= 1:
+            results = [_evaluate_codes(self.base, self.space, chunk, *args) for chunk in chunks]
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                futures = [pool.submit(_evaluate_codes, self.base, self.space, chunk, *args) for chunk in chunks]
+                results = [future.result() for future in futures]
+
+        for chunk, values in zip(chunks, results):
+            for code, row in zip(chunk.tolist(), values):
+                self.cache[tuple(code)] = row
+        if not keys:
+            return np.empty((0, len(OBJECTIVES)))
+        return np.array([self.cache[k] for k in keys])
+
+    def run(
+        self,
+        surrogate_margin: float = 0.02,
+        max_evaluations: int = None,
+        use_surrogate: bool = True,
+    ) -> OptimizationResult:
+        """
+        Explore the whole space. With use_surrogate, only the candidates within
+        surrogate_margin of the surrogate front are generated (best surrogate rank first
+        when max_evaluations caps the count).
+        """
+        codes = self.space.codes()
+        if use_surrogate:
+            estimate = self.surrogate(codes)
+            keep = np.flatnonzero(near_front(estimate, surrogate_margin))
+            if max_evaluations is not None and len(keep) > max_evaluations:
+                # closest to the surrogate front first
+                front = estimate[pareto_front(estimate)]
+                scale = np.ptp(estimate, axis=0)
+                scale[scale == 0] = 1.0
+                gap = np.min(np.max((estimate[keep, None, :] - front[None]) / scale, axis=-1), axis=1)
+                keep = keep[np.argsort(gap, kind="stable")[:max_evaluations]]
+            codes = codes[keep]
+        elif max_evaluations is not None:
+            codes = codes[:max_evaluations]
+
+        objectives = self.evaluate(codes)
+        feasible = np.flatnonzero(np.all(np.isfinite(objectives), axis=1))
+        return OptimizationResult(
+            space=self.space,
+            codes=codes,
+            objectives=objectives,
+            front=feasible[pareto_front(objectives[feasible])] if len(feasible) else np.empty(0, dtype=np.int64),
+            n_candidates=self.space.size,
+            n_evaluated=len(codes),
+            n_rejected=len(codes) - len(feasible),
+        )
+
+
+__all__ = [
+    "OBJECTIVES",
+    "DesignSpace",
+    "OptimizationResult",
+    "WallOptimizer",
+    "apply_candidate",
+    "near_front",
+    "pareto_front",
+]
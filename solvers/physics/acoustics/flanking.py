@@ -0,0 +1,638 @@
+"""
+Flanking Transmission between Rooms (ISO 12354-1 simplified model).
+
+The panels of a Building are joined into a junction graph. Two panels are in
+contact where the line common to their mid-planes lies within both of them (or
+along the shared edge of two in-line panels); contacts on the same line are
+merged into one junction with one arm per panel side: a panel ending at the line
+has one arm, a panel running through it has two.
+
+Every separating panel s (a room on each side) transmits along the direct path
+Dd and, at each junction on its edges, along the flanking paths Ff, Fd and Df
+through the neighbouring arms i (source room side) and j (receiving room side):
+
+    R_ij = (R_i + R_j) / 2 + K_ij + 10 lg(S_s / (l0 l_f))
+
+K_ij is the vibration reduction index of ISO 12354-1 Annex E for rigid cross,
+T, corner and in-line junctions (floored at K_min), l_f the junction length
+shared by the three arms. The energies of all paths of all separating panels
+between two rooms are summed on the 16 bands at once, giving R'w and, with the
+room volumes, DnT,w and DnT,A:
+
+    graph = junction_graph(building)
+    result = flanking_transmission(
+        building,
+        rooms={"W12": ("flat 1", "flat 2"), "F2": ("flat 1", "flat 5")},
+        volumes={"flat 1": 52.0, "flat 2": 48.0, "flat 5": 50.0},
+        graph=graph,
+    )
+    result.as_records()     # per source / receiving room: R'w (C; Ctr), DnT,A, NRA check
+    result.path_records()   # every path with its share of the transmitted energy
+
+rooms maps a panel id to the rooms on its interior (-y) and exterior (+y) sides;
+a separating panel separates one pair of rooms. Panels missing from the mapping
+(or with a None side) only act as flanking elements. Rooms linked by flanking
+paths alone (no common separating panel) are not rated.
+Geometry and junction lengths in mm like the core, areas in m2.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+
+from core.src.quantities import quantity_stack
+from core.src.stack import get_layer_stack, stack_arrays
+
+from .sound_insulation import (
+    FREQS,
+    SPECTRUM_C,
+    double_leaf_transmission_loss,
+    leaf_masses,
+    single_number_rating,
+)
+
+JUNCTION_TOL = 20.0          # [mm] gap still counted as a contact
+MIN_JUNCTION_LENGTH = 100.0  # [mm] shorter contacts are ignored
+PARALLEL_SIN = 0.02          # |y_p x y_q| below: parallel panels (~1 deg)
+STRAIGHT_COS = np.cos(np.radians(135.0))  # arms at more than 135 deg: straight path
+L0 = 1.0                     # [m] reference junction length
+T0 = 0.5                     # [s] reference reverberation time of DnT
+DNT_A_TARGET = 53.0          # [dB] NRA 2000, airborne between dwellings
+
+PATH_KINDS = ("Dd", "Ff", "Fd", "Df")
+
+
+def panel_acoustics(
+    buildups: Sequence,
+    materials=None,
+    lattice_materials=None,
+    analytic: bool = True,
+) -> Dict[str, np.ndarray]:
+    """
+    Direct R spectrum (double-leaf model of the pipeline acoustics stage), surface mass
+    and y range of every panel: {"r": (n, 16), "surface_mass": (n,), "y_range": (n, 2) [mm]}.
+    """
+    buildups = list(buildups)
+    layer_stack = quantity_stack if analytic else get_layer_stack
+    stacks = [layer_stack(b, lattice_materials) for b in buildups]
+    arrays = stack_arrays(stacks, materials)
+    surface_mass = arrays["density"] * arrays["thickness"] / 1000.0
+
+    shape = surface_mass.shape
+    y_min, y_max = np.zeros(shape), np.zeros(shape)
+    y_range = np.zeros((len(buildups), 2))
+    core_range = np.zeros((len(buildups), 2))
+    for b, (buildup, stack) in enumerate(zip(buildups, stacks)):
+        y_min[b, :len(stack)] = [layer.y_min for layer in stack]
+        y_max[b, :len(stack)] = [layer.y_max for layer in stack]
+        y_range[b] = y_min[b, :len(stack)].min(), y_max[b, :len(stack)].max()
+        if buildup.lattice is not None and buildup.lattice.layer_ranges:
+            core_range[b] = buildup.lattice.layer_ranges[0][0], buildup.lattice.layer_ranges[-1][1]
+
+    m1, m2, cavity = leaf_masses(y_min, y_max, surface_mass, core_range)
+    return {
+        "r": double_leaf_transmission_loss(m1, m2, cavity),
+        "surface_mass": m1 + m2,
+        "y_range": y_range,
+    }
+
+
+# --- junction graph ----------------------------------------------------------
+
+@dataclass
+class JunctionGraph:
+    """Junction lines of a building, their arms stored flat (arms of junction k: offsets[k]:offsets[k + 1])."""
+    panel_ids: List[str]
+    point: np.ndarray          # (j, 3) point of the junction line [mm]
+    direction: np.ndarray      # (j, 3) unit direction of the line
+    offsets: np.ndarray        # (j + 1,)
+    arm_panel: np.ndarray      # (a,) panel index
+    arm_direction: np.ndarray  # (a, 3) unit in-plane direction from the line into the panel
+    arm_area: np.ndarray       # (a,) [m2] panel area on that side of the line
+    arm_interval: np.ndarray   # (a, 2) extent of the panel along the line [mm]
+
+    def __len__(self) -> int:
+        return len(self.point)
+
+    @property
+    def arm_junction(self) -> np.ndarray:
+        return np.repeat(np.arange(len(self)), np.diff(self.offsets))
+
+    @property
+    def n_arms(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    @property
+    def length(self) -> np.ndarray:
+        """[mm] extent along the line common to every arm."""
+        if not len(self):
+            return np.zeros(0)
+        lo = np.maximum.reduceat(self.arm_interval[:, 0], self.offsets[:-1])
+        hi = np.minimum.reduceat(self.arm_interval[:, 1], self.offsets[:-1])
+        return np.maximum(hi - lo, 0.0)
+
+    @property
+    def kind(self) -> np.ndarray:
+        """Junction type: cross, T, corner or in-line."""
+        n = self.n_arms
+        kind = np.where(n >= 4, "cross", "T").astype(object)
+        two = np.flatnonzero(n == 2)
+        first = self.offsets[two]
+        cos = np.einsum("ij,ij->i", self.arm_direction[first], self.arm_direction[first + 1])
+        kind[two] = np.where(cos <= STRAIGHT_COS, "in-line", "corner")
+        return kind
+
+    def adjacency(self) -> sparse.csr_matrix:
+        """(panels, panels) number of junctions joining two panels."""
+        a, b = _pairs_within(self.offsets)
+        junction = self.arm_junction[a]
+        a, b = self.arm_panel[a], self.arm_panel[b]
+        keep = a != b
+        pairs = np.unique(
+            np.column_stack([junction, np.minimum(a, b), np.maximum(a, b)])[keep], axis=0
+        ).reshape(-1, 3)
+        n = len(self.panel_ids)
+        matrix = sparse.coo_matrix((np.ones(len(pairs)), (pairs[:, 1], pairs[:, 2])), shape=(n, n)).tocsr()
+        return matrix + matrix.T
+
+    def as_records(self) -> List[Dict]:
+        kind, length = self.kind, self.length
+        return [
+            {
+                "junction": k,
+                "kind": kind[k],
+                "length": float(length[k]),
+                "panels": sorted({self.panel_ids[p] for p in self.arm_panel[self.offsets[k]:self.offsets[k + 1]]}),
+                "point": self.point[k].tolist(),
+                "direction": self.direction[k].tolist(),
+            }
+            for k in range(len(self))
+        ]
+
+
+def _pairs_within(offsets: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Index pairs (a < b) inside every group offsets[k]:offsets[k + 1]."""
+    size = np.diff(offsets)
+    n = int(offsets[-1]) if len(offsets) else 0
+    group = np.repeat(np.arange(len(size)), size)
+    count = offsets[1:][group] - np.arange(n) - 1
+    a = np.repeat(np.arange(n), count)
+    b = a + 1 + (np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count))
+    return a, b
+
+
+def _corners(origin, axes, size, y) -> np.ndarray:
+    """World corners (n, 4, 3) of the panel rectangles at the local depths y (n,)."""
+    x = size[:, :1] * np.array([0.0, 1.0, 1.0, 0.0])
+    z = size[:, 1:] * np.array([0.0, 0.0, 1.0, 1.0])
+    local = np.stack([x, np.broadcast_to(y[:, None], x.shape), z], axis=-1)
+    return np.einsum("nck,nkj->ncj", local, axes) + origin[:, None]
+
+
+def _dot(a, b) -> np.ndarray:
+    return np.einsum("...j,...j->...", a, b)
+
+
+def _candidate_pairs(lo: np.ndarray, hi: np.ndarray):
+    """Panel pairs (p < q) with intersecting world boxes, sweep and prune on x."""
+    order = np.argsort(lo[:, 0], kind="stable")
+    end = np.searchsorted(lo[order, 0], hi[order, 0], side="right")
+    count = np.maximum(end - np.arange(len(order)) - 1, 0)
+    i = np.repeat(np.arange(len(order)), count)
+    j = i + 1 + (np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count))
+    p, q = order[i], order[j]
+    keep = np.all((lo[p] <= hi[q]) & (lo[q] <= hi[p]), axis=1)
+    p, q = p[keep], q[keep]
+    return np.minimum(p, q), np.maximum(p, q)
+
+
+def _crossing_contacts(p, q, origin, axes, size, y_mid, half, mid_corners, tol):
+    """Line common to the mid-planes of non-parallel panels, clipped to both panels."""
+    n_p, n_q = axes[p, 1], axes[q, 1]
+    d = np.cross(n_p, n_q)
+    d /= np.linalg.norm(d, axis=1, keepdims=True)
+    k = _dot(n_p, n_q)
+    c_p = _dot(n_p, origin[p]) + y_mid[p]
+    c_q = _dot(n_q, origin[q]) + y_mid[q]
+    den = 1.0 - k ** 2
+    point = ((c_p - c_q * k) / den)[:, None] * n_p + ((c_q - c_p * k) / den)[:, None] * n_q
+
+    # the line must lie within each panel, up to the half thickness of the other one
+    t0, t1 = np.full(len(p), -np.inf), np.full(len(p), np.inf)
+    for panel, margin in ((p, half[q] + tol), (q, half[p] + tol)):
+        for axis, extent in ((0, size[panel, 0]), (2, size[panel, 1])):
+            a = _dot(axes[panel, axis], point - origin[panel])
+            b = _dot(axes[panel, axis], d)
+            lo, hi = -margin - a, extent + margin - a
+            moving = np.abs(b) > 1e-9
+            safe = np.where(moving, b, 1.0)
+            ta, tb = lo / safe, hi / safe
+            inside = (lo <= 0) & (hi >= 0)
+            t0 = np.where(moving, np.maximum(t0, np.minimum(ta, tb)), np.where(inside, t0, np.inf))
+            t1 = np.where(moving, np.minimum(t1, np.maximum(ta, tb)), np.where(inside, t1, -np.inf))
+    # contact length: extent along the line common to both panels
+    for panel in (p, q):
+        along = _dot(mid_corners[panel] - point[:, None], d[:, None])
+        t0 = np.maximum(t0, along.min(axis=1))
+        t1 = np.minimum(t1, along.max(axis=1))
+    return p, q, point, d, t0, t1
+
+
+def _inline_contacts(p, q, origin, axes, size, y_mid, half, mid_corners, tol):
+    """Shared edges of parallel panels whose mid-planes lie within each other."""
+    offset = _dot(axes[p, 1], mid_corners[q, 0] - origin[p]) - y_mid[p]
+    close = np.abs(offset) <= np.maximum(half[p], half[q])
+    rel = mid_corners[q] - origin[p][:, None]
+    qx, qz = _dot(rel, axes[p, 0][:, None]), _dot(rel, axes[p, 2][:, None])
+    qx0, qx1, qz0, qz1 = qx.min(axis=1), qx.max(axis=1), qz.min(axis=1), qz.max(axis=1)
+    width, height = size[p, 0], size[p, 1]
+    z_lo, z_hi = np.maximum(qz0, 0.0), np.minimum(qz1, height)
+    x_lo, x_hi = np.maximum(qx0, 0.0), np.minimum(qx1, width)
+    base = origin[p] + axes[p, 1] * y_mid[p][:, None]
+    found = []
+    # (gap to the edge, edge position, across axis, along axis, interval)
+    for gap, at, across, along, lo, hi in (
+        (np.abs(qx0 - width), width, 0, 2, z_lo, z_hi),
+        (np.abs(qx1), 0.0, 0, 2, z_lo, z_hi),
+        (np.abs(qz0 - height), height, 2, 0, x_lo, x_hi),
+        (np.abs(qz1), 0.0, 2, 0, x_lo, x_hi),
+    ):
+        hit = np.flatnonzero(close & (gap <= tol))
+        at = np.broadcast_to(at, p.shape)[hit]
+        found.append((
+            p[hit], q[hit],
+            base[hit] + axes[p[hit], across] * at[:, None],
+            axes[p[hit], along],
+            lo[hit], hi[hit],
+        ))
+    return tuple(np.concatenate(column) for column in zip(*found))
+
+
+def junction_graph(
+    building,
+    y_range: Optional[np.ndarray] = None,
+    tol: float = JUNCTION_TOL,
+    min_length: float = MIN_JUNCTION_LENGTH,
+) -> JunctionGraph:
+    """
+    Junctions between the panels of a Building. y_range: (n, 2) panel depth [mm]
+    (default: from the layer stacks). Broad phase on the world boxes, then the
+    contact lines of all candidate pairs at once; contacts on the same line that
+    share a panel are merged into one junction.
+    """
+    n = len(building)
+    if y_range is None:
+        y_range = np.array([
+            (min(l.y_min for l in stack), max(l.y_max for l in stack))
+            for stack in (quantity_stack(b, building.lattice_materials) for b in building.buildups)
+        ]).reshape(-1, 2)
+    origin, axes = building.origins, building.axes
+    size = np.array([(b.panel_width, b.panel_height) for b in building.buildups], dtype=float).reshape(-1, 2)
+    y_range = np.asarray(y_range, dtype=float)
+    y_mid, half = y_range.mean(axis=1), (y_range[:, 1] - y_range[:, 0]) / 2
+    mid_corners = _corners(origin, axes, size, y_mid)
+
+    faces = np.concatenate([_corners(origin, axes, size, y_range[:, 0]), _corners(origin, axes, size, y_range[:, 1])], axis=1)
+    p, q = _candidate_pairs(faces.min(axis=1) - tol, faces.max(axis=1) + tol)
+    parallel = np.linalg.norm(np.cross(axes[p, 1], axes[q, 1]), axis=1) < PARALLEL_SIN
+    args = (origin, axes, size, y_mid, half, mid_corners, tol)
+    contacts = [
+        _crossing_contacts(p[~parallel], q[~parallel], *args),
+        _inline_contacts(p[parallel], q[parallel], *args),
+    ]
+    cp, cq, point, d, t0, t1 = (np.concatenate(column) for column in zip(*contacts))
+    keep = t1 - t0 >= min_length
+    cp, cq, point, d, t0, t1 = cp[keep], cq[keep], point[keep], d[keep], t0[keep], t1[keep]
+    if not len(cp):
+        return JunctionGraph(
+            list(building.panel_ids), np.zeros((0, 3)), np.zeros((0, 3)), np.zeros(1, dtype=np.int64),
+            np.zeros(0, dtype=np.int64), np.zeros((0, 3)), np.zeros(0), np.zeros((0, 2)),
+        )
+
+    # canonical lines: direction with a positive main component, point closest to the world origin
+    m = len(cp)
+    flip = d[np.arange(m), np.argmax(np.abs(d), axis=1)] < 0
+    d = np.where(flip[:, None], -d, d) + 0.0
+    t0, t1 = np.where(flip, -t1, t0), np.where(flip, -t0, t1)
+    shift = _dot(point, d)
+    foot = point - shift[:, None] * d
+    t0, t1 = t0 + shift, t1 + shift
+
+    # merge contacts sharing a panel, on the same line and overlapping
+    incidence_contact = np.concatenate([np.arange(m), np.arange(m)])
+    incidence_panel = np.concatenate([cp, cq])
+    order = np.argsort(incidence_panel, kind="stable")
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(incidence_panel, minlength=n))])
+    a, b = _pairs_within(offsets)
+    a, b = incidence_contact[order[a]], incidence_contact[order[b]]
+    reach = np.maximum(half[cp], half[cq]) + tol
+    same = (
+        (np.abs(_dot(d[a], d[b])) > 1.0 - 1e-6)
+        & (np.linalg.norm(foot[a] - foot[b], axis=1) <= np.maximum(reach[a], reach[b]))
+        & (np.minimum(t1[a], t1[b]) - np.maximum(t0[a], t0[b]) >= min_length)
+    )
+    links = sparse.coo_matrix((np.ones(same.sum()), (a[same], b[same])), shape=(m, m))
+    _, label = connected_components(links, directed=False)
+    _, first = np.unique(label, return_index=True)
+    line_point, line_dir = foot[first], d[first]
+
+    # arms: every side of a panel extending beyond the junction
+    jp = np.unique(np.column_stack([np.concatenate([label, label]), incidence_panel]), axis=0).reshape(-1, 2)
+    g, panel = jp[:, 0], jp[:, 1]
+    reach_g = np.zeros(len(first))
+    np.maximum.at(reach_g, g, half[panel] + tol)
+    u = np.cross(axes[panel, 1], line_dir[g])
+    u /= np.linalg.norm(u, axis=1, keepdims=True)
+    rel = mid_corners[panel] - line_point[g][:, None]
+    across = _dot(rel, u[:, None])
+    along = _dot(rel, line_dir[g][:, None])
+    pos = np.where(across.max(axis=1) > reach_g[g], across.max(axis=1), 0.0)
+    neg = np.where(-across.min(axis=1) > reach_g[g], -across.min(axis=1), 0.0)
+    total = np.where(pos + neg > 0, pos + neg, 1.0)
+    area = size[panel, 0] * size[panel, 1] / 1e6
+    interval = np.column_stack([along.min(axis=1), along.max(axis=1)])
+
+    arm_g = np.concatenate([g[pos > 0], g[neg > 0]])
+    arm_panel = np.concatenate([panel[pos > 0], panel[neg > 0]])
+    arm_dir = np.concatenate([u[pos > 0], -u[neg > 0]])
+    arm_area = np.concatenate([(area * pos / total)[pos > 0], (area * neg / total)[neg > 0]])
+    arm_interval = np.concatenate([interval[pos > 0], interval[neg > 0]])
+
+    # a junction needs arms on two panels at least
+    panels_per_junction = np.bincount(np.unique(np.column_stack([arm_g, arm_panel]), axis=0)[:, 0], minlength=len(first))
+    valid = panels_per_junction >= 2
+    renumber = np.cumsum(valid) - 1
+    keep = valid[arm_g]
+    arm_g = renumber[arm_g[keep]]
+    order = np.lexsort((arm_panel[keep], arm_g))
+    return JunctionGraph(
+        panel_ids=list(building.panel_ids),
+        point=line_point[valid],
+        direction=line_dir[valid],
+        offsets=np.concatenate([[0], np.cumsum(np.bincount(arm_g, minlength=int(valid.sum())))]),
+        arm_panel=arm_panel[keep][order],
+        arm_direction=arm_dir[keep][order],
+        arm_area=arm_area[keep][order],
+        arm_interval=arm_interval[keep][order],
+    )
+
+
+# --- transmission paths ------------------------------------------------------
+
+def vibration_reduction_index(n_arms, straight, m_a, m_b, m_perp) -> np.ndarray:
+    """
+    K_ij [dB] of rigid junctions (ISO 12354-1 Annex E) between arms of surface masses
+    m_a and m_b: cross (4 arms), T (3 arms), corner / in-line (2 arms).
+    m_perp: mean surface mass of the other arms, used on straight paths.
+    """
+    n_arms, straight = np.asarray(n_arms), np.asarray(straight, dtype=bool)
+    m_a, m_b = np.asarray(m_a, dtype=float), np.asarray(m_b, dtype=float)
+    m_corner = np.log10(m_b / m_a)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        m_straight = np.where(n_arms > 2, np.log10(np.asarray(m_perp, dtype=float) / m_a), 0.0)
+    cross = np.where(straight, 8.7 + 17.1 * m_straight + 5.7 * m_straight ** 2, 8.7 + 5.7 * m_corner ** 2)
+    tee = np.where(straight, 5.7 + 14.1 * m_straight + 5.7 * m_straight ** 2, 5.7 + 5.7 * m_corner ** 2)
+    two = np.where(straight, 5.0 * m_corner ** 2 - 5.0, np.maximum(15.0 * np.abs(m_corner) - 3.0, -2.0))
+    return np.where(n_arms >= 4, cross, np.where(n_arms == 3, tee, two))
+
+
+def _flanking_paths(graph: JunctionGraph, normals: np.ndarray, separating: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Ff, Fd, Df arms of every separating arm s: i is the nearest arm of another panel
+    turning from s towards its -y side, j towards its +y side.
+    """
+    a, b = _pairs_within(graph.offsets)
+    s, o = np.concatenate([a, b]), np.concatenate([b, a])
+    ps, po = graph.arm_panel[s], graph.arm_panel[o]
+    keep = separating[ps] & (ps != po)
+    s, o, ps = s[keep], o[keep], ps[keep]
+    u_o = graph.arm_direction[o]
+    theta = np.arctan2(_dot(u_o, normals[ps]), _dot(u_o, graph.arm_direction[s])) % (2 * np.pi)
+
+    order = np.lexsort((theta, s))
+    s, o = s[order], o[order]
+    first, last = np.ones(len(s), dtype=bool), np.ones(len(s), dtype=bool)
+    first[1:] = last[:-1] = s[1:] != s[:-1]
+    arm_s, arm_j, arm_i = s[first], o[first], o[last]
+    ff = arm_i != arm_j
+    return {
+        "kind": np.concatenate([np.full(ff.sum(), 1), np.full(len(arm_s), 2), np.full(len(arm_s), 3)]),
+        "s": np.concatenate([arm_s[ff], arm_s, arm_s]),
+        "a": np.concatenate([arm_i[ff], arm_i, arm_s]),        # source room side
+        "b": np.concatenate([arm_j[ff], arm_s, arm_j]),        # receiving room side
+    }
+
+
+@dataclass
+class FlankingResult:
+    """Apparent sound insulation per room pair; paths of all pairs stored flat."""
+    panel_ids: List[str]
+    rooms: List[Tuple[Hashable, Hashable]]   # (room_a, room_b) per pair
+    area: np.ndarray           # (pairs,) separating area [m2]
+    r_direct: np.ndarray       # (pairs, 16) separating panels alone (Dd) [dB]
+    r_prime: np.ndarray        # (pairs, 16) apparent R', all paths [dB]
+    dnt: np.ndarray            # (pairs, 2, 16) DnT with room b, room a receiving; nan without volume
+    rw: np.ndarray             # (pairs,) Rw of r_direct
+    rw_prime: np.ndarray
+    c: np.ndarray
+    ctr: np.ndarray
+    dnt_w: np.ndarray          # (pairs, 2)
+    dnt_a: np.ndarray          # (pairs, 2) DnT,w + C
+    path_pair: np.ndarray      # (paths,)
+    path_kind: np.ndarray      # (paths,) index in PATH_KINDS
+    path_panels: np.ndarray    # (paths, 2) panels i (-y side of the separating panel) and j
+    path_junction: np.ndarray  # (paths,) -1 for Dd
+    path_r: np.ndarray         # (paths, 16) R_ij referred to the separating area [dB]
+    path_share: np.ndarray     # (paths,) share of the pair energy (A-weighted pink noise)
+    target: float = DNT_A_TARGET
+
+    def __len__(self) -> int:
+        return len(self.rooms)
+
+    @property
+    def n_paths(self) -> np.ndarray:
+        return np.bincount(self.path_pair, minlength=len(self))
+
+    def pair(self, room_a, room_b) -> int:
+        for k, rooms in enumerate(self.rooms):
+            if rooms in ((room_a, room_b), (room_b, room_a)):
+                return k
+        raise ValueError(f"No separating panel between '{room_a}' and '{room_b}'.")
+
+    def as_records(self) -> List[Dict]:
+        """Two rows per pair (each room receiving), with the DnT,A check against `target`."""
+        n_paths = self.n_paths
+        rows = []
+        for k, (room_a, room_b) in enumerate(self.rooms):
+            for side, (source, receiver) in enumerate(((room_a, room_b), (room_b, room_a))):
+                dnt_a = float(self.dnt_a[k, side])
+                rows.append({
+                    "source": source,
+                    "receiver": receiver,
+                    "area": float(self.area[k]),
+                    "n_paths": int(n_paths[k]),
+                    "rw": float(self.rw[k]),
+                    "rw_prime": float(self.rw_prime[k]),
+                    "c": float(self.c[k]),
+                    "ctr": float(self.ctr[k]),
+                    "dnt_w": float(self.dnt_w[k, side]),
+                    "dnt_a": dnt_a,
+                    "compliant": None if np.isnan(dnt_a) else bool(dnt_a >= self.target),
+                })
+        return rows
+
+    def path_records(self, pair: Optional[int] = None) -> List[Dict]:
+        """Paths of one pair (index in rooms) or of all pairs, largest energy share first."""
+        rows = np.flatnonzero(self.path_pair == pair) if pair is not None else np.arange(len(self.path_pair))
+        rows = rows[np.lexsort((-self.path_share[rows], self.path_pair[rows]))]
+        records = []
+        for chunk in range(0, len(rows), 2048):
+            part = rows[chunk:chunk + 2048]
+            rating = single_number_rating(self.path_r[part])["rw"]
+            for n, path in enumerate(part.tolist()):
+                room_a, room_b = self.rooms[self.path_pair[path]]
+                records.append({
+                    "room_a": room_a,
+                    "room_b": room_b,
+                    "kind": PATH_KINDS[self.path_kind[path]],
+                    "panel_i": self.panel_ids[self.path_panels[path, 0]],
+                    "panel_j": self.panel_ids[self.path_panels[path, 1]],
+                    "junction": int(self.path_junction[path]),
+                    "rw": float(rating[n]),
+                    "share": float(self.path_share[path]),
+                })
+        return records
+
+
+def flanking_transmission(
+    building,
+    rooms: Dict[str, Tuple[Hashable, Hashable]],
+    volumes: Optional[Dict[Hashable, float]] = None,
+    acoustics: Optional[Dict[str, np.ndarray]] = None,
+    graph: Optional[JunctionGraph] = None,
+    k_offset=None,
+    target: float = DNT_A_TARGET,
+    materials=None,
+) -> FlankingResult:
+    """
+    R'w and DnT,A of every pair of rooms separated by at least one panel.
+    rooms: panel id -> (room on its -y side, room on its +y side); volumes: room -> [m3].
+    acoustics: panel_acoustics of the building panels (computed if None), graph: its
+    junction_graph (built if None). k_offset [dB]: added to K_ij, a scalar or one value
+    (or 16-band spectrum) per junction of the graph, e.g. for elastic interlayers.
+    """
+    n = len(building)
+    if acoustics is None:
+        acoustics = panel_acoustics(building.buildups, materials, building.lattice_materials, analytic=building.analytic)
+    if graph is None:
+        graph = junction_graph(building, y_range=acoustics["y_range"])
+    if len(graph.panel_ids) != n:
+        raise ValueError("The junction graph was built for another set of panels.")
+    r, mass = np.asarray(acoustics["r"], dtype=float), np.asarray(acoustics["surface_mass"], dtype=float)
+    size = np.array([(b.panel_width, b.panel_height) for b in building.buildups], dtype=float).reshape(-1, 2)
+    panel_area = size[:, 0] * size[:, 1] / 1e6
+
+    # room pairs
+    pair_index: Dict[Tuple, int] = {}
+    pair_of_panel = np.full(n, -1, dtype=np.int64)
+    for panel_id, sides in rooms.items():
+        room_a, room_b = sides
+        if room_a is None or room_b is None or room_a == room_b:
+            continue
+        key = (room_a, room_b) if str(room_a) <= str(room_b) else (room_b, room_a)
+        pair_of_panel[building.index(panel_id)] = pair_index.setdefault(key, len(pair_index))
+    separating = pair_of_panel >= 0
+    n_pairs = len(pair_index)
+
+    # flanking paths: R_ij = (R_i + R_j) / 2 + K_ij + 10 lg(S_s / (l0 l_f))
+    paths = _flanking_paths(graph, building.axes[:, 1], separating)
+    arm_s, arm_a, arm_b = paths["s"], paths["a"], paths["b"]
+    junction = graph.arm_junction[arm_s]
+    p_s, p_a, p_b = graph.arm_panel[arm_s], graph.arm_panel[arm_a], graph.arm_panel[arm_b]
+    interval = graph.arm_interval
+    l_f = (
+        np.minimum.reduce([interval[arm_s, 1], interval[arm_a, 1], interval[arm_b, 1]])
+        - np.maximum.reduce([interval[arm_s, 0], interval[arm_a, 0], interval[arm_b, 0]])
+    ) / 1000.0
+    valid = l_f > 0
+    arm_a, arm_b, junction, l_f = arm_a[valid], arm_b[valid], junction[valid], l_f[valid]
+    p_s, p_a, p_b, kind = p_s[valid], p_a[valid], p_b[valid], paths["kind"][valid]
+
+    n_arms = graph.n_arms[junction]
+    arm_mass = mass[graph.arm_panel]
+    mass_sum = np.add.reduceat(arm_mass, graph.offsets[:-1]) if len(graph) else np.zeros(0)
+    m_a, m_b = mass[p_a], mass[p_b]
+    m_perp = (mass_sum[junction] - m_a - m_b) / np.maximum(n_arms - 2, 1)
+    straight = _dot(graph.arm_direction[arm_a], graph.arm_direction[arm_b]) <= STRAIGHT_COS
+    k_ij = vibration_reduction_index(n_arms, straight, m_a, m_b, m_perp)
+    k_min = 10 * np.log10(l_f * L0 * (1 / graph.arm_area[arm_a] + 1 / graph.arm_area[arm_b]))
+    k_ij = np.maximum(k_ij, k_min)[:, None] * np.ones(len(FREQS))
+    if k_offset is not None:
+        offset = np.asarray(k_offset, dtype=float)
+        if offset.ndim == 0:
+            k_ij = k_ij + offset
+        elif offset.shape[0] == len(graph) and offset.ndim <= 2:
+            k_ij = k_ij + offset.reshape(len(graph), -1)[junction]
+        else:
+            raise ValueError(f"k_offset must be a scalar or have one row per junction ({len(graph)}).")
+    r_path = 0.5 * (r[p_a] + r[p_b]) + k_ij + 10 * np.log10(panel_area[p_s] / (L0 * l_f))[:, None]
+
+    # energy sums per pair, direct path first
+    sep = np.flatnonzero(separating)
+    path_pair = np.concatenate([pair_of_panel[sep], pair_of_panel[p_s]])
+    path_r = np.concatenate([r[sep], r_path])
+    energy = np.concatenate([panel_area[sep], panel_area[p_s]])[:, None] * 10 ** (-path_r / 10)
+    area = np.bincount(pair_of_panel[sep], weights=panel_area[sep], minlength=n_pairs)
+    direct, total = np.zeros((n_pairs, len(FREQS))), np.zeros((n_pairs, len(FREQS)))
+    np.add.at(direct, pair_of_panel[sep], energy[:len(sep)])
+    np.add.at(total, path_pair, energy)
+    r_direct = -10 * np.log10(direct / area[:, None])
+    r_prime = -10 * np.log10(total / area[:, None])
+    weight = 10 ** (SPECTRUM_C / 10)
+    path_share = (energy @ weight) / (total @ weight)[path_pair]
+
+    # standardized level difference, each room of the pair receiving
+    volumes = volumes or {}
+    pairs = list(pair_index)
+    volume = np.array([[volumes.get(b, np.nan), volumes.get(a, np.nan)] for a, b in pairs], dtype=float).reshape(-1, 2)
+    dnt = r_prime[:, None, :] + 10 * np.log10(0.16 * volume / (T0 * area[:, None]))[..., None]
+    known = ~np.isnan(volume)
+    dnt_rating = single_number_rating(np.where(known[..., None], dnt, 0.0))
+    direct_rating, rating = single_number_rating(r_direct), single_number_rating(r_prime)
+    dnt_w = np.where(known, dnt_rating["rw"], np.nan)
+    return FlankingResult(
+        panel_ids=list(building.panel_ids),
+        rooms=pairs,
+        area=area,
+        r_direct=r_direct,
+        r_prime=r_prime,
+        dnt=dnt,
+        rw=direct_rating["rw"],
+        rw_prime=rating["rw"],
+        c=rating["c"],
+        ctr=rating["ctr"],
+        dnt_w=dnt_w,
+        dnt_a=dnt_w + np.where(known, dnt_rating["c"], np.nan),
+        path_pair=path_pair,
+        path_kind=np.concatenate([np.zeros(len(sep), dtype=np.int64), kind]),
+        path_panels=np.column_stack([np.concatenate([sep, p_a]), np.concatenate([sep, p_b])]),
+        path_junction=np.concatenate([np.full(len(sep), -1), junction]),
+        path_r=path_r,
+        path_share=path_share,
+        target=target,
+    )
+
+
+__all__ = [
+    "DNT_A_TARGET",
+    "FlankingResult",
+    "JunctionGraph",
+    "PATH_KINDS",
+    "flanking_transmission",
+    "junction_graph",
+    "panel_acoustics",
+    "vibration_reduction_index",
+]
@@ -0,0 +1,109 @@
+"""
+Airborne Sound Insulation (ISO 717-1 rating, double-leaf model of `acoustics.ipynb`).
+
+Every function works on batches: spectra are arrays of shape (..., 16) on the
+one-third octave bands FREQS (100 - 3150 Hz).
+"""
+from __future__ import annotations
+from typing import Dict
+
+import numpy as np
+
+FREQS = np.array([100, 125, 160, 200, 250, 315, 400, 500, 630, 800, 1000, 1250, 1600, 2000, 2500, 3150])
+
+# ISO 717-1 reference curve (airborne) and sound level spectra (A-weighted, normalised)
+REF_CURVE_ISO = np.array([33, 36, 39, 42, 45, 48, 51, 52, 53, 54, 55, 56, 56, 56, 56, 56])
+SPECTRUM_C = np.array([-29, -26, -23, -21, -19, -17, -15, -13, -12, -11, -10, -9, -9, -9, -9, -9])
+SPECTRUM_CTR = np.array([-20, -20, -18, -16, -15, -14, -13, -12, -11, -9, -8, -9, -10, -11, -13, -15])
+
+MAX_UNFAVOURABLE = 32.0  # [dB], sum over the 16 bands
+_SHIFTS = np.arange(-60, 61)
+
+C_AIR = 343.0    # [m/s]
+
+
+def mass_law(freqs, mass_per_area):
+    """Diffuse field mass law: R = 20 log(m f) - 47."""
+    return 20 * np.log10(np.asarray(mass_per_area)[..., None] * freqs) - 47
+
+
+def double_leaf_transmission_loss(
+    m1,
+    m2,
+    cavity,
+    freqs=FREQS,
+    bridge_limit: float = 65.0,
+    r_min: float = 10.0,
+    r_max: float = 75.0,
+) -> np.ndarray:
+    """
+    R spectrum of a double-leaf wall (notebook model 'wood_rigid'), shape (..., n_freqs).
+    m1, m2 : surface masses of the leaves [kg/m2], cavity : leaf spacing [m].
+    Below the mass-air-mass resonance the wall follows the mass law of m1 + m2;
+    above, the leaves add up with the cavity term. The rigid lattice ribs cap R at bridge_limit.
+    Walls without cavity (cavity <= 0) follow the mass law of m1 + m2.
+    """
+    m1 = np.asarray(m1, dtype=float)
+    m2 = np.asarray(m2, dtype=float)
+    cavity = np.asarray(cavity, dtype=float)
+    double = (cavity > 0) & (m1 > 0) & (m2 > 0)
+    m1_safe, m2_safe = np.where(double, m1, 1.0), np.where(double, m2, 1.0)
+    cavity_safe = np.where(double, cavity, 1.0)
+    f0 = np.where(double, mass_spring_mass_frequency(m1_safe, m2_safe, cavity_safe), np.inf)[..., None]
+
+    r_air = mass_law(freqs, m1_safe) + mass_law(freqs, m2_safe) + 20 * np.log10(freqs * cavity_safe[..., None]) - 29
+    r_air = np.where(freqs < f0, mass_law(freqs, m1 + m2), r_air)
+    tau = 10 ** (-r_air / 10) + 10 ** (-bridge_limit / 10)
+    return np.clip(-10 * np.log10(tau), r_min, r_max)
+
+
+def mass_spring_mass_frequency(m1, m2, cavity):
+    """f0 with a porous absorber in the cavity (1.8 rho c^2 stiffness) [Hz]."""
+    return (C_AIR / (2 * np.pi)) * np.sqrt(1.8 * (m1 + m2) / (m1 * m2 * cavity))
+
+
+def single_number_rating(r_spectrum) -> Dict[str, np.ndarray]:
+    """
+    ISO 717-1: Rw, C, Ctr of one or many R spectra (..., 16).
+    The reference curve is moved by 1 dB steps as high as possible while the sum of
+    unfavourable deviations stays <= 32 dB; all candidate shifts are evaluated at once.
+    """
+    r = np.asarray(r_spectrum, dtype=float)
+    curves = REF_CURVE_ISO + _SHIFTS[:, None]                        # (shifts, 16)
+    deviation = np.maximum(curves - r[..., None, :], 0.0).sum(axis=-1)
+    valid = deviation <= MAX_UNFAVOURABLE
+    # deviations grow with the shift: the last valid one wins
+    best = valid.shape[-1] - 1 - np.argmax(valid[..., ::-1], axis=-1)
+    rw = REF_CURVE_ISO[7] + _SHIFTS[best]
+
+    c = -10 * np.log10(np.sum(10 ** ((SPECTRUM_C - r) / 10), axis=-1)) - rw
+    ctr = -10 * np.log10(np.sum(10 ** ((SPECTRUM_CTR - r) / 10), axis=-1)) - rw
+    return {"rw": rw, "c": np.round(c) + 0.0, "ctr": np.round(ctr) + 0.0}
+
+
+def leaf_masses(layer_y_min, layer_y_max, surface_mass, core_range):
+    """
+    Split the surface mass of a stack into the two leaves around the lattice core.
+    Layers inside the core are shared equally (rigid ribs); returns (m1, m2, cavity [m]).
+    Arrays are (batch, n_layers) in mm / kg/m2, core_range is (batch, 2) in mm.
+    """
+    y_mid = 0.5 * (np.asarray(layer_y_min) + np.asarray(layer_y_max))
+    core_min, core_max = core_range[:, :1], core_range[:, 1:]
+    inside = (y_mid > core_min) & (y_mid < core_max)
+    core = np.where(inside, surface_mass, 0.0).sum(axis=-1)
+    m1 = np.where(y_mid <= core_min, surface_mass, 0.0).sum(axis=-1) + 0.5 * core
+    m2 = np.where(y_mid >= core_max, surface_mass, 0.0).sum(axis=-1) + 0.5 * core
+    return m1, m2, (core_range[:, 1] - core_range[:, 0]) / 1000.0
+
+
+__all__ = [
+    "FREQS",
+    "REF_CURVE_ISO",
+    "SPECTRUM_C",
+    "SPECTRUM_CTR",
+    "double_leaf_transmission_loss",
+    "leaf_masses",
+    "mass_law",
+    "mass_spring_mass_frequency",
+    "single_number_rating",
+]
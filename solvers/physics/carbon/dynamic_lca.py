@@ -0,0 +1,209 @@
+"""
+Dynamic LCA: year-by-year carbon of panels (RE2020 dynamic weighting).
+
+The static carbon weight of `lca.py` collapses the end of life into one factor
+(EOL_WEIGHT = 0.578). Here every module is placed on a timeline of `period`
+years (50 by default, the RE2020 reference study period):
+
+- A1-A5 at year 0 and at every replacement of the product,
+- B1-B7 spread evenly over the years (declared over the product lifespan),
+- C1-C4 and D at every replacement (the removed product) and at the end of the period.
+
+A product is replaced every DVR years while the replacement falls before the end
+of the period. Each year is weighted by the radiative forcing of a CO2 pulse left
+within the 100 year horizon (Bern carbon cycle, IPCC AR5), the curve behind RE2020:
+
+    w(t) = AGWP(H - t) / AGWP(H),  w(0) = 1, w(50) = 0.578
+
+Product timelines are built once per FDES product and the panels are a matrix
+product with the takeoff quantities, so hundreds of assemblies cost one einsum:
+
+    res = panel_dynamic_lca(buildups)
+    res.cumulative_weighted[:, -1]     # per panel, equals the static carbon weight + B
+    res.portfolio()                    # yearly totals of the batch
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from core.src.takeoff import Takeoff, quantity_takeoff
+
+from .fdes import CarbonDatabase, get_database
+from .lca import ProductMapping, product_quantities
+
+REFERENCE_PERIOD = 50   # [years]
+TIME_HORIZON = 100      # [years]
+
+# Bern carbon cycle impulse response of CO2 (IPCC AR5): a0 + sum a_i exp(-t / tau_i)
+BERN_A0 = 0.2173
+BERN_A = np.array([0.2240, 0.2824, 0.2763])
+BERN_TAU = np.array([394.4, 36.54, 4.304])   # [years]
+
+STAGES = ("A1-A5", "B1-B7", "C1-C4", "D")
+
+
+def co2_forcing_integral(years) -> np.ndarray:
+    """Time integral of the CO2 impulse response over `years` (AGWP up to the radiative efficiency)."""
+    t = np.asarray(years, dtype=float)[..., None]
+    return BERN_A0 * t[..., 0] + np.sum(BERN_A * BERN_TAU * (1.0 - np.exp(-t / BERN_TAU)), axis=-1)
+
+
+def weighting_curve(years, horizon: float = TIME_HORIZON) -> np.ndarray:
+    """Weight of an emission at each year: share of its forcing left within the horizon."""
+    years = np.asarray(years, dtype=float)
+    if np.any(years < 0) or np.any(years > horizon):
+        raise ValueError(f"Emission years must lie between 0 and the horizon ({horizon}).")
+    return co2_forcing_integral(horizon - years) / co2_forcing_integral(horizon)
+
+
+def product_timelines(db: CarbonDatabase, rows: np.ndarray, period: int = REFERENCE_PERIOD) -> np.ndarray:
+    """
+    Emissions per declared unit of the products `rows` on years 0..period, shape
+    (products, stages, period + 1), stages in STAGES order.
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    years = period + 1
+    life = db.lifespans[rows]
+    life = np.where(np.isfinite(life) & (life > 0), life, np.inf)
+
+    # replacement years: k * DVR before the end of the period
+    renewals = np.zeros((len(rows), years))
+    finite = np.isfinite(life)
+    if finite.any():
+        k = np.arange(1, int(np.ceil(period / life[finite].min())) + 1)
+        when = life[:, None] * k
+        product, step = np.nonzero(when < period)
+        np.add.at(renewals, (product, np.rint(when[product, step]).astype(np.int64)), 1.0)
+    installed = renewals.copy()
+    installed[:, 0] += 1.0
+    removed = renewals.copy()
+    removed[:, period] += 1.0
+
+    timeline = np.zeros((len(rows), len(STAGES), years))
+    timeline[:, 0] = db.a1_a5[rows, None] * installed
+    timeline[:, 1, 1:] = (db.b1_b7[rows] / np.where(finite, life, period))[:, None]
+    timeline[:, 2] = db.c1_c4[rows, None] * removed
+    timeline[:, 3] = db.d[rows, None] * removed
+    return timeline
+
+
+@dataclass
+class DynamicLcaResult:
+    panel_ids: List[str]
+    years: np.ndarray        # (years,) 0..period
+    emissions: np.ndarray    # (panels, stages, years) [kgCO2eq], stages in STAGES order
+    weights: np.ndarray      # (years,) dynamic weighting
+    net_area: np.ndarray     # (panels,) [m2]
+
+    @property
+    def annual(self) -> np.ndarray:
+        """(panels, years) emissions of every year [kgCO2eq]."""
+        return self.emissions.sum(axis=1)
+
+    @property
+    def cumulative(self) -> np.ndarray:
+        return np.cumsum(self.annual, axis=-1)
+
+    @property
+    def weighted(self) -> np.ndarray:
+        return self.annual * self.weights
+
+    @property
+    def cumulative_weighted(self) -> np.ndarray:
+        return np.cumsum(self.weighted, axis=-1)
+
+    @property
+    def carbon_weight(self) -> np.ndarray:
+        """(panels,) weighted total over the period [kgCO2eq]."""
+        return self.weighted.sum(axis=-1)
+
+    @property
+    def carbon_weight_per_m2(self) -> np.ndarray:
+        return self.carbon_weight / self.net_area
+
+    def stage(self, name: str) -> np.ndarray:
+        """(panels, years) emissions of one stage (A1-A5, B1-B7, C1-C4, D)."""
+        if name not in STAGES:
+            raise ValueError(f"Unknown stage '{name}', expected one of {list(STAGES)}.")
+        return self.emissions[:, STAGES.index(name)]
+
+    def portfolio(self) -> Dict[str, np.ndarray]:
+        """Yearly series summed over all panels."""
+        annual = self.annual.sum(axis=0)
+        return {
+            "year": self.years,
+            "emissions": annual,
+            "cumulative": np.cumsum(annual),
+            "weighted": annual * self.weights,
+            "cumulative_weighted": np.cumsum(annual * self.weights),
+        }
+
+    def as_records(self) -> List[Dict]:
+        """One row per panel and year (for pandas)."""
+        annual, cumulative = self.annual, self.cumulative
+        weighted, cumulative_weighted = self.weighted, self.cumulative_weighted
+        return [
+            {
+                "panel_id": pid,
+                "year": int(year),
+                "emissions": float(annual[p, t]),
+                "cumulative": float(cumulative[p, t]),
+                "weighted": float(weighted[p, t]),
+                "cumulative_weighted": float(cumulative_weighted[p, t]),
+            }
+            for p, pid in enumerate(self.panel_ids)
+            for t, year in enumerate(self.years)
+        ]
+
+
+def takeoff_dynamic_lca(
+    takeoff: Takeoff,
+    db: CarbonDatabase = None,
+    products: Dict[str, ProductMapping] = None,
+    lattice_as_system: bool = True,
+    period: int = REFERENCE_PERIOD,
+    horizon: float = TIME_HORIZON,
+) -> DynamicLcaResult:
+    if not 0 < period <= horizon:
+        raise ValueError(f"period must be between 1 and the horizon ({horizon} years).")
+    db = get_database() if db is None else db
+    quantities, names, _ = product_quantities(takeoff, db, products, lattice_as_system)
+    timelines = product_timelines(db, db.lookup_many(names), int(period))
+    years = np.arange(int(period) + 1)
+    return DynamicLcaResult(
+        panel_ids=takeoff.panel_ids,
+        years=years,
+        emissions=np.einsum("np,pst->nst", quantities, timelines),
+        weights=weighting_curve(years, horizon),
+        net_area=takeoff.net_area,
+    )
+
+
+def panel_dynamic_lca(
+    buildups: Sequence,
+    db: CarbonDatabase = None,
+    products: Dict[str, ProductMapping] = None,
+    lattice_materials: Dict[str, str] = None,
+    lattice_as_system: bool = True,
+    period: int = REFERENCE_PERIOD,
+    horizon: float = TIME_HORIZON,
+) -> DynamicLcaResult:
+    """Yearly carbon of every WallBuildUp (whole panel, openings deducted)."""
+    return takeoff_dynamic_lca(
+        quantity_takeoff(buildups, lattice_materials), db, products, lattice_as_system, period, horizon
+    )
+
+
+__all__ = [
+    "DynamicLcaResult",
+    "REFERENCE_PERIOD",
+    "STAGES",
+    "TIME_HORIZON",
+    "co2_forcing_integral",
+    "panel_dynamic_lca",
+    "product_timelines",
+    "takeoff_dynamic_lca",
+    "weighting_curve",
+]
@@ -0,0 +1,256 @@
+"""
+FDES Carbon Database (INIES extract, `db_carbon.xlsx`).
+
+The two sheets of the workbook ('UF' and 'indicateur') are parsed once,
+normalised (units, decimal commas, lifespans, product names) and stored as
+per-unit arrays. The result is cached next to the workbook in a `.npz` file
+that is rebuilt when the workbook changes (mtime, then content hash).
+
+Every impact is expressed per 1 declared unit ('m2' or 'm3', see `unit`).
+"""
+from __future__ import annotations
+import hashlib
+import os
+import re
+from dataclasses import dataclass
+from typing import Dict, Sequence
+
+import numpy as np
+
+DEFAULT_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "db_carbon.xlsx")
+CACHE_VERSION = 3
+
+# RE2020 weighting of the end of life modules (static component method)
+EOL_WEIGHT = 0.578
+
+NAME_COLUMN = "Nom du produit"
+UNIT_COLUMN = "Quantité"
+LIFESPAN_COLUMN = "Durée de vie de référence (DVR)"
+BIOGENIC_COLUMN = "Carbone biogénqiue stocké (kg eq. de CO2)"
+
+# Life cycle modules, in sheet order
+MODULES = {
+    "A1-A3": "A1 / A2 / A3",
+    "A4": "A4 Transport",
+    "A5": "A5 Installation",
+    "B1": "B1 Utilisation",
+    "B2": "B2 Maintenance",
+    "B3": "B3 Réparation",
+    "B4": "B4 Remplacement",
+    "B5": "B5 Réhabilitation",
+    "B6": "B6 Utilisation de l'énergie",
+    "B7": "B7 Utilisation de l'eau",
+    "C1": "C1 Déconstruction / démoliton",
+    "C2": "C2 Transport",
+    "C3": "C3 Traitement des déchets",
+    "C4": "C4 Élimination",
+    "D": "D Bénéfices et charges au-delà des frontières du système",
+}
+MODULE_KEYS = list(MODULES)
+_A = slice(0, 3)
+_B = slice(3, 10)
+_C = slice(10, 14)
+_D = 14
+
+
+def normalize_name(name) -> str:
+    """Product names differ in whitespace between the two sheets."""
+    return " ".join(str(name).split())
+
+
+def to_float(value, default: float = np.nan) -> float:
+    """'1,5' / '1.5' / 1.5 -> 1.5 ; empty or text -> default."""
+    if value is None:
+        return default
+    if isinstance(value, (int, float, np.number)):
+        return default if np.isnan(value) else float(value)
+    match = re.search(r"[-+]?\d+(?:[.,]\d+)?(?:[eE][-+]?\d+)?", str(value))
+    return float(match.group(0).replace(",", ".")) if match else default
+
+
+def parse_unit(value) -> tuple:
+    """'m²' / 'm2' / '1 m3' / '0,5 m3' -> (unit, reference quantity)."""
+    text = str(value).strip().lower().replace("²", "2").replace("³", "3")
+    unit = "m3" if "m3" in text else "m2" if "m2" in text else text
+    quantity = to_float(text.replace(unit, " "), default=1.0)
+    return unit, quantity if quantity > 0 else 1.0
+
+
+@dataclass(frozen=True)
+class FdesProduct:
+    name: str
+    unit: str
+    lifespan: float          # [years]
+    modules: Dict[str, float]  # kgCO2eq per unit
+    biogenic: float          # kgCO2eq stored per unit
+
+    @property
+    def a1_a5(self) -> float:
+        return self.modules["A1-A3"] + self.modules["A4"] + self.modules["A5"]
+
+    @property
+    def c1_c4(self) -> float:
+        return sum(self.modules[k] for k in ("C1", "C2", "C3", "C4"))
+
+    @property
+    def d(self) -> float:
+        return self.modules["D"]
+
+    @property
+    def carbon_weight(self) -> float:
+        return self.a1_a5 + EOL_WEIGHT * (self.c1_c4 + self.d)
+
+    def as_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "unit": self.unit,
+            "lifespan": self.lifespan,
+            "a1_a5": self.a1_a5,
+            "c1_c4": self.c1_c4,
+            "d": self.d,
+            "biogenic": self.biogenic,
+            **self.modules,
+        }
+
+
+class CarbonDatabase:
+    """Per-unit FDES factors as arrays, indexed by product name."""
+
+    def __init__(self, names, units, lifespans, modules, biogenic):
+        self.names = np.asarray(names, dtype=str)
+        self.units = np.asarray(units, dtype=str)
+        self.lifespans = np.asarray(lifespans, dtype=float)
+        self.modules = np.asarray(modules, dtype=float)       # (products, 15)
+        self.biogenic = np.asarray(biogenic, dtype=float)
+        self.index = {name: n for n, name in enumerate(self.names)}
+
+        self.a1_a5 = self.modules[:, _A].sum(axis=1)
+        self.b1_b7 = self.modules[:, _B].sum(axis=1)
+        self.c1_c4 = self.modules[:, _C].sum(axis=1)
+        self.d = self.modules[:, _D]
+        self.carbon_weight = self.a1_a5 + EOL_WEIGHT * (self.c1_c4 + self.d)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name) -> bool:
+        return normalize_name(name) in self.index
+
+    def lookup(self, name) -> int:
+        try:
+            return self.index[normalize_name(name)]
+        except KeyError:
+            raise ValueError(f"Product '{name}' not found in the FDES database.") from None
+
+    def lookup_many(self, names: Sequence[str]) -> np.ndarray:
+        return np.array([self.lookup(name) for name in names], dtype=np.int64)
+
+    def product(self, name) -> FdesProduct:
+        n = self.lookup(name)
+        return FdesProduct(
+            name=str(self.names[n]),
+            unit=str(self.units[n]),
+            lifespan=float(self.lifespans[n]),
+            modules=dict(zip(MODULE_KEYS, self.modules[n].tolist())),
+            biogenic=float(self.biogenic[n]),
+        )
+
+    # ------------------------------------------------------------------ I/O
+
+    @classmethod
+    def from_excel(cls, path: str = DEFAULT_DB) -> "CarbonDatabase":
+        import pandas as pd
+
+        df_uf = pd.read_excel(path, sheet_name="UF")
+        df_gwp = pd.read_excel(path, sheet_name="indicateur")
+
+        gwp_rows = {normalize_name(name): n for n, name in enumerate(df_gwp[NAME_COLUMN])}
+        gwp_values = np.array(
+            [[to_float(v, default=0.0) for v in df_gwp[col]] for col in MODULES.values()]
+        ).T
+
+        names, units, lifespans, modules, biogenic = [], [], [], [], []
+        for _, row in df_uf.iterrows():
+            name = normalize_name(row[NAME_COLUMN])
+            if name not in gwp_rows:
+                raise ValueError(f"Product '{name}' has no row in the 'indicateur' sheet.")
+            unit, quantity = parse_unit(row[UNIT_COLUMN])
+            names.append(name)
+            units.append(unit)
+            lifespans.append(to_float(row[LIFESPAN_COLUMN]))
+            modules.append(gwp_values[gwp_rows[name]] / quantity)
+            biogenic.append(to_float(row.get(BIOGENIC_COLUMN), default=0.0) / quantity)
+        return cls(names, units, lifespans, np.array(modules).reshape(-1, len(MODULES)), biogenic)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_DB, cache: bool = True) -> "CarbonDatabase":
+        """Workbook -> database, through the `.npz` cache when it is still valid."""
+        if not cache:
+            return cls.from_excel(path)
+
+        cache_path = os.path.splitext(path)[0] + ".cache.npz"
+        mtime = os.path.getmtime(path)
+        digest = db = None
+        if os.path.exists(cache_path):
+            with np.load(cache_path) as data:
+                if int(data["version"]) == CACHE_VERSION:
+                    fresh = float(data["mtime"]) == mtime
+                    if not fresh:
+                        digest = _file_hash(path)
+                    if fresh or str(data["hash"]) == digest:
+                        db = cls(data["names"], data["units"], data["lifespans"], data["modules"], data["biogenic"])
+            if db is not None:
+                if digest is not None:
+                    # same content, touched workbook: store the new mtime to skip the hash next time
+                    db._write_cache(cache_path, mtime, digest)
+                return db
+
+        db = cls.from_excel(path)
+        db._write_cache(cache_path, mtime, digest or _file_hash(path))
+        return db
+
+    def _write_cache(self, cache_path: str, mtime: float, digest: str) -> None:
+        np.savez(
+            cache_path,
+            version=CACHE_VERSION,
+            mtime=mtime,
+            hash=digest,
+            names=self.names,
+            units=self.units,
+            lifespans=self.lifespans,
+            modules=self.modules,
+            biogenic=self.biogenic,
+        )
+
+
+def _file_hash(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+_DATABASES: Dict[str, CarbonDatabase] = {}
+
+
+def get_database(path: str = DEFAULT_DB) -> CarbonDatabase:
+    """Process-wide instance, the workbook is only read the first time."""
+    path = os.path.abspath(path)
+    if path not in _DATABASES:
+        _DATABASES[path] = CarbonDatabase.load(path)
+    return _DATABASES[path]
+
+
+__all__ = [
+    "DEFAULT_DB",
+    "EOL_WEIGHT",
+    "MODULES",
+    "MODULE_KEYS",
+    "CarbonDatabase",
+    "FdesProduct",
+    "get_database",
+    "normalize_name",
+    "parse_unit",
+    "to_float",
+]
@@ -0,0 +1,231 @@
+"""
+Panel LCA from the quantity takeoff (RE2020 static component method).
+
+The net volumes / areas of `core.src.takeoff` are mapped to FDES products and
+converted to the declared unit of each product, giving a quantity matrix
+Q (panels, products). Every indicator is then a single product with the
+per-unit factors of the database:
+
+    Carbon Weight = Q @ A1-A5 + 0.578 * Q @ (C1-C4 + D)
+
+The lattice core is declared as a wall system ('Mur en bois <panel_type>', per m2),
+so its slats and insulation are counted through the net panel area instead of
+per material when that product exists.
+
+Materials without a product mapping are left out of the indicators; their
+volume is reported (`unmapped`, `unmapped_volume`) and a warning is issued.
+"""
+from __future__ import annotations
+import warnings
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from core.src.takeoff import Takeoff, quantity_takeoff
+
+from .fdes import EOL_WEIGHT, CarbonDatabase, get_database
+
+LATTICE_PRODUCT = "Mur en bois {panel_type}"
+
+
+@dataclass(frozen=True)
+class ProductMapping:
+    product: str
+    reference_thickness: float = None  # [m], m2 products declared for a given thickness
+
+
+# Material names of core.src.materials -> FDES product
+DEFAULT_PRODUCTS: Dict[str, ProductMapping] = {
+    "Douglas": ProductMapping("Bois massif abouté Schilliger, fabriqué en France"),
+    "Spruce": ProductMapping("Bois massif abouté Schilliger, fabriqué en France"),
+    "CLT": ProductMapping("Panneau CLT (lamellé-croisé), fabriqué en France"),
+    "Wood Fibre": ProductMapping("Gutex Thermoflex® [100mm]", 0.100),
+    "Laine de bois": ProductMapping("STEICO flex F [100mm]", 0.100),
+    "Mineral Wool": ProductMapping("Knauf Insulation laine de verre ECOSE® TP 238 60 mm", 0.060),
+    "Concrete": ProductMapping("Mur extérieur en béton d'épaisseur 0.18 m, C25/30 XC4 / XF1 CEM II/A", 0.180),
+}
+
+
+@dataclass
+class LcaResult:
+    panel_ids: List[str]
+    products: List[str]
+    quantities: np.ndarray   # (panels, products) in the declared unit of each product
+    a1_a5: np.ndarray        # (panels,) [kgCO2eq]
+    c1_c4: np.ndarray
+    d: np.ndarray
+    biogenic: np.ndarray     # stored biogenic carbon [kgCO2eq]
+    net_area: np.ndarray     # [m2]
+    unmapped: Dict[str, float]  # material -> volume without FDES product [m3]
+    unmapped_volume: np.ndarray  # (panels,) volume left out of the indicators [m3]
+
+    @property
+    def carbon_weight(self) -> np.ndarray:
+        return self.a1_a5 + EOL_WEIGHT * (self.c1_c4 + self.d)
+
+    @property
+    def carbon_weight_per_m2(self) -> np.ndarray:
+        return self.carbon_weight / self.net_area
+
+    def building(self) -> Dict[str, float]:
+        """Totals over all panels."""
+        area = float(self.net_area.sum())
+        weight = float(self.carbon_weight.sum())
+        return {
+            "net_area": area,
+            "a1_a5": float(self.a1_a5.sum()),
+            "c1_c4": float(self.c1_c4.sum()),
+            "d": float(self.d.sum()),
+            "biogenic": float(self.biogenic.sum()),
+            "carbon_weight": weight,
+            "carbon_weight_per_m2": weight / area if area > 0 else 0.0,
+        }
+
+    def as_records(self) -> List[Dict]:
+        """One row per panel (for pandas)."""
+        weight, per_m2 = self.carbon_weight, self.carbon_weight_per_m2
+        return [
+            {
+                "panel_id": pid,
+                "net_area": self.net_area[p],
+                "a1_a5": self.a1_a5[p],
+                "c1_c4": self.c1_c4[p],
+                "d": self.d[p],
+                "biogenic": self.biogenic[p],
+                "carbon_weight": weight[p],
+                "carbon_weight_per_m2": per_m2[p],
+                "unmapped_volume": self.unmapped_volume[p],
+            }
+            for p, pid in enumerate(self.panel_ids)
+        ]
+
+
+def product_quantities(
+    takeoff: Takeoff,
+    db: CarbonDatabase,
+    products: Dict[str, ProductMapping] = None,
+    lattice_as_system: bool = True,
+):
+    """
+    Quantity matrix (panels, products) in declared units, the product names and the
+    volume of every material without product mapping, per panel {material: (panels,) [m3]}.
+    """
+    products = DEFAULT_PRODUCTS if products is None else products
+    n_panels = len(takeoff.panel_ids)
+
+    # lattice cores declared as a wall system per m2 of net area
+    system = np.zeros(n_panels, dtype=bool)
+    columns: Dict[str, int] = {}
+    lattice_rows, lattice_cols = [], []
+    if lattice_as_system:
+        for p, panel_type in enumerate(takeoff.panel_types):
+            name = LATTICE_PRODUCT.format(panel_type=panel_type)
+            if panel_type and name in db:
+                system[p] = True
+                lattice_rows.append(p)
+                lattice_cols.append(columns.setdefault(name, len(columns)))
+
+    volume = takeoff.volume - np.where(system[:, None], takeoff.lattice_volume, 0.0)
+    area = takeoff.area - np.where(system[:, None], takeoff.lattice_area, 0.0)
+
+    # material -> product conversion matrices
+    n_materials = len(takeoff.materials)
+    conversions = []   # (material, column, from volume?, factor)
+    unmapped: Dict[str, np.ndarray] = {}
+    for m, material in enumerate(takeoff.materials):
+        mapping = products.get(material)
+        if mapping is None:
+            if volume[:, m].sum() > 0:
+                unmapped[material] = volume[:, m]
+                warnings.warn(
+                    f"Material '{material}' has no FDES product mapping, "
+                    f"{volume[:, m].sum():.3f} m3 left out of the carbon indicators.",
+                    stacklevel=2,
+                )
+            continue
+        product = db.product(mapping.product)
+        column = columns.setdefault(product.name, len(columns))
+        if product.unit == "m3":
+            conversions.append((m, column, True, 1.0))
+        elif mapping.reference_thickness:
+            conversions.append((m, column, True, 1.0 / mapping.reference_thickness))
+        else:
+            conversions.append((m, column, False, 1.0))
+
+    names = list(columns)
+    from_volume = np.zeros((n_materials, len(names)))
+    from_area = np.zeros((n_materials, len(names)))
+    for m, column, use_volume, factor in conversions:
+        (from_volume if use_volume else from_area)[m, column] = factor
+
+    quantities = volume @ from_volume + area @ from_area
+    quantities[lattice_rows, lattice_cols] += takeoff.net_area[lattice_rows]
+    return quantities, names, unmapped
+
+
+def material_factors(
+    material: str,
+    db: CarbonDatabase,
+    products: Dict[str, ProductMapping] = None,
+    indicator: str = "carbon_weight",
+):
+    """
+    Indicator of one material per m3 and per m2 of face area (one of them is 0),
+    0 for materials without FDES product. Used by nominal (1 m2) estimates.
+    """
+    mapping = (DEFAULT_PRODUCTS if products is None else products).get(material)
+    if mapping is None:
+        return 0.0, 0.0
+    value = float(getattr(db, indicator)[db.lookup(mapping.product)])
+    if db.units[db.lookup(mapping.product)] == "m3":
+        return value, 0.0
+    if mapping.reference_thickness:
+        return value / mapping.reference_thickness, 0.0
+    return 0.0, value
+
+
+def takeoff_lca(
+    takeoff: Takeoff,
+    db: CarbonDatabase = None,
+    products: Dict[str, ProductMapping] = None,
+    lattice_as_system: bool = True,
+) -> LcaResult:
+    db = get_database() if db is None else db
+    quantities, names, unmapped = product_quantities(takeoff, db, products, lattice_as_system)
+    rows = db.lookup_many(names)
+    return LcaResult(
+        panel_ids=takeoff.panel_ids,
+        products=names,
+        quantities=quantities,
+        a1_a5=quantities @ db.a1_a5[rows],
+        c1_c4=quantities @ db.c1_c4[rows],
+        d=quantities @ db.d[rows],
+        biogenic=quantities @ db.biogenic[rows],
+        net_area=takeoff.net_area,
+        unmapped={material: float(v.sum()) for material, v in unmapped.items()},
+        unmapped_volume=sum(unmapped.values(), np.zeros(len(takeoff.panel_ids))),
+    )
+
+
+def panel_lca(
+    buildups: Sequence,
+    db: CarbonDatabase = None,
+    products: Dict[str, ProductMapping] = None,
+    lattice_materials: Dict[str, str] = None,
+    lattice_as_system: bool = True,
+) -> LcaResult:
+    """Carbon weight of every WallBuildUp (whole panel, openings deducted)."""
+    return takeoff_lca(quantity_takeoff(buildups, lattice_materials), db, products, lattice_as_system)
+
+
+__all__ = [
+    "DEFAULT_PRODUCTS",
+    "LATTICE_PRODUCT",
+    "LcaResult",
+    "ProductMapping",
+    "material_factors",
+    "panel_lca",
+    "product_quantities",
+    "takeoff_lca",
+]
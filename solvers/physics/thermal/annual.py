@@ -0,0 +1,252 @@
+"""
+Annual Hourly Thermal Response (multi-harmonic ISO 13786).
+
+The exterior sol-air temperature of a whole year (EPW or CSV climate file)
+is decomposed by FFT and every harmonic is multiplied by the periodic
+thermal transmittance Y12 of the walls (transfer-matrix model), so a full
+year for many walls costs a handful of FFTs instead of an hourly loop.
+
+Two modes
+- chunk_hours=None : the year is treated as one period (single FFT).
+- chunk_hours=N    : the wall impulse response is convolved chunk by chunk
+                     (overlap-add), memory stays proportional to N.
+
+The interior air temperature is held constant; heat flux is positive into the room.
+"""
+from __future__ import annotations
+import csv
+from dataclasses import dataclass
+from typing import Dict, Iterator, Sequence, Tuple
+
+import numpy as np
+
+from core.src.stack import get_layer_stack, stack_arrays
+
+from .transfer_matrix import RSE, RSI, wall_transfer_matrix
+
+HOUR = 3600.0  # [s]
+
+
+@dataclass
+class ClimateSeries:
+    temperature: np.ndarray  # exterior air [degC]
+    solar: np.ndarray        # irradiance on the facade [W/m2]
+    timestep: float = HOUR   # [s]
+
+    def sol_air_temperature(self, absorptance: float = 0.6, rse: float = RSE) -> np.ndarray:
+        """theta_sa = theta_e + alpha * I * Rse"""
+        return self.temperature + absorptance * self.solar * rse
+
+
+def read_climate(
+    path: str,
+    temperature_column: str = "temperature",
+    solar_column: str = "solar",
+) -> ClimateSeries:
+    """
+    Read an hourly climate file.
+    - .epw : dry bulb temperature (field 7) and global horizontal irradiance (field 14)
+    - .csv : header row, columns named by temperature_column / solar_column
+    """
+    if str(path).lower().endswith(".epw"):
+        data = np.loadtxt(path, delimiter=",", skiprows=8, usecols=(6, 13), ndmin=2)
+        return ClimateSeries(temperature=data[:, 0], solar=data[:, 1])
+
+    with open(path, newline="") as f:
+        header = next(csv.reader(f))
+    header = [name.strip() for name in header]
+    for name in (temperature_column, solar_column):
+        if name not in header:
+            raise ValueError(f"Column '{name}' not found in {path}.")
+    data = np.loadtxt(
+        path,
+        delimiter=",",
+        skiprows=1,
+        usecols=(header.index(temperature_column), header.index(solar_column)),
+        ndmin=2,
+    )
+    return ClimateSeries(temperature=data[:, 0], solar=data[:, 1])
+
+
+def periodic_transmittance(
+    thickness,
+    conductivity,
+    density,
+    heat_capacity,
+    n_samples: int,
+    timestep: float = HOUR,
+    rsi: float = RSI,
+    rse: float = RSE,
+) -> np.ndarray:
+    """
+    Y12 of every wall on the rfft frequencies of an n_samples period, shape (walls, n//2 + 1).
+    Identical layer stacks are evaluated once.
+    """
+    layers = np.stack(
+        np.broadcast_arrays(
+            *(np.asarray(a, dtype=float) for a in (thickness, conductivity, density, heat_capacity))
+        ),
+        axis=-1,
+    )
+    unique, inverse = np.unique(layers.reshape(len(layers), -1), axis=0, return_inverse=True)
+    unique = unique.reshape((-1,) + layers.shape[1:])
+
+    k = np.arange(n_samples // 2 + 1)
+    with np.errstate(divide="ignore"):
+        periods = n_samples * timestep / k          # k = 0 -> inf (steady state)
+    z = wall_transfer_matrix(
+        unique[:, None, :, 0],
+        unique[:, None, :, 1],
+        unique[:, None, :, 2],
+        unique[:, None, :, 3],
+        periods[None, :],
+        rsi,
+        rse,
+    )
+    return (-1.0 / z[..., 0, 1])[inverse.ravel()]
+
+
+def impulse_response(y12: np.ndarray, n_samples: int) -> np.ndarray:
+    """Hourly response factors of the walls (sum = U), shape (walls, n_samples)."""
+    return np.fft.irfft(y12, n=n_samples, axis=-1)
+
+
+def iter_response(
+    thickness,
+    conductivity,
+    density,
+    heat_capacity,
+    exterior: np.ndarray,
+    t_int: float = 20.0,
+    chunk_hours: int = 24 * 30,
+    response_hours: int = 24 * 28,
+    timestep: float = HOUR,
+    rsi: float = RSI,
+    rse: float = RSE,
+) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    Stream the interior heat flux [W/m2] chunk by chunk: yields (start index, (walls, chunk)).
+    The series is assumed periodic (the year wraps), the last response_hours warm the walls up.
+    """
+    exterior = np.asarray(exterior, dtype=float)
+    n = exterior.shape[-1]
+    h = impulse_response(
+        periodic_transmittance(
+            thickness, conductivity, density, heat_capacity, response_hours, timestep, rsi, rse
+        ),
+        response_hours,
+    )
+    u_value = h.sum(axis=-1, keepdims=True)
+    n_fft = 1 << int(np.ceil(np.log2(chunk_hours + response_hours - 1)))
+    h_f = np.fft.rfft(h, n=n_fft, axis=-1)
+
+    warmup = min(response_hours, n)
+    series = np.concatenate([exterior[..., n - warmup:], exterior], axis=-1)
+    tail = np.zeros(h.shape[:-1] + (response_hours - 1,))
+
+    for start in range(0, series.shape[-1], chunk_hours):
+        block = series[..., start:start + chunk_hours]
+        out = np.fft.irfft(np.fft.rfft(block, n=n_fft, axis=-1) * h_f, n=n_fft, axis=-1)
+        length = block.shape[-1]
+        out[..., :response_hours - 1] += tail
+        tail = out[..., length:length + response_hours - 1].copy()
+        flux = out[..., :length] - u_value * t_int
+
+        # drop the warm-up part
+        first = start - warmup
+        if first + length <= 0:
+            continue
+        if first < 0:
+            flux = flux[..., -first:]
+            first = 0
+        yield first, flux
+
+
+@dataclass
+class AnnualResponse:
+    heat_flux: np.ndarray            # (walls, hours) [W/m2], positive into the room
+    surface_temperature: np.ndarray  # (walls, hours) [degC]
+
+    def as_dict(self) -> Dict[str, np.ndarray]:
+        return {
+            "peak_heat_flux": self.heat_flux.max(axis=-1),
+            "mean_heat_flux": self.heat_flux.mean(axis=-1),
+            "max_surface_temperature": self.surface_temperature.max(axis=-1),
+            "hour_of_max_surface_temperature": self.surface_temperature.argmax(axis=-1),
+        }
+
+
+def annual_response(
+    thickness,
+    conductivity,
+    density,
+    heat_capacity,
+    exterior: np.ndarray,
+    t_int: float = 20.0,
+    chunk_hours: int = None,
+    response_hours: int = 24 * 28,
+    timestep: float = HOUR,
+    rsi: float = RSI,
+    rse: float = RSE,
+) -> AnnualResponse:
+    """
+    Interior-surface heat flux and temperature of a batch of walls (layer axis last,
+    SI units) for an exterior (sol-air) temperature series.
+    """
+    exterior = np.asarray(exterior, dtype=float)
+    n = exterior.shape[-1]
+    n_walls = np.shape(thickness)[0]
+
+    if chunk_hours is None:
+        y12 = periodic_transmittance(thickness, conductivity, density, heat_capacity, n, timestep, rsi, rse)
+        spectrum = np.fft.rfft(exterior, axis=-1)
+        flux = np.fft.irfft(y12 * spectrum, n=n, axis=-1) - y12[:, :1].real * t_int
+    else:
+        flux = np.empty((n_walls, n))
+        for start, block in iter_response(
+            thickness, conductivity, density, heat_capacity, exterior,
+            t_int, chunk_hours, response_hours, timestep, rsi, rse,
+        ):
+            flux[:, start:start + block.shape[-1]] = block
+
+    return AnnualResponse(heat_flux=flux, surface_temperature=t_int + rsi * flux)
+
+
+def buildup_annual_response(
+    buildups: Sequence,
+    climate: ClimateSeries,
+    t_int: float = 20.0,
+    absorptance: float = 0.6,
+    chunk_hours: int = None,
+    rsi: float = RSI,
+    rse: float = RSE,
+    materials=None,
+    lattice_materials=None,
+) -> AnnualResponse:
+    """Annual response of WallBuildUp objects to a climate series."""
+    stacks = [get_layer_stack(b, lattice_materials) for b in buildups]
+    arrays = stack_arrays(stacks, materials)
+    return annual_response(
+        arrays["thickness"] / 1000.0,
+        arrays["conductivity"],
+        arrays["density"],
+        arrays["heat_capacity"],
+        climate.sol_air_temperature(absorptance, rse),
+        t_int=t_int,
+        chunk_hours=chunk_hours,
+        timestep=climate.timestep,
+        rsi=rsi,
+        rse=rse,
+    )
+
+
+__all__ = [
+    "AnnualResponse",
+    "ClimateSeries",
+    "annual_response",
+    "buildup_annual_response",
+    "impulse_response",
+    "iter_response",
+    "periodic_transmittance",
+    "read_climate",
+]
@@ -0,0 +1,299 @@
+"""
+2D Steady-State Thermal Bridge Solver (ISO 10211 style).
+
+The section produced by `fig_section_view` (same element filtering, see
+`section_elements`) is rasterised on a rectilinear grid whose lines follow
+every element edge, then solved as a finite-volume conduction problem with
+a `scipy.sparse` matrix.
+
+Conventions
+- u axis = wall thickness (y), interior at u_min; v axis = z (vertical cut) or x (horizontal cut).
+- Results are per metre run of the section (perpendicular to the cut plane).
+- Rows of the section that contain no material (openings) are left out: the
+  reveals are adiabatic. Empty cells inside a row are filled with still air.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, List
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import cg, spsolve
+
+from core.src.materials import LATTICE_MATERIALS, MATERIALS, get_material
+from core.src.wall import SECTION_DEFAULT_CUT, section_elements
+
+from .transfer_matrix import RSE, RSI
+
+try:  # optional, much faster on very large grids
+    import pyamg
+except ImportError:  # pragma: no cover
+    pyamg = None
+
+DIRECT_SOLVER_LIMIT = 250_000  # cells
+
+
+@dataclass
+class SectionGrid:
+    u_lines: np.ndarray       # grid lines across the thickness [mm]
+    v_lines: np.ndarray       # grid lines along the section [mm]
+    conductivity: np.ndarray  # (nv, nu) [W/mK], nan = outside the wall
+
+    @property
+    def shape(self):
+        return self.conductivity.shape
+
+    @property
+    def n_cells(self) -> int:
+        return int(np.count_nonzero(~np.isnan(self.conductivity)))
+
+
+@dataclass
+class BridgeResult:
+    heat_flow: float               # Q [W/m] for the imposed temperature difference
+    coupling: float                # L2D = Q / dT [W/mK]
+    length: float                  # length of wall present in the section [m]
+    u_equivalent: float            # L2D / length [W/m2K]
+    u_parallel: float              # same section, row by row 1D paths [W/m2K]
+    psi: float                     # L2D - U_parallel * length [W/mK]
+    psi_edges: List[Dict]          # one entry per opening edge crossed by the section
+    temperature: np.ndarray        # (nv, nu) [degC], nan outside the wall
+    grid: SectionGrid
+
+    def as_dict(self) -> Dict:
+        return {
+            "heat_flow": self.heat_flow,
+            "coupling": self.coupling,
+            "length": self.length,
+            "u_equivalent": self.u_equivalent,
+            "u_parallel": self.u_parallel,
+            "psi": self.psi,
+            "psi_edges": self.psi_edges,
+            "n_cells": self.grid.n_cells,
+        }
+
+
+def _refine(lines: np.ndarray, max_step: float) -> np.ndarray:
+    steps = np.diff(lines)
+    n_sub = np.maximum(np.ceil(steps / max_step - 1e-9).astype(int), 1)
+    starts = np.repeat(lines[:-1], n_sub)
+    offsets = np.concatenate([np.arange(n) / n for n in n_sub]) if len(n_sub) else np.array([])
+    return np.append(starts + offsets * np.repeat(steps, n_sub), lines[-1])
+
+
+def _unique_lines(values: np.ndarray, tol: float = 1e-6) -> np.ndarray:
+    values = np.sort(values)
+    keep = np.append(True, np.diff(values) > tol)
+    return values[keep]
+
+
+def rasterize_section(
+    buildup,
+    view_type: str = "vertical",
+    cut_pos: float = None,
+    resolution: float = 5.0,
+    materials=None,
+    lattice_materials=None,
+) -> SectionGrid:
+    """Rectilinear grid (lines on every element edge, spacing <= resolution mm) with per-cell lambda."""
+    materials = MATERIALS if materials is None else materials
+    lattice_materials = LATTICE_MATERIALS if lattice_materials is None else lattice_materials
+    if cut_pos is None:
+        cut_pos = SECTION_DEFAULT_CUT[view_type]
+    v_key = "z" if view_type == "vertical" else "x"
+
+    cut = section_elements(buildup, view_type, cut_pos)
+    if not cut:
+        raise ValueError(f"The {view_type} section at {cut_pos} mm crosses no element.")
+
+    rects = np.array(
+        [[el["y_min"], el["y_max"], el[f"{v_key}_min"], el[f"{v_key}_max"]] for el, _ in cut]
+    )
+    lambdas = np.empty(len(cut))
+    for n, (el, layer) in enumerate(cut):
+        if layer is None:
+            name = lattice_materials.get(el["element_type"], el["element_type"])
+        else:
+            name = (layer.materials or {}).get(el["element_type"], el["element_type"])
+        lambdas[n] = get_material(name, materials).conductivity
+
+    u_lines = _refine(_unique_lines(rects[:, :2].ravel()), resolution)
+    v_lines = _refine(_unique_lines(rects[:, 2:].ravel()), resolution)
+
+    grid = np.full((len(v_lines) - 1, len(u_lines) - 1), np.nan)
+    iu0 = np.searchsorted(u_lines, rects[:, 0] - 1e-6)
+    iu1 = np.searchsorted(u_lines, rects[:, 1] - 1e-6)
+    iv0 = np.searchsorted(v_lines, rects[:, 2] - 1e-6)
+    iv1 = np.searchsorted(v_lines, rects[:, 3] - 1e-6)
+    for n in range(len(cut)):
+        grid[iv0[n]:iv1[n], iu0[n]:iu1[n]] = lambdas[n]
+
+    # rows with material: empty cells are an unventilated cavity
+    rows = ~np.all(np.isnan(grid), axis=1)
+    air = get_material("Air", materials).conductivity
+    grid[rows] = np.where(np.isnan(grid[rows]), air, grid[rows])
+
+    return SectionGrid(u_lines=u_lines, v_lines=v_lines, conductivity=grid)
+
+
+def _assemble(grid: SectionGrid, rsi: float, rse: float):
+    lam = grid.conductivity
+    du = np.diff(grid.u_lines) / 1000.0
+    dv = np.diff(grid.v_lines) / 1000.0
+    active = ~np.isnan(lam)
+    index = np.full(lam.shape, -1, dtype=np.int64)
+    index[active] = np.arange(np.count_nonzero(active))
+    n = int(active.sum())
+
+    half_u = du[None, :] / (2.0 * np.where(active, lam, 1.0))   # half-cell resistances
+    half_v = dv[:, None] / (2.0 * np.where(active, lam, 1.0))
+
+    rows, cols, vals = [], [], []
+    diag = np.zeros(n)
+
+    # conductances across the thickness
+    link = active[:, :-1] & active[:, 1:]
+    g = (dv[:, None] / (half_u[:, :-1] + half_u[:, 1:]))[link]
+    a, b = index[:, :-1][link], index[:, 1:][link]
+    rows += [a, b]; cols += [b, a]; vals += [-g, -g]
+    np.add.at(diag, a, g); np.add.at(diag, b, g)
+
+    # conductances along the section
+    link = active[:-1, :] & active[1:, :]
+    g = (du[None, :] / (half_v[:-1, :] + half_v[1:, :]))[link]
+    a, b = index[:-1, :][link], index[1:, :][link]
+    rows += [a, b]; cols += [b, a]; vals += [-g, -g]
+    np.add.at(diag, a, g); np.add.at(diag, b, g)
+
+    # surface films on the interior / exterior faces
+    live = active[:, 0]
+    g_i = np.zeros(lam.shape[0])
+    g_i[live] = dv[live] / (rsi + half_u[live, 0])
+    live_e = active[:, -1]
+    g_e = np.zeros(lam.shape[0])
+    g_e[live_e] = dv[live_e] / (rse + half_u[live_e, -1])
+    np.add.at(diag, index[live, 0], g_i[live])
+    np.add.at(diag, index[live_e, -1], g_e[live_e])
+
+    rows.append(np.arange(n)); cols.append(np.arange(n)); vals.append(diag)
+    matrix = sparse.csr_matrix(
+        (np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))), shape=(n, n)
+    )
+    return matrix, index, g_i, g_e
+
+
+def _solve(matrix, rhs, method: str, tol: float):
+    if method == "auto":
+        method = "direct" if matrix.shape[0] <= DIRECT_SOLVER_LIMIT else ("amg" if pyamg else "cg")
+    if method == "direct":
+        return spsolve(matrix.tocsc(), rhs)
+    if method == "amg":
+        if pyamg is None:
+            raise ValueError("method='amg' requires pyamg.")
+        # classical AMG copes well with the lambda jumps between wood and insulation
+        ml = pyamg.ruge_stuben_solver(matrix)
+        return ml.solve(rhs, tol=tol, accel="cg")
+    if method == "cg":
+        jacobi = sparse.diags(1.0 / matrix.diagonal())
+        x, info = cg(matrix, rhs, rtol=tol, M=jacobi, maxiter=20 * matrix.shape[0])
+        if info != 0:
+            raise RuntimeError(f"CG did not converge (info={info}).")
+        return x
+    raise ValueError(f"Unknown method '{method}'.")
+
+
+def solve_section(
+    grid: SectionGrid,
+    t_int: float = 20.0,
+    t_ext: float = 0.0,
+    rsi: float = RSI,
+    rse: float = RSE,
+    method: str = "auto",
+    tol: float = 1e-8,
+) -> BridgeResult:
+    """
+    Solve the conduction problem on a rasterised section.
+    method: 'direct' (sparse LU), 'cg' (Jacobi-preconditioned CG), 'amg' (pyamg) or 'auto'
+    (direct up to DIRECT_SOLVER_LIMIT cells, AMG-preconditioned CG above when pyamg is installed).
+    """
+    if t_int == t_ext:
+        raise ValueError("t_int and t_ext must differ.")
+    matrix, index, g_i, g_e = _assemble(grid, rsi, rse)
+    lam = grid.conductivity
+    rhs = np.zeros(matrix.shape[0])
+    live_i, live_e = index[:, 0] >= 0, index[:, -1] >= 0
+    np.add.at(rhs, index[live_i, 0], g_i[live_i] * t_int)
+    np.add.at(rhs, index[live_e, -1], g_e[live_e] * t_ext)
+
+    t = _solve(matrix, rhs, method, tol)
+    temperature = np.full(lam.shape, np.nan)
+    temperature[index >= 0] = t[index[index >= 0]]
+
+    dt = t_int - t_ext
+    q_rows = np.zeros(lam.shape[0])
+    q_rows[live_i] = g_i[live_i] * (t_int - temperature[live_i, 0])
+
+    # reference: every row as an independent 1D path (parallel path method)
+    du = np.diff(grid.u_lines) / 1000.0
+    dv = np.diff(grid.v_lines) / 1000.0
+    present = ~np.all(np.isnan(lam), axis=1)
+    r_rows = rsi + rse + np.nansum(du[None, :] / lam, axis=1)
+    q1d_rows = np.where(present, dv / r_rows * dt, 0.0)
+
+    length = float(dv[present].sum())
+    heat_flow = float(q_rows.sum())
+    coupling = heat_flow / dt
+    u_parallel = float(q1d_rows.sum() / dt / length)
+
+    # one zone per opening edge, split half way between consecutive edges
+    v_lines = grid.v_lines
+    change = np.flatnonzero(present[1:] != present[:-1]) + 1
+    edges = v_lines[change]
+    psi_edges: List[Dict] = []
+    if len(edges):
+        centres = 0.5 * (v_lines[:-1] + v_lines[1:])
+        bounds = np.concatenate([[-np.inf], 0.5 * (edges[1:] + edges[:-1]), [np.inf]])
+        zone = np.searchsorted(bounds, centres) - 1
+        dq = np.bincount(zone, weights=q_rows - q1d_rows, minlength=len(edges))
+        for k, pos in enumerate(edges):
+            psi_edges.append({"position": float(pos), "psi": float(dq[k] / dt)})
+
+    return BridgeResult(
+        heat_flow=heat_flow,
+        coupling=coupling,
+        length=length,
+        u_equivalent=coupling / length,
+        u_parallel=u_parallel,
+        psi=coupling - u_parallel * length,
+        psi_edges=psi_edges,
+        temperature=temperature,
+        grid=grid,
+    )
+
+
+def thermal_bridge_section(
+    buildup,
+    view_type: str = "vertical",
+    cut_pos: float = None,
+    resolution: float = 5.0,
+    t_int: float = 20.0,
+    t_ext: float = 0.0,
+    rsi: float = RSI,
+    rse: float = RSE,
+    method: str = "auto",
+    tol: float = 1e-8,
+    materials=None,
+    lattice_materials=None,
+) -> BridgeResult:
+    """Rasterise the section of a WallBuildUp and solve it."""
+    grid = rasterize_section(buildup, view_type, cut_pos, resolution, materials, lattice_materials)
+    return solve_section(grid, t_int=t_int, t_ext=t_ext, rsi=rsi, rse=rse, method=method, tol=tol)
+
+
+__all__ = [
+    "BridgeResult",
+    "SectionGrid",
+    "rasterize_section",
+    "solve_section",
+    "thermal_bridge_section",
+]
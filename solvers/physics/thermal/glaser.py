@@ -0,0 +1,272 @@
+"""
+Interstitial Condensation Risk (ISO 13788 Glaser method, monthly).
+
+Steady temperature and vapour pressure profiles through the layer stacks of
+many walls, for 12 monthly climates. The vapour pressure at each interface is
+the tightest string from the interior to the exterior pressure that stays below
+the saturation pressure (lower convex hull over the cumulated vapour diffusion
+thickness sd); where it touches the saturation curve vapour condenses at the
+difference of the incoming and outgoing flows. Interfaces holding condensate
+stay at saturation in the following months until it has evaporated.
+
+The monthly cycle starts with the first month that condenses; a wall passes
+when the condensate evaporates within the year and its maximum stays below
+`limit` (DIN 4108-3 style acceptance, ISO 13788 only reports the amounts).
+
+Conventions
+- Inputs are SI (thickness in m) with the layer axis last, interior first,
+  like `transfer_matrix.py`; zero-thickness padding layers are neutral.
+- Interfaces: 0 is the interior surface, n the exterior surface (n layers).
+- The surface vapour resistances are neglected (ISO 13788).
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, Sequence
+
+import numpy as np
+
+from core.src.stack import get_layer_stack, stack_arrays
+
+from .transfer_matrix import RSE, RSI
+
+DELTA_AIR = 2e-10          # vapour permeability of still air [kg/(m s Pa)]
+MAX_CONDENSATE = 0.5       # [kg/m2] accepted maximum of the accumulated condensate
+RATE_TOL = 1e-13           # [kg/(m2 s)] smaller flow differences are rounding (~0.3 g/m2 a month)
+DAYS = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+MONTH_SECONDS = DAYS * 86400.0
+
+# ISO 13788 Annex A: interior - exterior vapour pressure excess [Pa] at theta_e <= 0 degC,
+# falling linearly to 0 at 20 degC (1: storage, 2: offices, 3: dwellings, 4: sports halls, 5: special)
+HUMIDITY_CLASS_DP = {1: 270.0, 2: 540.0, 3: 810.0, 4: 1080.0, 5: 1320.0}
+HUMIDITY_SAFETY = 1.10
+
+
+def saturation_pressure(theta) -> np.ndarray:
+    """p_sat [Pa] over water (theta >= 0) or ice (ISO 13788 Annex E)."""
+    theta = np.asarray(theta, dtype=float)
+    return np.where(
+        theta >= 0,
+        610.5 * np.exp(17.269 * theta / (237.3 + theta)),
+        610.5 * np.exp(21.875 * theta / (265.5 + theta)),
+    )
+
+
+@dataclass
+class MonthlyClimate:
+    """Monthly mean boundary conditions, arrays of 12 values (January first)."""
+    theta_e: np.ndarray   # exterior temperature [degC]
+    rh_e: np.ndarray      # exterior relative humidity [-]
+    theta_i: np.ndarray   # interior temperature [degC]
+    rh_i: np.ndarray      # interior relative humidity [-]
+
+    def __post_init__(self):
+        for name in ("theta_e", "rh_e", "theta_i", "rh_i"):
+            value = np.broadcast_to(np.asarray(getattr(self, name), dtype=float), (12,)).copy()
+            setattr(self, name, value)
+        if np.any((self.rh_e < 0) | (self.rh_e > 1) | (self.rh_i < 0) | (self.rh_i > 1)):
+            raise ValueError("Relative humidities are fractions between 0 and 1.")
+
+    @property
+    def p_e(self) -> np.ndarray:
+        return self.rh_e * saturation_pressure(self.theta_e)
+
+    @property
+    def p_i(self) -> np.ndarray:
+        return self.rh_i * saturation_pressure(self.theta_i)
+
+    @classmethod
+    def from_humidity_class(cls, theta_e, rh_e, humidity_class: int = 3, theta_i=20.0) -> "MonthlyClimate":
+        """Interior humidity from the ISO 13788 humidity class (vapour pressure excess x 1.10)."""
+        if humidity_class not in HUMIDITY_CLASS_DP:
+            raise ValueError(f"Unknown humidity class {humidity_class}, expected 1 to 5.")
+        theta_e = np.asarray(theta_e, dtype=float)
+        excess = HUMIDITY_CLASS_DP[humidity_class] * np.clip(1.0 - theta_e / 20.0, 0.0, 1.0)
+        p_i = np.asarray(rh_e, dtype=float) * saturation_pressure(theta_e) + HUMIDITY_SAFETY * excess
+        rh_i = np.minimum(p_i / saturation_pressure(np.broadcast_to(theta_i, theta_e.shape)), 1.0)
+        return cls(theta_e=theta_e, rh_e=rh_e, theta_i=theta_i, rh_i=rh_i)
+
+    def as_dict(self) -> Dict[str, list]:
+        return {
+            "theta_e": self.theta_e.tolist(),
+            "rh_e": self.rh_e.tolist(),
+            "theta_i": self.theta_i.tolist(),
+            "rh_i": self.rh_i.tolist(),
+        }
+
+
+# Indicative monthly means for Paris (screening of variants), dwellings (humidity class 3)
+CLIMATE_PARIS = MonthlyClimate.from_humidity_class(
+    theta_e=[5.0, 5.6, 8.8, 11.4, 15.1, 18.3, 20.6, 20.4, 16.9, 13.0, 8.4, 5.5],
+    rh_e=[0.84, 0.79, 0.73, 0.69, 0.70, 0.68, 0.66, 0.68, 0.74, 0.81, 0.85, 0.86],
+    humidity_class=3,
+)
+
+
+@dataclass
+class GlaserResult:
+    theta: np.ndarray        # (walls, 12, n + 1) interface temperatures [degC]
+    p_sat: np.ndarray        # (walls, 12, n + 1) saturation pressure [Pa]
+    p: np.ndarray            # (walls, 12, n + 1) vapour pressure [Pa]
+    sd: np.ndarray           # (walls, n + 1) cumulated vapour diffusion thickness [m]
+    condensate: np.ndarray   # (walls, 12, n + 1) accumulated at the end of each month [kg/m2]
+    start_month: np.ndarray  # (walls,) first month of the cycle (0 = January)
+    limit: float = MAX_CONDENSATE
+
+    @property
+    def condensate_max(self) -> np.ndarray:
+        """Largest total accumulated condensate over the year [kg/m2]."""
+        return self.condensate.sum(axis=-1).max(axis=-1)
+
+    @property
+    def evaporates(self) -> np.ndarray:
+        """True when no condensate is left at the end of the cycle."""
+        last = (self.start_month - 1) % 12
+        return self.condensate[np.arange(len(last)), last].sum(axis=-1) <= 0.0
+
+    @property
+    def condensing_interfaces(self) -> np.ndarray:
+        """(walls, n + 1) interfaces that hold condensate in some month."""
+        return np.any(self.condensate > 0, axis=1)
+
+    @property
+    def passes(self) -> np.ndarray:
+        return self.evaporates & (self.condensate_max <= self.limit)
+
+    def as_dict(self) -> Dict[str, np.ndarray]:
+        return {
+            "condensate_max": self.condensate_max,
+            "condensate_evaporates": self.evaporates,
+            "condensation_ok": self.passes,
+        }
+
+
+def _vapour_profile(x: np.ndarray, y: np.ndarray, pinned: np.ndarray) -> np.ndarray:
+    """
+    Greatest piecewise convex profile under the points (x, y) (..., K), equal to y at the
+    pinned points (boundaries, interfaces holding condensate): at every point, the lowest
+    chord between two points around it with no pinned point strictly in between.
+    """
+    k_points = x.shape[-1]
+    p = y.copy()
+    n_pinned = np.cumsum(pinned, axis=-1)
+    index = np.arange(k_points)
+    for a in range(k_points - 1):
+        for b in range(a + 1, k_points):
+            dx = x[..., b] - x[..., a]
+            valid = (dx > 0) & (n_pinned[..., b - 1] - n_pinned[..., a] == 0)
+            if not valid.any():
+                continue
+            span = (index >= a) & (index <= b)
+            slope = (y[..., b] - y[..., a]) / np.where(valid, dx, 1.0)
+            chord = y[..., a, None] + slope[..., None] * (x[..., span] - x[..., a, None])
+            p[..., span] = np.where(valid[..., None], np.minimum(p[..., span], chord), p[..., span])
+    return p
+
+
+def _condensation_rate(x: np.ndarray, p: np.ndarray) -> np.ndarray:
+    """Incoming minus outgoing vapour flow at every interface [kg/(m2 s)], 0 at the boundaries."""
+    dx = np.diff(x, axis=-1)
+    positive = dx > 0
+    flow = DELTA_AIR * -np.diff(p, axis=-1) / np.where(positive, dx, 1.0)
+    # zero-thickness layers carry the flow of the layer before them
+    last = np.maximum.accumulate(np.where(positive, np.arange(dx.shape[-1]), 0), axis=-1)
+    flow = np.take_along_axis(flow, last, axis=-1)
+    rate = np.zeros(p.shape)
+    rate[..., 1:-1] = flow[..., :-1] - flow[..., 1:]
+    rate[np.abs(rate) < RATE_TOL] = 0.0
+    return rate
+
+
+def glaser(
+    thickness,
+    conductivity,
+    vapour_resistance,
+    climate: MonthlyClimate = CLIMATE_PARIS,
+    rsi: float = RSI,
+    rse: float = RSE,
+    limit: float = MAX_CONDENSATE,
+) -> GlaserResult:
+    """
+    Monthly Glaser assessment of a batch of walls, layer arrays (walls, n) with the layer
+    axis last (thickness [m], lambda [W/mK], mu [-]). Identical stacks are evaluated once.
+    """
+    layers = np.stack(
+        np.broadcast_arrays(*(np.atleast_2d(np.asarray(a, dtype=float)) for a in (thickness, conductivity, vapour_resistance))),
+        axis=-1,
+    )
+    unique, inverse = np.unique(layers, axis=0, return_inverse=True)
+    inverse = inverse.ravel()
+    d, lam, mu = unique[..., 0], unique[..., 1], unique[..., 2]
+    walls = len(unique)
+
+    zero = np.zeros((walls, 1))
+    r = rsi + np.concatenate([zero, np.cumsum(d / lam, axis=-1)], axis=-1)      # (walls, K)
+    r_total = r[:, -1:] + rse
+    sd = np.concatenate([zero, np.cumsum(mu * d, axis=-1)], axis=-1)
+    theta_i, theta_e = climate.theta_i[:, None], climate.theta_e[:, None]
+    theta = theta_i - (theta_i - theta_e) * (r / r_total)[:, None, :]            # (walls, 12, K)
+    p_sat = saturation_pressure(theta)
+    y = p_sat.copy()
+    y[..., 0], y[..., -1] = climate.p_i, climate.p_e
+    x = np.broadcast_to(sd[:, None, :], theta.shape)
+    boundary = np.zeros(theta.shape, dtype=bool)
+    boundary[..., [0, -1]] = True
+
+    # dry start: the cycle begins with the first condensing month after a dry one
+    condensing = np.any(_condensation_rate(x, _vapour_profile(x, y, boundary)) > 0, axis=-1)
+    starts = condensing & ~np.roll(condensing, 1, axis=-1)
+    start = np.where(starts.any(axis=-1), np.argmax(starts, axis=-1), 0)
+
+    rows = np.arange(walls)
+    condensate = np.zeros(theta.shape)
+    accumulated = np.zeros((walls, theta.shape[-1]))
+    p = np.zeros(theta.shape)
+    for step in range(12):
+        month = (start + step) % 12
+        xm, ym = x[rows, month], y[rows, month]
+        pm = _vapour_profile(xm, ym, boundary[rows, month] | (accumulated > 0))
+        rate = _condensation_rate(xm, pm)
+        accumulated = np.maximum(accumulated + rate * MONTH_SECONDS[month][:, None], 0.0)
+        condensate[rows, month] = accumulated
+        p[rows, month] = pm
+
+    return GlaserResult(
+        theta=theta[inverse],
+        p_sat=p_sat[inverse],
+        p=p[inverse],
+        sd=sd[inverse],
+        condensate=condensate[inverse],
+        start_month=start[inverse],
+        limit=limit,
+    )
+
+
+def buildup_glaser(
+    buildups: Sequence,
+    climate: MonthlyClimate = CLIMATE_PARIS,
+    materials=None,
+    lattice_materials=None,
+    limit: float = MAX_CONDENSATE,
+) -> GlaserResult:
+    """Read the layer stacks of WallBuildUp objects and assess them in one batch."""
+    stacks = [get_layer_stack(b, lattice_materials) for b in buildups]
+    arrays = stack_arrays(stacks, materials)
+    return glaser(
+        arrays["thickness"] / 1000.0,
+        arrays["conductivity"],
+        arrays["vapour_resistance"],
+        climate,
+        limit=limit,
+    )
+
+
+__all__ = [
+    "CLIMATE_PARIS",
+    "GlaserResult",
+    "HUMIDITY_CLASS_DP",
+    "MAX_CONDENSATE",
+    "MonthlyClimate",
+    "buildup_glaser",
+    "glaser",
+    "saturation_pressure",
+]
@@ -0,0 +1,221 @@
+"""
+Dynamic Thermal Solver (ISO 13786 - Matrix Transfer Method).
+
+Native replacement for the `becalib` calls of `thermal_dynamic.ipynb`.
+Every layer is a 2x2 complex matrix stored in an array, so thousands of
+buildups (and several periods) are multiplied at once with batched matmul.
+
+Conventions
+- Inputs are SI (thickness in m) with the layer axis last, interior first.
+- Side 1 is the interior, side 2 the exterior (Z = Z_se . Z_N ... Z_1 . Z_si).
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, Sequence
+
+import numpy as np
+
+from core.src.stack import get_layer_stack, stack_arrays
+from core.src.wall import get_layer_thickness
+
+# Surface resistances for horizontal heat flow (ISO 6946) [m2K/W]
+RSI = 0.13
+RSE = 0.04
+
+PERIOD_DAY = 86400.0  # [s]
+
+
+def layer_matrices(thickness, conductivity, density, heat_capacity, period=PERIOD_DAY):
+    """
+    Heat transfer matrices of homogeneous layers, shape (..., 2, 2) complex.
+    All arguments broadcast together; a period of np.inf gives the steady-state matrix.
+    """
+    d = np.asarray(thickness, dtype=float)
+    lam = np.asarray(conductivity, dtype=float)
+    rho_c = np.asarray(density, dtype=float) * np.asarray(heat_capacity, dtype=float)
+    omega = 2.0 * np.pi / np.asarray(period, dtype=float)
+
+    # k = (1 + i) / delta, delta = periodic penetration depth
+    k2 = 1j * omega * rho_c / lam
+    x = np.sqrt(k2) * d
+    small = np.abs(x) < 1e-12
+    x_safe = np.where(small, 1.0, x)
+    sinhc = np.where(small, 1.0, np.sinh(x_safe) / x_safe)   # sinh(x) / x, -> 1 for x -> 0
+
+    z = np.empty(np.broadcast(d, lam, rho_c, omega).shape + (2, 2), dtype=complex)
+    z[..., 0, 0] = np.cosh(x)
+    z[..., 1, 1] = z[..., 0, 0]
+    z[..., 0, 1] = -(d / lam) * sinhc
+    z[..., 1, 0] = -lam * k2 * d * sinhc
+    return z
+
+
+def surface_matrix(resistance, shape=()):
+    z = np.zeros(tuple(shape) + (2, 2), dtype=complex)
+    z[..., 0, 0] = 1.0
+    z[..., 1, 1] = 1.0
+    z[..., 0, 1] = -resistance
+    return z
+
+
+def wall_transfer_matrix(
+    thickness,
+    conductivity,
+    density,
+    heat_capacity,
+    period=PERIOD_DAY,
+    rsi: float = RSI,
+    rse: float = RSE,
+) -> np.ndarray:
+    """
+    Transfer matrix of whole walls, shape (..., 2, 2).
+    The last axis of the layer arrays is the layer axis (interior first);
+    `period` broadcasts against the leading axes.
+    """
+    period = np.asarray(period, dtype=float)[..., None]
+    z_layers = layer_matrices(thickness, conductivity, density, heat_capacity, period)
+    batch_shape = z_layers.shape[:-3]
+
+    z = surface_matrix(rsi, batch_shape)
+    for n in range(z_layers.shape[-3]):
+        z = np.matmul(z_layers[..., n, :, :], z)
+    return np.matmul(surface_matrix(rse, batch_shape), z)
+
+
+@dataclass
+class DynamicProperties:
+    period: np.ndarray                  # [s]
+    u_value: np.ndarray                 # [W/m2K]
+    periodic_transmittance: np.ndarray  # Y12, complex [W/m2K]
+    admittance_internal: np.ndarray     # Y11, complex [W/m2K]
+    admittance_external: np.ndarray     # Y22, complex [W/m2K]
+
+    @property
+    def decrement_factor(self) -> np.ndarray:
+        return np.abs(self.periodic_transmittance) / self.u_value
+
+    @property
+    def time_shift(self) -> np.ndarray:
+        """Delay of the interior heat flow peak behind the exterior one [h]."""
+        phase = np.mod(-np.angle(self.periodic_transmittance), 2.0 * np.pi)
+        return phase * self.period / (2.0 * np.pi) / 3600.0
+
+    @property
+    def heat_capacity_internal(self) -> np.ndarray:
+        """Areal heat capacity kappa_1 [kJ/m2K]."""
+        return self._areal_capacity(self.admittance_internal)
+
+    @property
+    def heat_capacity_external(self) -> np.ndarray:
+        """Areal heat capacity kappa_2 [kJ/m2K]."""
+        return self._areal_capacity(self.admittance_external)
+
+    def _areal_capacity(self, admittance: np.ndarray) -> np.ndarray:
+        # kappa = T/2pi |(Z11 - 1) / Z12| = T/2pi |Y - Y12|
+        return self.period / (2.0 * np.pi) * np.abs(admittance - self.periodic_transmittance) / 1000.0
+
+    def as_dict(self) -> Dict[str, np.ndarray]:
+        return {
+            "u_value": self.u_value,
+            "phase_shift": self.time_shift,
+            "decrement_factor": self.decrement_factor,
+            "heat_capacity_internal": self.heat_capacity_internal,
+            "heat_capacity_external": self.heat_capacity_external,
+            "periodic_transmittance": np.abs(self.periodic_transmittance),
+        }
+
+
+def dynamic_properties(
+    thickness,
+    conductivity,
+    density,
+    heat_capacity,
+    period=PERIOD_DAY,
+    rsi: float = RSI,
+    rse: float = RSE,
+) -> DynamicProperties:
+    """ISO 13786 dynamic characteristics for a batch of walls (layer axis last)."""
+    z = wall_transfer_matrix(thickness, conductivity, density, heat_capacity, period, rsi, rse)
+    z11, z12, z22 = z[..., 0, 0], z[..., 0, 1], z[..., 1, 1]
+
+    d = np.asarray(thickness, dtype=float)
+    lam = np.asarray(conductivity, dtype=float)
+    r_total = rsi + rse + np.sum(d / lam, axis=-1)
+
+    return DynamicProperties(
+        period=np.broadcast_to(np.asarray(period, dtype=float), z12.shape),
+        u_value=1.0 / r_total,
+        periodic_transmittance=-1.0 / z12,
+        admittance_internal=-z11 / z12,
+        admittance_external=-z22 / z12,
+    )
+
+
+def buildup_dynamic_properties(
+    buildups: Sequence,
+    period=PERIOD_DAY,
+    rsi: float = RSI,
+    rse: float = RSE,
+    materials=None,
+    lattice_materials=None,
+) -> DynamicProperties:
+    """Read the layer stacks of WallBuildUp objects and evaluate them in one batch."""
+    stacks = [get_layer_stack(b, lattice_materials) for b in buildups]
+    arrays = stack_arrays(stacks, materials)
+    return dynamic_properties(
+        arrays["thickness"] / 1000.0,
+        arrays["conductivity"],
+        arrays["density"],
+        arrays["heat_capacity"],
+        period,
+        rsi,
+        rse,
+    )
+
+
+# Material constants of the lattice core (thermal notebooks)
+LATTICE_WOOD = {"conductivity": 0.13, "density": 550.0, "heat_capacity": 1600.0}
+LATTICE_INSULATION = {"conductivity": 0.038, "density": 50.0, "heat_capacity": 2100.0}
+
+
+def get_lattice_properties(wood_ratio, pitch, panel_type: str = "5L180", rib_width: float = 0.120):
+    """
+    Equivalent properties of the lattice core, vectorised over wood_ratio and pitch [m].
+    Same model as the notebook: weighted density, mass-weighted heat capacity and
+    conductivity from the parallel-path R of every sub-layer.
+    """
+    wood_ratio = np.asarray(wood_ratio, dtype=float)
+    pitch = np.asarray(pitch, dtype=float)
+    thicknesses = np.asarray(get_layer_thickness(panel_type), dtype=float) / 1000.0
+
+    m_wood = wood_ratio * LATTICE_WOOD["density"]
+    m_ins = (1 - wood_ratio) * LATTICE_INSULATION["density"]
+    rho_eq = m_wood + m_ins
+    c_eq = (m_wood * LATTICE_WOOD["heat_capacity"] + m_ins * LATTICE_INSULATION["heat_capacity"]) / rho_eq
+
+    # 1/R_layer = f_w/R_w + f_i/R_i  ->  R_layer = e / (f_w lambda_w + f_i lambda_i)
+    f_w = rib_width / pitch
+    lambda_pp = f_w * LATTICE_WOOD["conductivity"] + (1 - f_w) * LATTICE_INSULATION["conductivity"]
+    r_tot = thicknesses.sum() / lambda_pp
+    total = thicknesses.sum()
+
+    return {
+        "lambda": total / r_tot,
+        "rho": rho_eq,
+        "c": c_eq,
+        "thickness": np.broadcast_to(total, np.shape(rho_eq + lambda_pp)),
+    }
+
+
+__all__ = [
+    "RSI",
+    "RSE",
+    "PERIOD_DAY",
+    "DynamicProperties",
+    "buildup_dynamic_properties",
+    "dynamic_properties",
+    "get_lattice_properties",
+    "layer_matrices",
+    "surface_matrix",
+    "wall_transfer_matrix",
+]
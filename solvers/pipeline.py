@@ -0,0 +1,203 @@
+"""
+Multi-Physics Evaluation Pipeline.
+
+One entry point for the acoustic, static thermal, dynamic thermal, hygrothermal
+(Glaser condensation check) and carbon solvers. A batch of WallBuildUp objects
+is flattened once into shared derived quantities (layer stacks, property arrays,
+surface masses, quantity takeoff); every requested stage then reads these
+arrays and returns result columns. Chunks of the batch are evaluated in a
+process pool and joined into one table.
+"""
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from core.src.quantities import analytic_takeoff, quantity_stack
+from core.src.stack import get_layer_stack, stack_arrays
+from core.src.takeoff import Takeoff, quantity_takeoff
+
+from .physics.acoustics.sound_insulation import (
+    double_leaf_transmission_loss,
+    leaf_masses,
+    single_number_rating,
+)
+from .physics.carbon.lca import takeoff_lca
+from .physics.thermal.glaser import glaser
+from .physics.thermal.transfer_matrix import PERIOD_DAY, RSE, RSI, dynamic_properties
+
+
+@dataclass
+class SharedQuantities:
+    """Derived quantities computed once per buildup and read by every stage."""
+    panel_ids: List[str]
+    arrays: Dict[str, np.ndarray]   # stack_arrays, thickness converted to m
+    y_min: np.ndarray               # (batch, n_layers) [mm]
+    y_max: np.ndarray
+    fractions: List[List[Dict[str, float]]]  # area fractions per layer
+    surface_mass: np.ndarray        # (batch, n_layers) [kg/m2]
+    core_range: np.ndarray          # (batch, 2) lattice core y range [mm]
+    takeoff: Takeoff
+
+
+def shared_quantities(
+    buildups: Sequence,
+    materials=None,
+    lattice_materials=None,
+    analytic: bool = False,
+) -> SharedQuantities:
+    """
+    analytic=True takes the layer fractions and the takeoff from core.src.quantities
+    (closed form, lazy buildups are not materialized) instead of the elements.
+    """
+    buildups = list(buildups)
+    layer_stack = quantity_stack if analytic else get_layer_stack
+    stacks = [layer_stack(b, lattice_materials) for b in buildups]
+    arrays = stack_arrays(stacks, materials)
+    arrays["thickness"] = arrays["thickness"] / 1000.0
+
+    shape = arrays["thickness"].shape
+    y_min, y_max = np.zeros(shape), np.zeros(shape)
+    for b, stack in enumerate(stacks):
+        y_min[b, :len(stack)] = [layer.y_min for layer in stack]
+        y_max[b, :len(stack)] = [layer.y_max for layer in stack]
+
+    core_range = np.zeros((len(buildups), 2))
+    for b, buildup in enumerate(buildups):
+        if buildup.lattice is not None and buildup.lattice.layer_ranges:
+            core_range[b] = buildup.lattice.layer_ranges[0][0], buildup.lattice.layer_ranges[-1][1]
+
+    return SharedQuantities(
+        panel_ids=[b.panel_id for b in buildups],
+        arrays=arrays,
+        y_min=y_min,
+        y_max=y_max,
+        fractions=[[layer.fractions for layer in stack] for stack in stacks],
+        surface_mass=arrays["density"] * arrays["thickness"],
+        core_range=core_range,
+        takeoff=(analytic_takeoff if analytic else quantity_takeoff)(buildups, lattice_materials),
+    )
+
+
+# Stages: SharedQuantities -> result columns
+
+def stage_acoustics(shared: SharedQuantities) -> Dict[str, np.ndarray]:
+    m1, m2, cavity = leaf_masses(shared.y_min, shared.y_max, shared.surface_mass, shared.core_range)
+    rating = single_number_rating(double_leaf_transmission_loss(m1, m2, cavity))
+    return {
+        "surface_mass": m1 + m2,
+        "rw": rating["rw"],
+        "c": rating["c"],
+        "ctr": rating["ctr"],
+    }
+
+
+def stage_thermal_static(shared: SharedQuantities) -> Dict[str, np.ndarray]:
+    arrays = shared.arrays
+    resistance = RSI + RSE + np.sum(arrays["thickness"] / arrays["conductivity"], axis=-1)
+    return {
+        "thickness": arrays["thickness"].sum(axis=-1) * 1000.0,
+        "r_value": resistance,
+        "u_value": 1.0 / resistance,
+    }
+
+
+def stage_thermal_dynamic(shared: SharedQuantities) -> Dict[str, np.ndarray]:
+    arrays = shared.arrays
+    props = dynamic_properties(
+        arrays["thickness"], arrays["conductivity"], arrays["density"], arrays["heat_capacity"], PERIOD_DAY
+    )
+    return {
+        "phase_shift": props.time_shift,
+        "decrement_factor": props.decrement_factor,
+        "heat_capacity_internal": props.heat_capacity_internal,
+    }
+
+
+def stage_hygrothermal(shared: SharedQuantities) -> Dict[str, np.ndarray]:
+    arrays = shared.arrays
+    return glaser(arrays["thickness"], arrays["conductivity"], arrays["vapour_resistance"]).as_dict()
+
+
+def stage_carbon(shared: SharedQuantities) -> Dict[str, np.ndarray]:
+    res = takeoff_lca(shared.takeoff)
+    return {
+        "net_area": res.net_area,
+        "a1_a5": res.a1_a5,
+        "biogenic": res.biogenic,
+        "carbon_weight": res.carbon_weight,
+        "carbon_weight_per_m2": res.carbon_weight_per_m2,
+        "unmapped_volume": res.unmapped_volume,
+    }
+
+
+STAGES: Dict[str, Callable[[SharedQuantities], Dict[str, np.ndarray]]] = {
+    "acoustics": stage_acoustics,
+    "thermal_static": stage_thermal_static,
+    "thermal_dynamic": stage_thermal_dynamic,
+    "hygrothermal": stage_hygrothermal,
+    "carbon": stage_carbon,
+}
+
+
+def evaluate_batch(
+    buildups: Sequence,
+    stages: Sequence[str],
+    materials=None,
+    lattice_materials=None,
+    analytic: bool = False,
+) -> Dict:
+    """Run the stages on one batch in the current process, returns result columns."""
+    shared = shared_quantities(buildups, materials, lattice_materials, analytic)
+    columns: Dict[str, object] = {"panel_id": shared.panel_ids}
+    for name in stages:
+        columns.update(STAGES[name](shared))
+    return columns
+
+
+def run_pipeline(
+    buildups: Sequence,
+    stages: Sequence[str] = None,
+    workers: int = None,
+    chunk_size: int = 64,
+    materials=None,
+    lattice_materials=None,
+    analytic: bool = False,
+) -> pd.DataFrame:
+    """
+    Evaluate a batch of WallBuildUp objects, one row per panel.
+    workers=None/1 runs in the current process, otherwise chunks of chunk_size buildups
+    are dispatched to a ProcessPoolExecutor (materials must then be picklable).
+    analytic=True evaluates lazy buildups without generating their elements (see shared_quantities).
+    """
+    stages = list(STAGES) if stages is None else list(stages)
+    unknown = [name for name in stages if name not in STAGES]
+    if unknown:
+        raise ValueError(f"Unknown stage(s) {unknown}, expected some of {list(STAGES)}.")
+
+    buildups = list(buildups)
+    chunks = [buildups[i:i + chunk_size] for i in range(0, len(buildups), chunk_size)]
+    if workers is None or workers <= 1 or len(chunks) <= 1:
+        results = [evaluate_batch(chunk, stages, materials, lattice_materials, analytic) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(evaluate_batch, chunk, stages, materials, lattice_materials, analytic) for chunk in chunks
+            ]
+            results = [future.result() for future in futures]
+
+    if not results:
+        return pd.DataFrame(columns=["panel_id"])
+    return pd.concat([pd.DataFrame(columns) for columns in results], ignore_index=True)
+
+
+__all__ = [
+    "STAGES",
+    "SharedQuantities",
+    "evaluate_batch",
+    "run_pipeline",
+    "shared_quantities",
+]
@@ -0,0 +1,198 @@
+"""
+Part Catalogue (piece deduplication across a project).
+
+Elements of all lattices and layers of many WallBuildUp objects are reduced to
+part families: same element type, material and dimensions rounded to
+`precision` share one part number. The in-plane dimensions are sorted (width <=
+length), so a horizontal batten and a vertical one of the same size are one part.
+Pieces cut around an opening (elements with an `outline`) are also keyed on the
+area missing from their box, rounded to `precision`**2, so a notched piece is not
+the part of a full one with the same box.
+
+Elements become rows of an int64 key matrix (type, material, quantised thickness,
+width, length, missing area); one lexsort + neighbour comparison numbers the families, so the
+cost after collecting the elements is O(n log n) in NumPy.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from core.src.materials import LATTICE_MATERIALS
+
+DEFAULT_PRECISION = 1.0   # [mm]
+
+
+@dataclass
+class PartCatalogue:
+    element_ids: List[str]
+    element_panel: np.ndarray     # (elements,) index in panel_ids
+    element_part: np.ndarray      # (elements,) index in the part arrays
+    element_position: np.ndarray  # (elements,) index of the element in its panel (lattice first, then layers)
+    panel_ids: List[str]
+    panel_elements: np.ndarray    # (panels,) number of elements of every panel, catalogued or not
+    part_numbers: List[str]
+    part_types: List[str]
+    part_materials: List[str]
+    part_dims: np.ndarray         # (parts, 3) thickness, width, length [mm] (rounded)
+    part_cut_areas: np.ndarray    # (parts,) face area missing from the box of cut pieces [mm2] (rounded)
+    part_counts: np.ndarray       # (parts,)
+
+    def __len__(self) -> int:
+        return len(self.part_numbers)
+
+    def element_part_numbers(self) -> List[str]:
+        """Part number of every element, in element order."""
+        numbers = self.part_numbers
+        return [numbers[p] for p in self.element_part.tolist()]
+
+    def panel_part_numbers(self, panel: Union[int, str]) -> List[Optional[str]]:
+        """
+        Part number of every element of one panel (index or panel_id) in walk order, lattice
+        first then the layers like the export writers; None for elements not catalogued.
+        """
+        p = self.panel_ids.index(panel) if isinstance(panel, str) else int(panel)
+        result: List[Optional[str]] = [None] * int(self.panel_elements[p])
+        numbers = self.part_numbers
+        rows = np.flatnonzero(self.element_panel == p)
+        for position, part in zip(self.element_position[rows].tolist(), self.element_part[rows].tolist()):
+            result[position] = numbers[part]
+        return result
+
+    def mapping(self) -> Dict[str, str]:
+        """element_id -> part number (the ids must be unique across the catalogued panels)."""
+        result = dict(zip(self.element_ids, self.element_part_numbers()))
+        if len(result) != len(self.element_ids):
+            seen = set()
+            duplicate = next(eid for eid in self.element_ids if eid in seen or seen.add(eid))
+            raise ValueError(
+                f"Element id '{duplicate}' is not unique, use element_part_numbers() instead."
+            )
+        return result
+
+    def panel_counts(self) -> np.ndarray:
+        """(panels, parts) number of pieces of every part in every panel."""
+        n_parts = len(self.part_numbers)
+        cell = self.element_panel * n_parts + self.element_part
+        return np.bincount(cell, minlength=len(self.panel_ids) * n_parts).reshape(len(self.panel_ids), n_parts)
+
+    def as_records(self) -> List[Dict]:
+        """One row per part (catalogue sheet)."""
+        return [
+            {
+                "part_number": number,
+                "element_type": self.part_types[p],
+                "material": self.part_materials[p],
+                "thickness": float(self.part_dims[p, 0]),
+                "width": float(self.part_dims[p, 1]),
+                "length": float(self.part_dims[p, 2]),
+                "cut_area": float(self.part_cut_areas[p]),
+                "count": int(self.part_counts[p]),
+                "volume": float(
+                    self.part_counts[p] * self.part_dims[p, 0]
+                    * (self.part_dims[p, 1] * self.part_dims[p, 2] - self.part_cut_areas[p]) / 1e9
+                ),
+            }
+            for p, number in enumerate(self.part_numbers)
+        ]
+
+
+def part_catalogue(
+    buildups: Sequence,
+    precision: float = DEFAULT_PRECISION,
+    element_types: Sequence[str] = None,
+    lattice_materials: Dict[str, str] = None,
+    prefix: str = "P",
+) -> PartCatalogue:
+    """
+    Deduplicate the elements of WallBuildUp objects into numbered part families.
+    element_types=None keeps every element (slats, battens, boards, insulation).
+    Parts are numbered in (type, material, thickness, width, length, cut area) order.
+    """
+    if precision <= 0:
+        raise ValueError("precision must be positive.")
+    if hasattr(buildups, "layers"):
+        buildups = [buildups]
+    buildups = list(buildups)
+    lattice_materials = LATTICE_MATERIALS if lattice_materials is None else lattice_materials
+    keep = None if element_types is None else set(element_types)
+
+    type_codes: Dict[str, int] = {}
+    material_codes: Dict[str, int] = {}
+    element_ids: List[str] = []
+    positions: List[int] = []
+    rows: List[tuple] = []
+    panel_sizes: List[int] = []
+    panel_elements: List[int] = []
+    for buildup in buildups:
+        groups = []
+        if buildup.lattice is not None:
+            groups.append((buildup.lattice.elements, lattice_materials))
+        for layer in buildup.layers:
+            groups.append((layer.elements, layer.materials or {}))
+        n_before = len(rows)
+        position = -1
+        for elements, mapping in groups:
+            for elem in elements:
+                position += 1
+                kind = elem.element_type
+                if keep is not None and kind not in keep:
+                    continue
+                element_ids.append(elem.element_id)
+                positions.append(position)
+                dx, dz = elem.x_max - elem.x_min, elem.z_max - elem.z_min
+                outline = getattr(elem, "outline", None)
+                rows.append((
+                    type_codes.setdefault(kind, len(type_codes)),
+                    material_codes.setdefault(mapping.get(kind, kind), len(material_codes)),
+                    elem.y_max - elem.y_min,
+                    dx,
+                    dz,
+                    0.0 if outline is None else dx * dz - outline.area,
+                ))
+        panel_sizes.append(len(rows) - n_before)
+        panel_elements.append(position + 1)
+
+    data = np.array(rows, dtype=float).reshape(-1, 6)
+    dims = np.rint(data[:, 2:5] / precision).astype(np.int64)
+    dims[:, 1:] = np.sort(dims[:, 1:], axis=1)
+    cut_area = np.rint(data[:, 5] / precision ** 2).astype(np.int64)
+    keys = np.column_stack([data[:, :2].astype(np.int64), dims, cut_area])
+
+    # families in key order: sort once, new family where a row differs from the previous one
+    type_names, material_names = list(type_codes), list(material_codes)
+    type_rank = np.argsort(np.argsort(type_names))
+    material_rank = np.argsort(np.argsort(material_names))
+    if len(keys):
+        keys[:, 0], keys[:, 1] = type_rank[keys[:, 0]], material_rank[keys[:, 1]]
+    order = np.lexsort(keys.T[::-1])
+    sorted_keys = keys[order]
+    new = np.ones(len(keys), dtype=bool)
+    new[1:] = np.any(sorted_keys[1:] != sorted_keys[:-1], axis=1)
+    element_part = np.empty(len(keys), dtype=np.int64)
+    element_part[order] = np.cumsum(new) - 1
+    firsts = sorted_keys[new]
+
+    types_sorted, materials_sorted = sorted(type_names), sorted(material_names)
+    width = max(4, len(str(len(firsts))))
+    return PartCatalogue(
+        element_ids=element_ids,
+        element_panel=np.repeat(np.arange(len(buildups)), panel_sizes),
+        element_part=element_part,
+        element_position=np.array(positions, dtype=np.int64),
+        panel_ids=[b.panel_id for b in buildups],
+        panel_elements=np.array(panel_elements, dtype=np.int64),
+        part_numbers=[f"{prefix}{k + 1:0{width}d}" for k in range(len(firsts))],
+        part_types=[types_sorted[k] for k in firsts[:, 0]],
+        part_materials=[materials_sorted[k] for k in firsts[:, 1]],
+        part_dims=firsts[:, 2:5] * precision,
+        part_cut_areas=firsts[:, 5] * precision ** 2,
+        part_counts=np.bincount(element_part, minlength=len(firsts)),
+    )
+
+
+__all__ = [
+    "PartCatalogue",
+    "part_catalogue",
+]
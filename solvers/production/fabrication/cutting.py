@@ -0,0 +1,327 @@
+"""
+Stock-Length Cutting Optimizer (1D bin packing).
+
+Every slat and batten of a batch of WallBuildUp objects is cut from stock
+timber lengths. Pieces are grouped by cross-section (material, width,
+thickness) and each group is packed with first-fit decreasing:
+
+- the kerf is added to every piece and to the stock capacity, so n pieces fit
+  a bar when sum(lengths) + (n - 1) * kerf <= stock length;
+- bins are the leaves of a max tournament tree stored as an implicit heap, so
+  the first bin with enough room is found in O(log n): O(n log n) per group;
+- bars are opened at the longest stock length, then shortened to the shortest
+  stock length that still holds their pieces.
+
+optimize=True keeps restarting the packing with slightly perturbed piece orders
+until the time budget is spent or the bar count reaches the lower bound.
+"""
+from __future__ import annotations
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from core.src.materials import LATTICE_MATERIALS
+
+DEFAULT_STOCK_LENGTHS = (3000.0, 4000.0, 5000.0, 6000.0)  # [mm]
+DEFAULT_KERF = 4.0                                         # [mm]
+CUT_ELEMENT_TYPES = ("slat", "batten")
+SECTION_DECIMALS = 1                                       # rounding of section dims [mm]
+_EPS = 1e-9
+
+
+@dataclass
+class CutPieces:
+    """Pieces to cut, one row per element."""
+    element_ids: List[str]
+    panel_ids: List[str]
+    materials: List[str]
+    width: np.ndarray       # cross-section [mm]
+    thickness: np.ndarray   # cross-section [mm]
+    length: np.ndarray      # cut length along the element axis [mm]
+
+    def __len__(self) -> int:
+        return len(self.element_ids)
+
+
+def cut_pieces(
+    buildups: Sequence,
+    element_types: Sequence[str] = CUT_ELEMENT_TYPES,
+    lattice_materials: Dict[str, str] = None,
+) -> CutPieces:
+    """
+    Slats and battens of WallBuildUp objects. The cut length runs along the element
+    orientation (z for vertical elements, x for horizontal ones), the other in-plane
+    dimension is the section width.
+    """
+    lattice_materials = LATTICE_MATERIALS if lattice_materials is None else lattice_materials
+    element_ids, panel_ids, materials, dims = [], [], [], []
+    for buildup in buildups:
+        groups = []
+        if buildup.lattice is not None:
+            groups.append((buildup.lattice.elements, lattice_materials))
+        for layer in buildup.layers:
+            groups.append((layer.elements, layer.materials or {}))
+        for elements, mapping in groups:
+            for elem in elements:
+                if elem.element_type not in element_types:
+                    continue
+                dx, dz = elem.x_max - elem.x_min, elem.z_max - elem.z_min
+                along, across = (dx, dz) if elem.orientation == "horizontal" else (dz, dx)
+                element_ids.append(elem.element_id)
+                panel_ids.append(buildup.panel_id)
+                materials.append(mapping.get(elem.element_type, elem.element_type))
+                dims.append((across, elem.y_max - elem.y_min, along))
+
+    dims = np.array(dims, dtype=float).reshape(-1, 3)
+    return CutPieces(element_ids, panel_ids, materials, dims[:, 0], dims[:, 1], dims[:, 2])
+
+
+# ----------------------------------------------------------------------------
+# Packing
+# ----------------------------------------------------------------------------
+
+def _first_fit(lengths: Sequence[float], capacity: float) -> Tuple[List[int], List[float]]:
+    """
+    First fit of the lengths in the given order into bins of `capacity`.
+    tree[1:] is a max tournament tree over the remaining room of the bins (leaves at
+    size..2*size), unopened bins are full: the leftmost leaf with room is the answer.
+    Returns the bin of every length and the used length of every opened bin.
+    """
+    n = len(lengths)
+    size = 1
+    while size < max(n, 1):
+        size *= 2
+    tree = [capacity] * (2 * size)
+    bins = [0] * n
+    n_bins = 0
+    for k, need in enumerate(lengths):
+        need -= _EPS
+        node = 1
+        while node < size:
+            node = 2 * node if tree[2 * node] >= need else 2 * node + 1
+        tree[node] -= need + _EPS
+        bins[k] = node - size
+        n_bins = max(n_bins, node - size + 1)
+        node //= 2
+        while node:
+            room = max(tree[2 * node], tree[2 * node + 1])
+            if tree[node] == room:
+                break
+            tree[node] = room
+            node //= 2
+    used = [capacity - room for room in tree[size:size + n_bins]]
+    return bins, used
+
+
+def pack_lengths(
+    lengths,
+    stock_lengths: Sequence[float] = DEFAULT_STOCK_LENGTHS,
+    kerf: float = DEFAULT_KERF,
+    optimize: bool = False,
+    time_budget: float = 1.0,
+    seed: int = 0,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Pack piece lengths [mm] into stock bars.
+    Returns (bar of every piece, stock length of every bar, offset of every piece in its bar).
+    """
+    lengths = np.asarray(lengths, dtype=float)
+    stock = np.sort(np.asarray(stock_lengths, dtype=float))
+    if len(stock) == 0:
+        raise ValueError("At least one stock length is required.")
+    if len(lengths) == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0), np.zeros(0)
+    too_long = lengths > stock[-1] + _EPS
+    if too_long.any():
+        raise ValueError(f"{int(too_long.sum())} piece(s) longer than the longest stock length {stock[-1]:g} mm "
+                         f"(max {lengths.max():g} mm).")
+
+    sizes = lengths + kerf
+    capacity = stock[-1] + kerf
+    lower_bound = int(np.ceil(sizes.sum() / capacity - _EPS))
+
+    order = np.argsort(-sizes, kind="stable")
+    bins, used = _first_fit(sizes[order].tolist(), capacity)
+    best = (len(used), order, bins, used)
+
+    if optimize and best[0] > lower_bound:
+        rng = np.random.default_rng(seed)
+        deadline = time.perf_counter() + time_budget
+        spread = sizes.max() - sizes.min()
+        while time.perf_counter() < deadline and best[0] > lower_bound:
+            noise = rng.uniform(0.0, rng.uniform(0.01, 0.2) * max(spread, 1.0), len(sizes))
+            order = np.argsort(-(sizes + noise), kind="stable")
+            bins, used = _first_fit(sizes[order].tolist(), capacity)
+            if len(used) < best[0]:
+                best = (len(used), order, bins, used)
+
+    _, order, bins, used = best
+    bar = np.empty(len(lengths), dtype=np.int64)
+    bar[order] = bins
+    # shortest stock length holding each bar (the last kerf is not cut)
+    bar_used = np.asarray(used) - kerf
+    bar_stock = stock[np.searchsorted(stock, bar_used - _EPS)]
+
+    # offsets: pieces laid out in packing order along their bar
+    packed = order[np.argsort(bar[order], kind="stable")]
+    start = np.cumsum(sizes[packed]) - sizes[packed]
+    first = np.searchsorted(bar[packed], bar[packed])
+    offset = np.empty(len(lengths))
+    offset[packed] = start - start[first]
+    return bar, bar_stock, offset
+
+
+# ----------------------------------------------------------------------------
+# Cutting list
+# ----------------------------------------------------------------------------
+
+@dataclass
+class CuttingResult:
+    pieces: CutPieces
+    sections: List[Tuple[str, float, float]]  # (material, width, thickness)
+    piece_section: np.ndarray   # (pieces,) index in sections
+    piece_bar: np.ndarray       # (pieces,) global bar index
+    piece_offset: np.ndarray    # (pieces,) start of the piece along its bar [mm]
+    bar_section: np.ndarray     # (bars,) index in sections
+    bar_length: np.ndarray      # (bars,) stock length [mm]
+    kerf: float
+
+    @property
+    def stock_count(self) -> int:
+        return len(self.bar_length)
+
+    @property
+    def bar_used(self) -> np.ndarray:
+        """Length of the pieces of every bar, kerf excluded [mm]."""
+        return np.bincount(self.piece_bar, weights=self.pieces.length, minlength=self.stock_count)
+
+    @property
+    def waste(self) -> np.ndarray:
+        """Offcut and kerf losses of every bar [mm]."""
+        return self.bar_length - self.bar_used
+
+    @property
+    def waste_ratio(self) -> float:
+        total = self.bar_length.sum()
+        return float(self.waste.sum() / total) if total > 0 else 0.0
+
+    def summary(self) -> List[Dict]:
+        """One row per cross-section and stock length (purchase list)."""
+        rows = []
+        waste = self.waste
+        for s, (material, width, thickness) in enumerate(self.sections):
+            in_section = self.bar_section == s
+            for length in np.unique(self.bar_length[in_section]):
+                bars = in_section & (self.bar_length == length)
+                rows.append({
+                    "material": material,
+                    "width": width,
+                    "thickness": thickness,
+                    "stock_length": float(length),
+                    "count": int(bars.sum()),
+                    "pieces": int(np.isin(self.piece_bar, np.flatnonzero(bars)).sum()),
+                    "waste": float(waste[bars].sum()),
+                    "waste_ratio": float(waste[bars].sum() / (length * bars.sum())),
+                })
+        return rows
+
+    def cut_plans(self) -> List[Dict]:
+        """One entry per bar: stock length and its pieces in cutting order."""
+        order = np.lexsort((self.piece_offset, self.piece_bar))
+        split = np.searchsorted(self.piece_bar[order], np.arange(1, self.stock_count))
+        waste = self.waste
+        plans = []
+        for b, pieces in enumerate(np.split(order, split)):
+            material, width, thickness = self.sections[self.bar_section[b]]
+            plans.append({
+                "bar": b,
+                "material": material,
+                "width": width,
+                "thickness": thickness,
+                "stock_length": float(self.bar_length[b]),
+                "cuts": [(self.pieces.element_ids[p], float(self.pieces.length[p])) for p in pieces],
+                "waste": float(waste[b]),
+            })
+        return plans
+
+    def as_records(self) -> List[Dict]:
+        """Cutting list, one row per piece."""
+        return [
+            {
+                "element_id": self.pieces.element_ids[p],
+                "panel_id": self.pieces.panel_ids[p],
+                "material": self.pieces.materials[p],
+                "width": float(self.pieces.width[p]),
+                "thickness": float(self.pieces.thickness[p]),
+                "length": float(self.pieces.length[p]),
+                "bar": int(self.piece_bar[p]),
+                "offset": float(self.piece_offset[p]),
+            }
+            for p in range(len(self.pieces))
+        ]
+
+
+def cutting_list(
+    buildups,
+    stock_lengths: Sequence[float] = DEFAULT_STOCK_LENGTHS,
+    kerf: float = DEFAULT_KERF,
+    optimize: bool = False,
+    time_budget: float = 1.0,
+    element_types: Sequence[str] = CUT_ELEMENT_TYPES,
+    lattice_materials: Dict[str, str] = None,
+    seed: int = 0,
+) -> CuttingResult:
+    """
+    Cutting list of one WallBuildUp or a batch of them.
+    Pieces of identical cross-section share stock bars across panels; time_budget [s]
+    is split between the sections when optimize=True.
+    """
+    if hasattr(buildups, "layers"):
+        buildups = [buildups]
+    pieces = cut_pieces(buildups, element_types, lattice_materials)
+
+    codes: Dict[Tuple[str, float, float], int] = {}
+    width = np.round(pieces.width, SECTION_DECIMALS)
+    thickness = np.round(pieces.thickness, SECTION_DECIMALS)
+    piece_section = np.array(
+        [codes.setdefault(key, len(codes)) for key in zip(pieces.materials, width.tolist(), thickness.tolist())],
+        dtype=np.int64,
+    )
+    sections = list(codes)
+
+    piece_bar = np.zeros(len(pieces), dtype=np.int64)
+    piece_offset = np.zeros(len(pieces))
+    bar_section, bar_length = [], []
+    for s in range(len(sections)):
+        members = np.flatnonzero(piece_section == s)
+        bar, stock, offset = pack_lengths(
+            pieces.length[members], stock_lengths, kerf, optimize, time_budget / len(sections), seed
+        )
+        piece_bar[members] = bar + len(bar_length)
+        piece_offset[members] = offset
+        bar_section.extend([s] * len(stock))
+        bar_length.extend(stock.tolist())
+
+    return CuttingResult(
+        pieces=pieces,
+        sections=sections,
+        piece_section=piece_section,
+        piece_bar=piece_bar,
+        piece_offset=piece_offset,
+        bar_section=np.array(bar_section, dtype=np.int64),
+        bar_length=np.array(bar_length, dtype=float),
+        kerf=kerf,
+    )
+
+
+__all__ = [
+    "CutPieces",
+    "CuttingResult",
+    "DEFAULT_KERF",
+    "DEFAULT_STOCK_LENGTHS",
+    "cut_pieces",
+    "cutting_list",
+    "pack_lengths",
+]
@@ -0,0 +1,311 @@
+"""
+Fabrication Export Writers (DXF, CSV part list, CNC JSON).
+
+Every writer streams the elements of a WallBuildUp to a file as it walks
+them: no Plotly figure and no `as_dict` tree is built, memory does not grow
+with the panel size. `export_buildups` writes the files of a batch panel by
+panel, optionally in a process pool with a bounded number of panels in flight,
+so a generator of buildups goes to fabrication files in one pass.
+
+- .dxf  : AutoCAD R12 ASCII. Elevation outlines (x, z) on one DXF layer per wall
+          layer / lattice sub-layer (the real outline of pieces cut around an
+          opening, else their box), openings, and the vertical (y, z) and
+          horizontal (x, y) sections of `fig_section_view` next to it.
+- .csv  : part list, one row per element (BTL-like columns, part number optional).
+- .json : CNC file, panel header and one machining record per element.
+
+Part numbers are positional, one per element in the writers' walk order (lattice
+first, then the layers), as given by `PartCatalogue.panel_part_numbers`.
+"""
+from __future__ import annotations
+import csv
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+from core.src.materials import LATTICE_MATERIALS
+from core.src.wall import SECTION_DEFAULT_CUT, iter_section_elements
+
+from .catalogue import PartCatalogue
+
+EXPORT_FORMATS = ("dxf", "csv", "json")
+SECTION_GAP = 500.0       # [mm] distance between the elevation and the sections in the DXF
+TEXT_HEIGHT = 50.0        # [mm]
+
+CSV_COLUMNS = (
+    "panel_id", "element_id", "part_number", "element_type", "material", "layer", "orientation",
+    "length", "width", "thickness", "x_min", "y_min", "z_min", "x_max", "y_max", "z_max",
+)
+
+
+def _iter_elements(buildup, lattice_materials: Dict[str, str] = None) -> Iterator[Tuple[str, object, str]]:
+    """(DXF layer name, element, material) of every element, lattice first."""
+    lattice_materials = LATTICE_MATERIALS if lattice_materials is None else lattice_materials
+    if buildup.lattice is not None:
+        for elem in buildup.lattice.elements:
+            yield f"LATTICE_L{elem.layer}", elem, lattice_materials.get(elem.element_type, elem.element_type)
+    for layer in buildup.layers:
+        name = _layer_name(layer)
+        mapping = layer.materials or {}
+        for elem in layer.elements:
+            yield name, elem, mapping.get(elem.element_type, elem.element_type)
+
+
+def _part_numbers(buildup, part_numbers: Sequence[Optional[str]] = None) -> Iterator[Optional[str]]:
+    """Part number of every element in walk order (None without part numbers)."""
+    n_elements = sum(len(layer.elements) for layer in buildup.layers)
+    if buildup.lattice is not None:
+        n_elements += len(buildup.lattice.elements)
+    if part_numbers is None:
+        return iter([None] * n_elements)
+    if len(part_numbers) != n_elements:
+        raise ValueError(
+            f"Panel '{buildup.panel_id}' has {n_elements} elements, got {len(part_numbers)} part numbers."
+        )
+    return iter(part_numbers)
+
+
+def _layer_name(layer) -> str:
+    """DXF-safe layer name of a wall layer."""
+    if layer is None:
+        return "LATTICE"
+    return re.sub(r"[^A-Za-z0-9_\-]+", "_", f"L{layer.layer_index}_{layer.name}").upper()
+
+
+def _cut_dims(elem) -> Tuple[float, float, float]:
+    """(length along the element axis, section width, thickness) as in the cutting list."""
+    dx, dz = elem.x_max - elem.x_min, elem.z_max - elem.z_min
+    along, across = (dx, dz) if elem.orientation == "horizontal" else (dz, dx)
+    return along, across, elem.y_max - elem.y_min
+
+
+# ----------------------------------------------------------------------------
+# DXF (R12 ASCII)
+# ----------------------------------------------------------------------------
+
+class DxfWriter:
+    """Minimal streaming R12 DXF writer: closed polylines and texts in the ENTITIES section."""
+
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+        stream.write("0\nSECTION\n2\nHEADER\n9\n$ACADVER\n1\nAC1009\n0\nENDSEC\n")
+        stream.write("0\nSECTION\n2\nENTITIES\n")
+
+    def rectangle(self, layer: str, x0: float, y0: float, x1: float, y1: float) -> None:
+        self.polyline(layer, ((x0, y0), (x1, y0), (x1, y1), (x0, y1)))
+
+    def polyline(self, layer: str, points) -> None:
+        write = self.stream.write
+        write(f"0\nPOLYLINE\n8\n{layer}\n66\n1\n70\n1\n10\n0.0\n20\n0.0\n30\n0.0\n")
+        for x, y in points:
+            write(f"0\nVERTEX\n8\n{layer}\n10\n{x:.3f}\n20\n{y:.3f}\n30\n0.0\n")
+        write(f"0\nSEQEND\n8\n{layer}\n")
+
+    def text(self, layer: str, x: float, y: float, value: str, height: float = TEXT_HEIGHT) -> None:
+        self.stream.write(f"0\nTEXT\n8\n{layer}\n10\n{x:.3f}\n20\n{y:.3f}\n30\n0.0\n40\n{height:.3f}\n1\n{value}\n")
+
+    def close(self) -> None:
+        self.stream.write("0\nENDSEC\n0\nEOF\n")
+
+
+def write_dxf(
+    buildup,
+    stream: TextIO,
+    sections: Sequence[str] = ("vertical", "horizontal"),
+    cut_positions: Dict[str, float] = None,
+    gap: float = SECTION_GAP,
+) -> None:
+    """
+    Shop drawing of one panel. The elevation sits at the origin, the vertical section
+    (y, z) on its right and the horizontal section (plan x, y) below it.
+    """
+    cut_positions = dict(SECTION_DEFAULT_CUT, **(cut_positions or {}))
+    dxf = DxfWriter(stream)
+    y_lo, y_hi = _y_extent(buildup)
+
+    for name, elem, _ in _iter_elements(buildup):
+        outline = getattr(elem, "outline", None)
+        if outline is None:
+            dxf.rectangle(name, elem.x_min, elem.z_min, elem.x_max, elem.z_max)
+            continue
+        for ring in _rings(outline):
+            dxf.polyline(name, ring)
+    for opening in buildup.openings:
+        x_min, z_min, x_max, z_max = opening.bounds
+        dxf.rectangle("OPENINGS", x_min, z_min, x_max, z_max)
+    dxf.text("TEXT", 0.0, buildup.panel_height + TEXT_HEIGHT, buildup.panel_id)
+
+    if "vertical" in sections:
+        x_shift = buildup.panel_width + gap - y_lo
+        cut = cut_positions["vertical"]
+        for elem, layer in iter_section_elements(buildup, "vertical", cut):
+            dxf.rectangle(f"SECTION_V_{_layer_name(layer)}", x_shift + elem.y_min, elem.z_min,
+                          x_shift + elem.y_max, elem.z_max)
+        dxf.text("TEXT", x_shift + y_lo, buildup.panel_height + TEXT_HEIGHT, f"SECTION x={cut:g}")
+    if "horizontal" in sections:
+        z_shift = -gap - y_hi
+        cut = cut_positions["horizontal"]
+        for elem, layer in iter_section_elements(buildup, "horizontal", cut):
+            dxf.rectangle(f"SECTION_H_{_layer_name(layer)}", elem.x_min, z_shift + elem.y_min,
+                          elem.x_max, z_shift + elem.y_max)
+        dxf.text("TEXT", 0.0, z_shift + y_lo - 2 * TEXT_HEIGHT, f"SECTION z={cut:g}")
+    dxf.close()
+
+
+def _rings(outline) -> Iterator[List[Tuple[float, float]]]:
+    """Exterior and interior rings (open, x z) of an element outline (Polygon or MultiPolygon)."""
+    for polygon in getattr(outline, "geoms", [outline]):
+        for ring in [polygon.exterior, *polygon.interiors]:
+            yield list(ring.coords)[:-1]
+
+
+def _y_extent(buildup) -> Tuple[float, float]:
+    lows = [layer.y_min for layer in buildup.layers]
+    highs = [layer.y_max for layer in buildup.layers]
+    if buildup.lattice is not None and buildup.lattice.layer_ranges:
+        lows.append(buildup.lattice.layer_ranges[0][0])
+        highs.append(buildup.lattice.layer_ranges[-1][1])
+    return (min(lows), max(highs)) if lows else (0.0, 0.0)
+
+
+# ----------------------------------------------------------------------------
+# CSV part list / CNC JSON
+# ----------------------------------------------------------------------------
+
+def write_part_csv(
+    buildup,
+    stream: TextIO,
+    part_numbers: Sequence[Optional[str]] = None,
+    header: bool = True,
+    lattice_materials: Dict[str, str] = None,
+) -> None:
+    """Part list of one panel, part_numbers one per element (see PartCatalogue.panel_part_numbers)."""
+    writer = csv.writer(stream)
+    if header:
+        writer.writerow(CSV_COLUMNS)
+    parts = _part_numbers(buildup, part_numbers)
+    for _, elem, material in _iter_elements(buildup, lattice_materials):
+        length, width, thickness = _cut_dims(elem)
+        writer.writerow((
+            buildup.panel_id, elem.element_id, next(parts) or "", elem.element_type,
+            material, elem.layer, elem.orientation, f"{length:.1f}", f"{width:.1f}", f"{thickness:.1f}",
+            f"{elem.x_min:.1f}", f"{elem.y_min:.1f}", f"{elem.z_min:.1f}",
+            f"{elem.x_max:.1f}", f"{elem.y_max:.1f}", f"{elem.z_max:.1f}",
+        ))
+
+
+def write_cnc_json(
+    buildup,
+    stream: TextIO,
+    part_numbers: Sequence[Optional[str]] = None,
+    lattice_materials: Dict[str, str] = None,
+) -> None:
+    """
+    CNC file of one panel: {"panel": {...}, "elements": [...]}, elements written one by one.
+    Positions are the element lower corner in the panel frame [mm].
+    """
+    parts = _part_numbers(buildup, part_numbers)
+    panel = {
+        "panel_id": buildup.panel_id,
+        "width": buildup.panel_width,
+        "height": buildup.panel_height,
+        "openings": [list(opening.bounds) for opening in buildup.openings],
+    }
+    stream.write('{"units": "mm", "panel": ' + json.dumps(panel) + ', "elements": [\n')
+    first = True
+    for name, elem, material in _iter_elements(buildup, lattice_materials):
+        length, width, thickness = _cut_dims(elem)
+        record = {
+            "id": elem.element_id,
+            "part": next(parts),
+            "type": elem.element_type,
+            "material": material,
+            "layer": name,
+            "orientation": elem.orientation,
+            "position": [elem.x_min, elem.y_min, elem.z_min],
+            "size": [elem.x_max - elem.x_min, elem.y_max - elem.y_min, elem.z_max - elem.z_min],
+            "blank": [length, width, thickness],
+        }
+        stream.write(("" if first else ",\n") + json.dumps(record))
+        first = False
+    stream.write("\n]}\n")
+
+
+# ----------------------------------------------------------------------------
+# Batch export
+# ----------------------------------------------------------------------------
+
+def export_panel(
+    buildup,
+    out_dir: str,
+    formats: Sequence[str] = EXPORT_FORMATS,
+    part_numbers: Sequence[Optional[str]] = None,
+    lattice_materials: Dict[str, str] = None,
+) -> List[str]:
+    """Write the fabrication files of one panel (part_numbers one per element), returns their paths."""
+    paths = []
+    stem = re.sub(r"[^A-Za-z0-9_.\-]+", "_", str(buildup.panel_id))
+    for fmt in formats:
+        path = os.path.join(out_dir, f"{stem}.{fmt}")
+        with open(path, "w", newline="" if fmt == "csv" else None, encoding="utf-8") as stream:
+            if fmt == "dxf":
+                write_dxf(buildup, stream)
+            elif fmt == "csv":
+                write_part_csv(buildup, stream, part_numbers, lattice_materials=lattice_materials)
+            else:
+                write_cnc_json(buildup, stream, part_numbers, lattice_materials)
+        paths.append(path)
+    return paths
+
+
+def export_buildups(
+    buildups,
+    out_dir: str,
+    formats: Sequence[str] = EXPORT_FORMATS,
+    workers: int = None,
+    catalogue: PartCatalogue = None,
+    lattice_materials: Dict[str, str] = None,
+) -> Iterator[List[str]]:
+    """
+    Write the files of every buildup of an iterable (consumed lazily), yields the paths
+    of each panel in input order. workers > 1 writes panels in a process pool with at
+    most 2 * workers panels in flight. With a catalogue of the same buildups, the part
+    numbers of every panel are taken from it (looked up by panel_id).
+    """
+    unknown = [fmt for fmt in formats if fmt not in EXPORT_FORMATS]
+    if unknown:
+        raise ValueError(f"Unknown export format(s) {unknown}, expected some of {list(EXPORT_FORMATS)}.")
+    os.makedirs(out_dir, exist_ok=True)
+
+    def parts_of(buildup):
+        return None if catalogue is None else catalogue.panel_part_numbers(buildup.panel_id)
+
+    if workers is None or workers <= 1:
+        for buildup in buildups:
+            yield export_panel(buildup, out_dir, formats, parts_of(buildup), lattice_materials)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        for buildup in buildups:
+            pending.append(
+                pool.submit(export_panel, buildup, out_dir, formats, parts_of(buildup), lattice_materials)
+            )
+            if len(pending) >= 2 * workers:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+
+__all__ = [
+    "CSV_COLUMNS",
+    "DxfWriter",
+    "EXPORT_FORMATS",
+    "export_buildups",
+    "export_panel",
+    "write_cnc_json",
+    "write_dxf",
+    "write_part_csv",
+]
@@ -0,0 +1,252 @@
+"""
+Sheet Nesting for Continuous Layers (guillotine packing).
+
+Board pieces of the continuous layers (plasterboard, OSB, ...) of a batch of
+WallBuildUp objects are assigned to stock sheets. Pieces are grouped by
+(material, thickness, sheet size), so offcuts are shared across panels:
+
+- full-size boards take one sheet each, without search;
+- the other pieces, largest first, go to the free rectangle of the open sheets
+  that leaves the smallest area (best area fit, both orientations). Free
+  rectangles live in NumPy arrays, so every placement is one vectorised scan;
+- the used rectangle is split along the shorter leftover axis (guillotine cut),
+  leftovers narrower than min_offcut are dropped.
+
+The kerf is added to the pieces and to the sheet size.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_KERF = 4.0        # [mm]
+MIN_OFFCUT = 50.0         # [mm] smallest reusable offcut side
+_EPS = 1e-6
+
+
+@dataclass
+class BoardPieces:
+    """Board elements of continuous layers, one row per element."""
+    element_ids: List[str]
+    panel_ids: List[str]
+    materials: List[str]
+    thickness: np.ndarray
+    width: np.ndarray         # x [mm]
+    height: np.ndarray        # z [mm]
+    sheet: np.ndarray         # (n, 2) stock sheet of the layer (layer_pitch, board_length) [mm]
+
+    def __len__(self) -> int:
+        return len(self.element_ids)
+
+
+def board_pieces(buildups: Sequence) -> BoardPieces:
+    """Elements of the `continuous` layers of WallBuildUp objects."""
+    element_ids, panel_ids, materials, dims = [], [], [], []
+    for buildup in buildups:
+        for layer in buildup.layers:
+            if layer.layer_type != "continuous":
+                continue
+            mapping = layer.materials or {}
+            for elem in layer.elements:
+                element_ids.append(elem.element_id)
+                panel_ids.append(buildup.panel_id)
+                materials.append(mapping.get(elem.element_type, elem.element_type))
+                dims.append((elem.y_max - elem.y_min, elem.x_max - elem.x_min, elem.z_max - elem.z_min,
+                             layer.layer_pitch, layer.board_length))
+    dims = np.array(dims, dtype=float).reshape(-1, 5)
+    return BoardPieces(element_ids, panel_ids, materials, dims[:, 0], dims[:, 1], dims[:, 2], dims[:, 3:])
+
+
+class _FreeRects:
+    """Free rectangles (sheet, x, y, w, h) of the open sheets as growable arrays."""
+
+    def __init__(self, capacity: int = 256):
+        self.data = np.zeros((capacity, 5))
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.n = 0
+
+    def add(self, sheet: int, x: float, y: float, w: float, h: float) -> None:
+        if self.n == len(self.data):
+            self.data = np.concatenate([self.data, np.zeros_like(self.data)])
+            self.alive = np.concatenate([self.alive, np.zeros_like(self.alive)])
+        self.data[self.n] = sheet, x, y, w, h
+        self.alive[self.n] = True
+        self.n += 1
+
+    def best_fit(self, w: float, h: float) -> Tuple[int, bool]:
+        """Index of the free rectangle leaving the least area, and whether the piece is rotated (-1: none)."""
+        rw, rh = self.data[:self.n, 3], self.data[:self.n, 4]
+        alive = self.alive[:self.n]
+        area = rw * rh - w * h
+        straight = np.where(alive & (rw >= w - _EPS) & (rh >= h - _EPS), area, np.inf)
+        turned = np.where(alive & (rw >= h - _EPS) & (rh >= w - _EPS), area, np.inf)
+        i, j = int(np.argmin(straight)) if self.n else 0, int(np.argmin(turned)) if self.n else 0
+        if self.n == 0 or (straight[i] == np.inf and turned[j] == np.inf):
+            return -1, False
+        return (i, False) if straight[i] <= turned[j] else (j, True)
+
+
+def nest_rectangles(
+    widths,
+    heights,
+    sheet: Tuple[float, float],
+    kerf: float = DEFAULT_KERF,
+    min_offcut: float = MIN_OFFCUT,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Guillotine nesting of rectangles into identical sheets (rotation allowed).
+    Returns (sheet index, x, y, rotated) per piece; x, y are the lower corner in the sheet.
+    """
+    w = np.asarray(widths, dtype=float) + kerf
+    h = np.asarray(heights, dtype=float) + kerf
+    sw, sh = sheet[0] + kerf, sheet[1] + kerf
+    n = len(w)
+    piece_sheet = np.zeros(n, dtype=np.int64)
+    pos = np.zeros((n, 2))
+    rotated = np.zeros(n, dtype=bool)
+
+    too_big = ~(((w <= sw + _EPS) & (h <= sh + _EPS)) | ((h <= sw + _EPS) & (w <= sh + _EPS)))
+    if too_big.any():
+        raise ValueError(f"{int(too_big.sum())} piece(s) larger than the {sheet[0]:g} x {sheet[1]:g} sheet.")
+
+    full = ((w >= sw - _EPS) & (h >= sh - _EPS)) | ((h >= sw - _EPS) & (w >= sh - _EPS))
+    n_sheets = int(full.sum())
+    piece_sheet[full] = np.arange(n_sheets)
+    rotated[full] = w[full] > sw + _EPS
+
+    free = _FreeRects()
+    for p in np.flatnonzero(~full)[np.argsort(-(w * h)[~full], kind="stable")]:
+        i, turn = free.best_fit(w[p], h[p])
+        if i < 0:
+            free.add(n_sheets, 0.0, 0.0, sw, sh)
+            n_sheets += 1
+            i, turn = free.best_fit(w[p], h[p])
+        pw, ph = (h[p], w[p]) if turn else (w[p], h[p])
+        s, x, y, rw, rh = free.data[i]
+        free.alive[i] = False
+        piece_sheet[p], pos[p], rotated[p] = int(s), (x, y), turn
+
+        # guillotine split along the shorter leftover axis
+        if rw - pw < rh - ph:
+            right, top = (x + pw, y, rw - pw, ph), (x, y + ph, rw, rh - ph)
+        else:
+            right, top = (x + pw, y, rw - pw, rh), (x, y + ph, pw, rh - ph)
+        for fx, fy, fw, fh in (right, top):
+            if fw >= min_offcut and fh >= min_offcut:
+                free.add(int(s), fx, fy, fw, fh)
+    return piece_sheet, pos[:, 0], pos[:, 1], rotated
+
+
+@dataclass
+class NestingResult:
+    pieces: BoardPieces
+    groups: List[Tuple[str, float, float, float]]  # (material, thickness, sheet width, sheet length)
+    piece_sheet: np.ndarray    # (pieces,) global sheet index
+    piece_x: np.ndarray        # (pieces,) position in the sheet [mm]
+    piece_y: np.ndarray
+    piece_rotated: np.ndarray
+    sheet_group: np.ndarray    # (sheets,) index in groups
+
+    @property
+    def sheet_count(self) -> int:
+        return len(self.sheet_group)
+
+    @property
+    def utilization(self) -> float:
+        """Piece area over purchased sheet area."""
+        sheet_area = sum(self.groups[g][2] * self.groups[g][3] for g in self.sheet_group)
+        piece_area = float(np.sum(self.pieces.width * self.pieces.height))
+        return piece_area / sheet_area if sheet_area else 0.0
+
+    def summary(self) -> List[Dict]:
+        """One row per material, thickness and sheet size (purchase list)."""
+        rows = []
+        piece_group = self.sheet_group[self.piece_sheet] if len(self.piece_sheet) else self.piece_sheet
+        for g, (material, thickness, sheet_w, sheet_l) in enumerate(self.groups):
+            count = int(np.sum(self.sheet_group == g))
+            in_group = piece_group == g
+            area = float(np.sum(self.pieces.width[in_group] * self.pieces.height[in_group])) / 1e6
+            rows.append({
+                "material": material,
+                "thickness": thickness,
+                "sheet_width": sheet_w,
+                "sheet_length": sheet_l,
+                "count": count,
+                "pieces": int(in_group.sum()),
+                "piece_area": area,
+                "sheet_area": count * sheet_w * sheet_l / 1e6,
+                "utilization": area / (count * sheet_w * sheet_l / 1e6) if count else 0.0,
+            })
+        return rows
+
+    def as_records(self) -> List[Dict]:
+        """Nesting list, one row per piece."""
+        return [
+            {
+                "element_id": self.pieces.element_ids[p],
+                "panel_id": self.pieces.panel_ids[p],
+                "material": self.pieces.materials[p],
+                "thickness": float(self.pieces.thickness[p]),
+                "width": float(self.pieces.width[p]),
+                "height": float(self.pieces.height[p]),
+                "sheet": int(self.piece_sheet[p]),
+                "x": float(self.piece_x[p]),
+                "y": float(self.piece_y[p]),
+                "rotated": bool(self.piece_rotated[p]),
+            }
+            for p in range(len(self.pieces))
+        ]
+
+
+def nest_boards(
+    buildups,
+    kerf: float = DEFAULT_KERF,
+    min_offcut: float = MIN_OFFCUT,
+) -> NestingResult:
+    """Sheet nesting of the continuous layers of one WallBuildUp or a batch of them."""
+    if hasattr(buildups, "layers"):
+        buildups = [buildups]
+    pieces = board_pieces(buildups)
+
+    codes: Dict[Tuple[str, float, float, float], int] = {}
+    sheets = np.sort(pieces.sheet, axis=1)
+    piece_group = np.array(
+        [
+            codes.setdefault(key, len(codes))
+            for key in zip(pieces.materials, pieces.thickness.tolist(), sheets[:, 0].tolist(), sheets[:, 1].tolist())
+        ],
+        dtype=np.int64,
+    )
+
+    piece_sheet = np.zeros(len(pieces), dtype=np.int64)
+    piece_x, piece_y = np.zeros(len(pieces)), np.zeros(len(pieces))
+    piece_rotated = np.zeros(len(pieces), dtype=bool)
+    sheet_group: List[int] = []
+    for g, (_, _, sheet_w, sheet_l) in enumerate(codes):
+        members = np.flatnonzero(piece_group == g)
+        sheet, x, y, rotated = nest_rectangles(
+            pieces.width[members], pieces.height[members], (sheet_w, sheet_l), kerf, min_offcut
+        )
+        piece_sheet[members] = sheet + len(sheet_group)
+        piece_x[members], piece_y[members], piece_rotated[members] = x, y, rotated
+        sheet_group.extend([g] * (int(sheet.max()) + 1 if len(sheet) else 0))
+
+    return NestingResult(
+        pieces=pieces,
+        groups=list(codes),
+        piece_sheet=piece_sheet,
+        piece_x=piece_x,
+        piece_y=piece_y,
+        piece_rotated=piece_rotated,
+        sheet_group=np.array(sheet_group, dtype=np.int64),
+    )
+
+
+__all__ = [
+    "BoardPieces",
+    "NestingResult",
+    "board_pieces",
+    "nest_boards",
+    "nest_rectangles",
+]
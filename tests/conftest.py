@@ -0,0 +1,105 @@
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.src.openings import Opening  # noqa: E402
+from core.src.wall import generate_wall_buildup  # noqa: E402
+
+
+def _layer(y_min, y_max, layer_index, name, orientation, batten_width, insulation, fill):
+    return {
+        "y_min": y_min,
+        "y_max": y_max,
+        "layer_index": layer_index,
+        "name": name,
+        "layer_type": "battened",
+        "layer_pitch": 600,
+        "layer_orientation": orientation,
+        "batten_width": batten_width,
+        "include_insulation": insulation,
+        "materials": {"batten": "Douglas", "insulation": fill},
+    }
+
+
+# Reference panel of core/playground.ipynb
+LATTICE = {
+    "vertical_pitch": 695,
+    "horizontal_pitch": 695,
+    "slat_width": 120,
+    "panel_type": "5L180",
+    "include_insulation": True,
+}
+LAYERS = [
+    _layer(-113, -100, "-1", "BA 13", "horizontal", 0, True, "BA13"),
+    _layer(-126, -113, "-2", "BA 13", "horizontal", 0, True, "BA13"),
+    _layer(-100, 0, "0", "Int ins", "horizontal", 40, True, "Mineral Wool"),
+    _layer(180, 260, "6", "Ext ins", "horizontal", 40, True, "Mineral Wool"),
+    _layer(260, 340, "7", "Ext ins", "vertical", 40, True, "Mineral Wool"),
+    _layer(340, 360, "8", "Sous structure", "horizontal", 20, False, "Mineral Wool"),
+    _layer(360, 373, "9", "Fibro ciment", "horizontal", 0, True, "fibro ciment"),
+]
+OPENINGS = [Opening(1500, 1750, 1500, 2000), Opening(4500, 1750, 1500, 2500)]
+SLAT_WIDTH = LATTICE["slat_width"]
+
+
+def _make_buildup(panel_id="a", openings=OPENINGS, width=6000, height=3500, **kwargs):
+    return generate_wall_buildup(panel_id, width, height, openings, LATTICE, LAYERS, **kwargs)
+
+
+@pytest.fixture(scope="session")
+def make_buildup():
+    return _make_buildup
+
+
+@pytest.fixture(scope="session")
+def reference_buildup():
+    return _make_buildup()
+
+
+@pytest.fixture(scope="session")
+def random_buildups():
+    """Panels with 1 to 4 random openings (overlapping, on the edges or partly outside)."""
+    rng = random.Random(7)
+    buildups = []
+    for k in range(20):
+        openings = [
+            Opening(rng.uniform(0, 6000), rng.uniform(0, 3500), rng.uniform(300, 1800), rng.uniform(300, 2500))
+            for _ in range(rng.randint(1, 4))
+        ]
+        buildups.append(_make_buildup(f"r{k}", openings))
+    return buildups
+
+
+def _spaced_openings(rng, count):
+    """Openings whose framing lines (edges grown by a slat) stay two slats apart."""
+    openings = []
+    while len(openings) < count:
+        w, h = rng.uniform(300, 1800), rng.uniform(300, 2500)
+        margin = 2 * SLAT_WIDTH
+        opening = Opening(rng.uniform(w / 2 + margin, 6000 - w / 2 - margin),
+                          rng.uniform(h / 2 + margin, 3500 - h / 2 - margin), w, h)
+        candidate = openings + [opening]
+        spaced = all(opening.to_polygon().distance(other.to_polygon()) > margin for other in openings)
+        for axis in (0, 1):
+            lines = sorted(v for o in candidate for v in (o.bounds[axis] - SLAT_WIDTH, o.bounds[axis + 2]))
+            spaced &= not any(0 < b - a <= margin for a, b in zip(lines[:-1], lines[1:]))
+        if spaced:
+            openings.append(opening)
+    return openings
+
+
+@pytest.fixture(scope="session")
+def spaced_buildups():
+    """Panels with 1 to 3 random openings the lattice can frame without clashing slats."""
+    rng = random.Random(11)
+    return [_make_buildup(f"s{k}", _spaced_openings(rng, rng.randint(1, 3))) for k in range(20)]
+
+
+@pytest.fixture(scope="session")
+def spaced_exact_buildups():
+    rng = random.Random(11)
+    return [_make_buildup(f"s{k}", _spaced_openings(rng, rng.randint(1, 3)), exact=True) for k in range(20)]
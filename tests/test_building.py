@@ -0,0 +1,21 @@
+import numpy as np
+
+from core.src.building import Building
+
+
+def test_material_totals_sum_the_panels(reference_buildup, spaced_buildups):
+    buildups = [reference_buildup] + spaced_buildups[:5]
+    building = Building("test")
+    for p, buildup in enumerate(buildups):
+        building.add(buildup, storey=p % 2)
+    volume = building.takeoff.volume
+
+    by_storey = building.material_totals(by="storey")
+    assert by_storey.keys == [0, 1]
+    np.testing.assert_allclose(by_storey.values, [volume[0::2].sum(axis=0), volume[1::2].sum(axis=0)])
+
+    mask = np.arange(len(building)) != 2
+    by_panel = building.material_totals(by="panel", mask=mask)
+    assert by_panel.keys == sorted(building.panels(mask))
+    order = [building.index(pid) for pid in by_panel.keys]
+    np.testing.assert_allclose(by_panel.values, volume[order])
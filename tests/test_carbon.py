@@ -0,0 +1,13 @@
+import pytest
+
+from solvers.physics.carbon.lca import DEFAULT_PRODUCTS, panel_lca
+
+
+def test_materials_without_fdes_are_reported(reference_buildup):
+    # BA13 and fibre cement have no FDES in the INIES extract
+    assert "BA13" not in DEFAULT_PRODUCTS and "fibro ciment" not in DEFAULT_PRODUCTS
+    with pytest.warns(UserWarning, match="no FDES product mapping"):
+        result = panel_lca([reference_buildup])
+    assert set(result.unmapped) == {"BA13", "fibro ciment"}
+    assert result.unmapped_volume[0] == pytest.approx(sum(result.unmapped.values()))
+    assert result.as_records()[0]["unmapped_volume"] == pytest.approx(result.unmapped_volume[0])
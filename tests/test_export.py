@@ -0,0 +1,113 @@
+import csv
+import io
+import json
+
+import numpy as np
+
+from solvers.production.fabrication.catalogue import part_catalogue
+from core.src.openings import Opening
+from solvers.production.fabrication.export import export_buildups, write_cnc_json, write_dxf, write_part_csv
+
+
+def _elements(buildup):
+    elements = list(buildup.lattice.elements)
+    for layer in buildup.layers:
+        elements.extend(layer.elements)
+    return elements
+
+
+def test_element_ids_are_unique(reference_buildup, random_buildups):
+    for buildup in [reference_buildup] + random_buildups:
+        ids = [elem.element_id for elem in _elements(buildup)]
+        assert len(ids) == len(set(ids))
+
+
+def test_exported_parts_match_element_geometry(reference_buildup, random_buildups):
+    buildups = [reference_buildup] + random_buildups
+    catalogue = part_catalogue(buildups)
+    dims = {rec["part_number"]: rec for rec in catalogue.as_records()}
+
+    for buildup in buildups:
+        parts = catalogue.panel_part_numbers(buildup.panel_id)
+        stream = io.StringIO()
+        write_part_csv(buildup, stream, parts)
+        stream.seek(0)
+        rows = list(csv.DictReader(stream))
+        assert len(rows) == len(_elements(buildup))
+        for row in rows:
+            part = dims[row["part_number"]]
+            size = sorted([float(row["length"]), float(row["width"])])
+            assert row["element_type"] == part["element_type"]
+            assert row["material"] == part["material"]
+            assert np.allclose(
+                [float(row["thickness"])] + size,
+                [part["thickness"], part["width"], part["length"]],
+                atol=0.6,
+            )
+
+        stream = io.StringIO()
+        write_cnc_json(buildup, stream, parts)
+        records = json.loads(stream.getvalue())["elements"]
+        for record, row in zip(records, rows):
+            assert record["id"] == row["element_id"]
+            assert record["part"] == row["part_number"]
+            part = dims[record["part"]]
+            dx, dy, dz = record["size"]
+            assert np.allclose(
+                [dy] + sorted([dx, dz]),
+                [part["thickness"], part["width"], part["length"]],
+                atol=0.6,
+            )
+
+
+def test_part_families_share_their_outline(reference_buildup, random_buildups):
+    # notched pieces are not the part of a full piece with the same box
+    buildups = [reference_buildup] + random_buildups
+    catalogue = part_catalogue(buildups)
+    parts = {rec["part_number"]: rec for rec in catalogue.as_records()}
+    assert any(rec["cut_area"] for rec in parts.values())
+    for buildup in buildups:
+        for elem, number in zip(_elements(buildup), catalogue.panel_part_numbers(buildup.panel_id)):
+            part = parts[number]
+            area = elem.outline.area if elem.outline is not None else elem.width * elem.length
+            expected = part["width"] * part["length"] - part["cut_area"]
+            # dimensions rounded to 1 mm, cut area to 1 mm2
+            assert abs(area - expected) <= (part["width"] + part["length"]) / 2 + 1, elem.element_id
+
+
+def test_export_buildups_with_catalogue(tmp_path, reference_buildup, make_buildup):
+    buildups = [reference_buildup, make_buildup("b", [])]
+    catalogue = part_catalogue(buildups)
+    for buildup, paths in zip(buildups, export_buildups(buildups, str(tmp_path), ("csv",), catalogue=catalogue)):
+        with open(paths[0], newline="", encoding="utf-8") as stream:
+            written = [row["part_number"] for row in csv.DictReader(stream)]
+        assert written == catalogue.panel_part_numbers(buildup.panel_id)
+
+
+def _dxf_polylines(text):
+    """(layer, [(x, y), ...]) of every POLYLINE of an R12 DXF string."""
+    polylines = []
+    for chunk in text.split("0\nPOLYLINE\n")[1:]:
+        codes = chunk.split("0\nSEQEND\n")[0].split("\n")
+        pairs = list(zip(codes[0::2], codes[1::2]))
+        xs = [float(v) for code, v in pairs if code == "10"][1:]
+        ys = [float(v) for code, v in pairs if code == "20"][1:]
+        polylines.append((pairs[0][1], list(zip(xs, ys))))
+    return polylines
+
+
+def test_dxf_draws_the_outline_of_cut_pieces(make_buildup):
+    # overlapping openings: L-shaped pieces around their union
+    buildup = make_buildup("l", [Opening(2000, 1500, 800, 800), Opening(2500, 1900, 800, 800)], exact=True)
+    cut = [elem for elem in _elements(buildup) if elem.outline is not None]
+    assert any(len(elem.outline.exterior.coords) > 5 for elem in cut)
+
+    stream = io.StringIO()
+    write_dxf(buildup, stream, sections=())
+    drawn = {tuple(np.round(points, 3).ravel()) for _, points in _dxf_polylines(stream.getvalue())}
+    for elem in cut:
+        ring = np.round(list(elem.outline.exterior.coords)[:-1], 3)
+        assert tuple(ring.ravel()) in drawn, elem.element_id
+        bbox = np.round([(elem.x_min, elem.z_min), (elem.x_max, elem.z_min),
+                         (elem.x_max, elem.z_max), (elem.x_min, elem.z_max)], 3)
+        assert tuple(bbox.ravel()) not in drawn, elem.element_id
@@ -0,0 +1,25 @@
+import json
+
+import numpy as np
+import pytest
+
+from connectors.mesh import read_mesh_panels
+
+SQUARE = {"vertices": [0, 0, 0, 1000, 0, 0, 1000, 0, 1000, 0, 0, 1000], "faces": [0, 0, 1, 2, 0, 0, 2, 3]}
+
+
+def test_speckle_json_flat_arrays(tmp_path):
+    path = tmp_path / "panels.json"
+    path.write_text(json.dumps([dict(SQUARE, name="a"), {"name": "no mesh"}, dict(SQUARE, name="b")]))
+    records = read_mesh_panels([str(path)])
+    assert [rec.panel_id for rec in records] == ["a", "b"]
+    np.testing.assert_array_equal(records[0].faces, [[0, 1, 2], [0, 2, 3]])
+    assert records[0].vertices.shape == (4, 3)
+
+
+def test_speckle_json_nested_arrays_are_rejected(tmp_path):
+    nested = dict(SQUARE, name="a", vertices=np.reshape(SQUARE["vertices"], (4, 3)).tolist())
+    path = tmp_path / "panels.json"
+    path.write_text(json.dumps([nested]))
+    with pytest.raises(ValueError, match="flat array of numbers"):
+        read_mesh_panels([str(path)])
@@ -0,0 +1,36 @@
+import copy
+
+from core.src.qa import check_buildup, check_buildups
+
+
+def test_reference_panel_passes(reference_buildup):
+    report = check_buildup(reference_buildup)
+    assert report.ok, report.issues
+
+
+def test_generated_panels_with_openings_pass(spaced_buildups, spaced_exact_buildups):
+    for buildups in (spaced_buildups, spaced_exact_buildups):
+        report = check_buildups(buildups)
+        assert report.ok, report.issues[:5]
+
+
+def test_cut_pieces_keep_clear_of_openings(random_buildups):
+    # openings overlapping each other or the panel edges: pieces are notched and L-shaped
+    report = check_buildups(random_buildups)
+    assert not [issue for issue in report.issues if issue.kind == "clearance"], report.issues[:5]
+
+
+def test_piece_cutting_into_an_opening_is_reported(reference_buildup):
+    buildup = copy.deepcopy(reference_buildup)
+    x_min, z_min, _, _ = buildup.openings[0].bounds
+    post = next(
+        elem for elem in buildup.lattice.elements
+        if elem.orientation == "vertical" and abs(elem.x_max - x_min) < 1e-6
+    )
+    post.x_min += 10.0
+    post.x_max += 10.0
+    post.outline = None
+
+    issues = [issue for issue in check_buildup(buildup).issues if issue.kind == "clearance"]
+    assert [issue.item_a for issue in issues] == [post.element_id]
+    assert issues[0].value == 0.0
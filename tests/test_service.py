@@ -0,0 +1,37 @@
+import pytest
+
+from core.src.cli import build
+from core.src.service import GenerationService
+
+from conftest import LATTICE, LAYERS, OPENINGS
+
+
+def _boxes(buildup):
+    elements = list(buildup.lattice.elements) + [elem for layer in buildup.layers for elem in layer.elements]
+    return sorted((elem.element_id, elem.x_min, elem.x_max, elem.z_min, elem.z_max) for elem in elements)
+
+
+def test_exact_generation_through_service_and_cli(make_buildup):
+    params = dict(panel_id="a", panel_width=6000, panel_height=3500, openings=OPENINGS,
+                  lattice_config=LATTICE, layer_configs=LAYERS)
+    with GenerationService(debounce=0) as service:
+        service.submit(params).result(timeout=60)
+        misses = service.misses
+        exact = service.submit(dict(params, exact=True)).result(timeout=60)
+        # exact mode has its own cache entries
+        assert service.misses == 2 * misses and service.hits == 0
+    assert _boxes(exact) == _boxes(make_buildup(exact=True))
+
+    spec = dict(params, openings=[[o.center_x, o.center_z, o.width, o.height] for o in OPENINGS])
+    assert _boxes(build(spec, exact=True)) == _boxes(exact)
+    assert _boxes(build(dict(spec, exact=True))) == _boxes(exact)
+
+
+def test_unknown_parameters_fail_the_job():
+    params = dict(panel_id="a", panel_width=6000, panel_height=3500, openings=OPENINGS,
+                  lattice_config=LATTICE, layer_configs=LAYERS)
+    with GenerationService(debounce=0) as service:
+        for key in ("lazy", "colour"):
+            job = service.submit(dict(params, **{key: True}))
+            with pytest.raises(ValueError, match=key):
+                job.result(timeout=60)
@@ -0,0 +1,14 @@
+import pytest
+from shapely.geometry import box
+
+from core.src.openings import Opening
+from core.src.stack import net_panel_area
+
+
+def test_net_area_clips_openings_and_voids(make_buildup):
+    # 1000 x 800 opening, half of it past the left edge of the panel
+    opening = Opening(0, 1500, 1000, 800)
+    expected = 6000 * 3500 - 500 * 800
+    assert net_panel_area(make_buildup("o", [opening])) == pytest.approx(expected)
+    voided = make_buildup("v", [opening], opening_voids=[box(-500, 1100, 500, 1900)], lazy=True)
+    assert net_panel_area(voided) == pytest.approx(expected)
@@ -0,0 +1,28 @@
+from collections import Counter
+
+from core.src.openings import Opening
+from core.src.wall import compute_post_positions
+
+
+def _counts(layout):
+    # pieces above 1 mm2: the float clearance leaves corner slivers the exact one does not
+    return Counter(elem.element_type for elem in layout.elements if elem.width * elem.length > 1.0)
+
+
+def test_float_round_off_adds_no_post():
+    # 3818.929... + 600 lands a hair past the flush post at 4418.929...: the float
+    # pitch test used to add a post at 4298.93 the exact mode does not have
+    openings = [Opening(1553.50050175778, 1000, 930.8573712462675, 500)]
+    positions = compute_post_positions(6000, 600, 120, openings)
+    exact = compute_post_positions(6000, 600, 120, openings, exact=True)
+    assert len(positions) == len(exact) == 12
+    assert max(abs(a - b) for a, b in zip(positions, exact)) < 1e-3
+
+
+def test_exact_and_float_modes_place_the_same_members(make_buildup, random_buildups):
+    for buildup in random_buildups:
+        exact = make_buildup(buildup.panel_id, buildup.openings, exact=True)
+        assert len(exact.lattice.post_positions) == len(buildup.lattice.post_positions)
+        assert len(exact.lattice.traverse_positions) == len(buildup.lattice.traverse_positions)
+        for layout, other in zip([buildup.lattice] + buildup.layers, [exact.lattice] + exact.layers):
+            assert _counts(layout) == _counts(other), (buildup.panel_id, getattr(layout, "name", "lattice"))